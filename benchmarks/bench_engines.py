@@ -0,0 +1,120 @@
+"""Differential benchmark of the branch and bound engine against the MILP.
+
+Solves randomized configurations with both engines, checks that the branch and bound search finds
+the same objective value as the MILP and reports the solve times of each engine. Configurations on
+which the search hits its node limit are counted separately, as ResistanceOptimizer falls back to
+the MILP for them.
+
+Usage:
+    python benchmarks/bench_engines.py [--cases 200] [--seed 0] [--max-nodes 2000]
+"""
+import argparse
+import random
+import sys
+import time
+
+import pulp
+
+sys.path.append(".")  # Run from the repository root
+from src.branch_and_bound import DEFAULT_MAX_NODES, NodeLimitExceeded, solve_assignment
+from src.catalog import STANDING_LEVELS, ItemCatalog, get_catalog
+from src.optimizer_config import (
+    BLOCKABLE_SLOTS,
+    FACTIONS,
+    RESISTANCE_KEYS,
+    WEAPON_TEMPLATES,
+    parse_optimizer_config,
+)
+from src.resistance_optimizer import ResistanceOptimizer
+from src.solvers import make_solver
+
+COMPONENT_CSV_PATH: str = "data/component_data.csv"
+AUGMENT_CSV_PATH: str = "data/augment_data.csv"
+
+
+def random_config(rng: random.Random, catalog: ItemCatalog) -> dict:
+    """Draw a configuration in the parse_optimizer_config schema.
+
+    Current resistances range from far below to above the default targets, so that the corpus
+    mixes inputs whose targets are reachable with a few items and inputs that leave shortfalls.
+    """
+    return {
+        "character_level": rng.choice([10, 25, 40, 60, 75, 90, 100]),
+        "weapon_template": rng.choice(WEAPON_TEMPLATES),
+        "armor_absorption": rng.choice([60, 70, 80, 90, 100]),
+        "current_resistances": {res: rng.randint(-20, 90) for res in RESISTANCE_KEYS},
+        "target_resistances": {res: rng.choice([80, 80, 80, 85, 90]) for res in RESISTANCE_KEYS},
+        "unavailable_component_slots": [slot for slot in BLOCKABLE_SLOTS if rng.random() < 0.15],
+        "unavailable_augment_slots": [slot for slot in BLOCKABLE_SLOTS if rng.random() < 0.15],
+        "component_blacklist": rng.sample(catalog.components.names.tolist(), rng.randint(0, 10)),
+        "augment_blacklist": rng.sample(catalog.augments.names.tolist(), rng.randint(0, 30)),
+        "faction_standings": {faction: rng.choice(["Neutral", *STANDING_LEVELS]) for faction in FACTIONS},
+    }
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered: list[float] = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=200, help="Number of random configurations")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the configuration generator")
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES, help="Node limit of the search")
+    args = parser.parse_args()
+
+    catalog: ItemCatalog = get_catalog(COMPONENT_CSV_PATH, AUGMENT_CSV_PATH)
+    rng = random.Random(args.seed)
+    search_times: list[float] = []
+    milp_times: list[float] = []
+    node_limited: int = 0
+    mismatches: int = 0
+
+    for case in range(args.cases):
+        config: dict = random_config(rng, catalog)
+        optimizer = ResistanceOptimizer(**parse_optimizer_config(config), catalog=catalog)
+
+        start: float = time.perf_counter()
+        model = optimizer.build_model()
+        model.prob.solve(make_solver(optimizer.solver_backend))
+        milp_times.append(time.perf_counter() - start)
+        milp_objective: float = pulp.value(model.prob.objective) or 0.0
+
+        start = time.perf_counter()
+        components, augments = optimizer.build_candidates()
+        try:
+            solution = solve_assignment(
+                components,
+                augments,
+                optimizer.resistance_types,
+                optimizer.current_resistances,
+                optimizer.target_resistances,
+                optimizer.required_armor_abs_percentage,
+                max_nodes=args.max_nodes,
+            )
+        except NodeLimitExceeded:
+            node_limited += 1
+            continue
+        search_times.append(time.perf_counter() - start)
+
+        if abs(solution.objective - milp_objective) > 1e-6:
+            mismatches += 1
+            print(f"case {case}: MILP objective {milp_objective:g}, branch and bound {solution.objective:g}")
+            print(f"  config: {config}")
+
+    print(f"cases: {args.cases}, solved by branch and bound: {len(search_times)}, node limit hit: {node_limited}")
+    for name, samples in (("milp", milp_times), ("branch and bound", search_times)):
+        if samples:
+            print(
+                f"{name:>16}: p50 {percentile(samples, 0.5) * 1e3:7.1f} ms"
+                f"  p95 {percentile(samples, 0.95) * 1e3:7.1f} ms  max {max(samples) * 1e3:7.1f} ms"
+            )
+    print(f"objective mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
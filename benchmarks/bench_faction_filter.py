@@ -0,0 +1,91 @@
+"""Micro-benchmark of the faction-standing filter used by ResistanceOptimizer.filter_augment_db.
+
+Compares the previous row-wise ``DataFrame.apply`` implementation with the vectorized
+faction-code lookup and checks that both select exactly the same augments.
+
+Usage:
+    python benchmarks/bench_faction_filter.py [--repeat 200]
+"""
+import argparse
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(".")  # Run from the repository root
+from src.catalog import RESISTANCE_TYPES, STANDING_LEVELS, get_catalog
+from src.resistance_optimizer import ResistanceOptimizer
+
+FACTION_STANDINGS: dict[str, str] = {
+    "Devil's Crossing": "Revered",
+    "Rovers": "Honored",
+    "Homestead": "Revered",
+    "Kymon's Chosen": "Friendly",
+    "Order of Death's Vigil": "Revered",
+    "The Black Legion": "Respected",
+    "The Outcast": "Revered",
+    "Coven of Ugdenbog": "Honored",
+    "Barrowholm": "Revered",
+    "Malmouth Resistance": "Revered",
+    "Cult of Bysmiel": "Friendly",
+    "Cult of Dreeg": "Revered",
+    "Cult of Solael": "Honored",
+    "Kurn": "Revered",
+}
+
+
+def legacy_filter_augment_db(augment_df: pd.DataFrame, player_faction_standings: dict[str, str]) -> pd.DataFrame:
+    """Row-wise implementation that filter_augment_db used before vectorization."""
+    player_standings_num: dict[str, int] = {
+        faction: STANDING_LEVELS.get(level.title(), 0)
+        for faction, level in player_faction_standings.items()
+    }
+    augment_df["RequiredStandingNum"] = (
+        augment_df["Required Faction Level"].str.title().map(STANDING_LEVELS)
+    )
+
+    def player_meets_requirement(row):
+        player_level: int = player_standings_num.get(row["Faction"], 0)
+        required_level: int = row["RequiredStandingNum"]
+        if pd.isna(required_level):
+            return False
+        return player_level >= required_level
+
+    return augment_df[augment_df.apply(player_meets_requirement, axis=1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Number of timed calls per implementation")
+    args = parser.parse_args()
+
+    catalog = get_catalog("data/component_data.csv", "data/augment_data.csv")
+    augments = catalog.augments
+    legacy_df: pd.DataFrame = augments.frame.copy()
+    optimizer = ResistanceOptimizer(
+        target_resistances={res: 80 for res in RESISTANCE_TYPES},
+        player_faction_standings=FACTION_STANDINGS,
+        catalog=catalog,
+    )
+
+    # Both implementations must select the same augments
+    legacy_rows: np.ndarray = legacy_filter_augment_db(legacy_df, FACTION_STANDINGS).index.to_numpy()
+    vectorized_rows: np.ndarray = np.flatnonzero(optimizer.filter_augment_db(augments))
+    assert np.array_equal(legacy_rows, vectorized_rows), "Vectorized filter selected different augments"
+
+    legacy_time: float = timeit.timeit(
+        lambda: legacy_filter_augment_db(legacy_df, FACTION_STANDINGS), number=args.repeat
+    ) / args.repeat
+    vectorized_time: float = timeit.timeit(
+        lambda: optimizer.filter_augment_db(augments), number=args.repeat
+    ) / args.repeat
+
+    print(f"augments: {len(augments)}, selected: {len(vectorized_rows)}")
+    print(f"legacy apply:      {legacy_time * 1e6:10.1f} us/call")
+    print(f"vectorized lookup: {vectorized_time * 1e6:10.1f} us/call")
+    print(f"speedup:           {legacy_time / vectorized_time:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Differential check of the array model builder against the original iterrows builder.
+
+Solves randomized configurations with the model of ResistanceOptimizer.build_model and with a frozen
+copy of the iterrows builder the optimizer used before build_resistance_model, and checks that both
+reach the same penalty objective. With pruning disabled, both models must also have the same number
+of variables. Exits with status 1 on any mismatch.
+
+Usage:
+    python benchmarks/bench_model_builder.py [--cases 100] [--seed 0]
+"""
+import argparse
+import random
+import sys
+import time
+
+import pulp
+
+sys.path.append(".")  # Run from the repository root
+from bench_engines import AUGMENT_CSV_PATH, COMPONENT_CSV_PATH, percentile, random_config
+from src.catalog import ItemCatalog, get_catalog
+from src.optimizer_config import parse_optimizer_config
+from src.resistance_optimizer import ResistanceOptimizer
+from src.solvers import make_solver
+
+
+def build_iterrows_model(optimizer: ResistanceOptimizer) -> pulp.LpProblem:
+    """Build the model the way the optimizer did before the array builder, kept unchanged as a reference."""
+    prob = pulp.LpProblem("Resistance_Optimization", pulp.LpMinimize)
+    useful_components = optimizer.useful_components
+    useful_augments = optimizer.useful_augments
+
+    # Decision variables: binary variable for each component-slot combination
+    component_slot_vars = {}
+    for i, item in useful_components.iterrows():
+        allowed_gear_slots = [slot for slot in optimizer.available_component_slots if item[slot]]
+        for slot in allowed_gear_slots:
+            component_slot_vars[(i, slot)] = pulp.LpVariable(f"comp_{i}_{slot}", cat="Binary")
+
+    # Decision variables: binary variable for each augment-slot combination
+    augment_slot_vars = {}
+    for i, item in useful_augments.iterrows():
+        allowed_gear_slots = [slot for slot in optimizer.available_augment_slots if item[slot]]
+        for slot in allowed_gear_slots:
+            augment_slot_vars[(i, slot)] = pulp.LpVariable(f"aug_{i}_{slot}", cat="Binary")
+
+    # Constraint: Each gear slot can only have one component
+    for slot in optimizer.available_component_slots:
+        items_for_slot = [
+            (i, slot) for i, item in useful_components.iterrows() if item[slot] and (i, slot) in component_slot_vars
+        ]
+        if items_for_slot:
+            prob += pulp.lpSum(component_slot_vars[idx] for idx in items_for_slot) <= 1
+
+    # Constraint: Each gear slot can only have one augment
+    for slot in optimizer.available_augment_slots:
+        items_for_slot = [
+            (i, slot) for i, item in useful_augments.iterrows() if item[slot] and (i, slot) in augment_slot_vars
+        ]
+        if items_for_slot:
+            prob += pulp.lpSum(augment_slot_vars[idx] for idx in items_for_slot) <= 1
+
+    # Error variables for shortfall in resistances and armor absorption percentage
+    resistance_shortfall = {
+        res: pulp.LpVariable(f"shortfall_{res}", lowBound=0, cat="Continuous") for res in optimizer.resistance_types
+    }
+    armor_shortfall = pulp.LpVariable("shortfall_armor", lowBound=0, cat="Continuous")
+
+    # Secondary objective: Minimize number of components and augments used
+    item_count = []
+    for items, slots, slot_vars in (
+        (useful_components, optimizer.available_component_slots, component_slot_vars),
+        (useful_augments, optimizer.available_augment_slots, augment_slot_vars),
+    ):
+        for i, item in items.iterrows():
+            allowed_gear_slots = [slot for slot in slots if item[slot]]
+            if allowed_gear_slots:
+                item_count.append(pulp.lpSum(slot_vars[(i, slot)] for slot in allowed_gear_slots))
+
+    # Primary objective: Minimize total shortfall in resistances
+    for res in optimizer.resistance_types:
+        gained = []
+        for i, item in useful_components.iterrows():
+            for slot in optimizer.available_component_slots:
+                if item[slot] and (i, slot) in component_slot_vars:
+                    gained.append(component_slot_vars[(i, slot)] * item[res])
+        for i, item in useful_augments.iterrows():
+            for slot in optimizer.available_augment_slots:
+                if item[slot] and (i, slot) in augment_slot_vars:
+                    gained.append(augment_slot_vars[(i, slot)] * item[res])
+        prob += (
+            optimizer.current_resistances[res] + pulp.lpSum(gained) + resistance_shortfall[res]
+            >= optimizer.target_resistances[res]
+        )
+
+    # Primary objective: Minimize total shortfall in armor absorption percentage
+    armor_abs_gained = []
+    for i, item in useful_components.iterrows():
+        for slot in optimizer.available_component_slots:
+            if item[slot] and (i, slot) in component_slot_vars:
+                armor_abs_gained.append(component_slot_vars[(i, slot)] * item.get("Armor Absorption %", 0))
+    for i, item in useful_augments.iterrows():
+        for slot in optimizer.available_augment_slots:
+            if item[slot] and (i, slot) in augment_slot_vars:
+                armor_abs_gained.append(augment_slot_vars[(i, slot)] * item.get("Armor Absorption %", 0))
+    prob += pulp.lpSum(armor_abs_gained) + armor_shortfall >= optimizer.required_armor_abs_percentage
+
+    prob += (
+        (1e4 * pulp.lpSum(resistance_shortfall.values()))
+        + (1e3 * armor_shortfall)
+        + (1 * pulp.lpSum(item_count))
+    )
+    return prob
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100, help="Number of random configurations")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the configuration generator")
+    args = parser.parse_args()
+
+    catalog: ItemCatalog = get_catalog(COMPONENT_CSV_PATH, AUGMENT_CSV_PATH)
+    rng = random.Random(args.seed)
+    reference_times: list[float] = []
+    builder_times: list[float] = []
+    mismatches: int = 0
+
+    for case in range(args.cases):
+        config: dict = random_config(rng, catalog)
+        # Alternate pruning so that both the unpruned and the pruned model are compared
+        prune_dominated: bool = case % 2 == 1
+        optimizer = ResistanceOptimizer(
+            **parse_optimizer_config(config), catalog=catalog, prune_dominated=prune_dominated
+        )
+
+        start: float = time.perf_counter()
+        reference: pulp.LpProblem = build_iterrows_model(optimizer)
+        reference_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        model = optimizer.build_model()
+        builder_times.append(time.perf_counter() - start)
+
+        reference.solve(make_solver("cbc"))
+        model.prob.solve(make_solver("cbc"))
+        statuses: tuple[str, str] = (pulp.LpStatus[reference.status], pulp.LpStatus[model.prob.status])
+        reference_objective: float = pulp.value(reference.objective) or 0.0
+        builder_objective: float = pulp.value(model.prob.objective) or 0.0
+
+        problems: list[str] = []
+        if statuses != ("Optimal", "Optimal"):
+            problems.append(f"statuses {statuses}")
+        if abs(reference_objective - builder_objective) > 1e-6:
+            problems.append(f"objective iterrows {reference_objective:g}, arrays {builder_objective:g}")
+        if not prune_dominated and reference.numVariables() != model.prob.numVariables():
+            problems.append(f"variables iterrows {reference.numVariables()}, arrays {model.prob.numVariables()}")
+        if problems:
+            mismatches += 1
+            print(f"case {case} (prune_dominated={prune_dominated}): {'; '.join(problems)}")
+            print(f"  config: {config}")
+
+    for name, samples in (("iterrows build", reference_times), ("array build", builder_times)):
+        print(
+            f"{name:>14}: p50 {percentile(samples, 0.5) * 1e3:7.1f} ms"
+            f"  p95 {percentile(samples, 0.95) * 1e3:7.1f} ms  max {max(samples) * 1e3:7.1f} ms"
+        )
+    print(f"cases: {args.cases}, mismatches: {mismatches}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
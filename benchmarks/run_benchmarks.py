@@ -0,0 +1,239 @@
+"""Benchmark suite for ResistanceOptimizer and the web front end.
+
+Times every phase of an optimization (catalog load, input filtering, model build, solve and
+result decoding) plus the Flask "/" route end to end, over a fixed corpus of representative
+configurations. Reports p50/p95 timings and peak traced memory per phase and writes a
+machine-readable JSON report that can be compared across commits.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--repeat 3] [--output bench.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+sys.path.append(".")  # Run from the repository root
+from src.catalog import ItemCatalog, get_catalog, load_catalog
+from src.optimizer_config import (
+    BLOCKABLE_SLOTS,
+    FACTIONS,
+    RESISTANCE_KEYS,
+    WEAPON_TEMPLATES,
+    parse_optimizer_config,
+)
+from src.resistance_optimizer import ResistanceOptimizer
+from src.solvers import make_solver
+
+COMPONENT_CSV_PATH: str = "data/component_data.csv"
+AUGMENT_CSV_PATH: str = "data/augment_data.csv"
+
+PHASES: list[str] = ["load", "filter", "build", "solve", "decode", "total", "flask_form"]
+
+
+def build_corpus(catalog: ItemCatalog) -> list[tuple[str, dict]]:
+    """Build the fixed corpus of named configurations.
+
+    Args:
+        catalog (ItemCatalog): Catalog used to pick blacklisted items.
+
+    Returns:
+        list[tuple[str, dict]]: Configuration name and configuration in the parse_optimizer_config schema.
+    """
+    corpus: list[tuple[str, dict]] = []
+    for template in WEAPON_TEMPLATES:
+        for level in (25, 100):
+            corpus.append((f"{template}-L{level}", {"weapon_template": template, "character_level": level}))
+
+    # Every other item of both catalogs blacklisted
+    corpus.append(("heavy-blacklist", {
+        "component_blacklist": catalog.components.names[::2].tolist(),
+        "augment_blacklist": catalog.augments.names[::2].tolist(),
+    }))
+    # Most slots blocked for both components and augments
+    corpus.append(("many-blocked-slots", {
+        "unavailable_component_slots": BLOCKABLE_SLOTS[:9],
+        "unavailable_augment_slots": BLOCKABLE_SLOTS[2:11],
+    }))
+    # Targets far beyond what the available items can reach
+    corpus.append(("over-cap-targets", {
+        "weapon_template": "two-hand-melee",
+        "current_resistances": {"fire": 0, "cold": 0, "chaos": -20},
+        "target_resistances": {"fire": 150, "cold": 150, "lightning": 120, "chaos": 120, "aether": 120},
+        "armor_absorption": 50,
+    }))
+    # Barely any faction augments unlocked
+    corpus.append(("low-standings", {
+        "character_level": 60,
+        "faction_standings": {faction: "Friendly" for faction in FACTIONS},
+    }))
+    return corpus
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of the samples."""
+    ordered: list[float] = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered) + 0.5) - 1))]
+
+
+def run_phases(config: dict, catalog: ItemCatalog) -> dict[str, float]:
+    """Run one optimization, timing each phase separately."""
+    timings: dict[str, float] = {}
+    start: float = time.perf_counter()
+    optimizer = ResistanceOptimizer(**parse_optimizer_config(config), catalog=catalog)
+    timings["filter"] = time.perf_counter() - start
+
+    phase_start: float = time.perf_counter()
+    model = optimizer.build_model()
+    timings["build"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    model.prob.solve(make_solver(optimizer.solver_backend))
+    timings["solve"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    optimizer.decode_solution(model)
+    timings["decode"] = time.perf_counter() - phase_start
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def form_fields(config: dict) -> dict[str, Any]:
+    """Translate a corpus configuration into the fields the HTML form would submit."""
+    from web.app import FACTION_FORM_FIELDS, SLOT_FORM_FIELDS
+
+    kwargs: dict = parse_optimizer_config(config)
+    fields: dict[str, Any] = {
+        "template": kwargs["weapon_template"],
+        "char-level": str(kwargs["character_level"]),
+        "armor-abs-value": str(kwargs["current_armor_abs_percentage"]),
+        "component_blacklist[]": kwargs["component_blacklist"],
+        "augment_blacklist[]": kwargs["augment_blacklist"],
+    }
+    for key, res in RESISTANCE_KEYS.items():
+        fields[f"current-{key}"] = str(kwargs["current_resistances"][res])
+        fields[f"target-{key}"] = str(kwargs["target_resistances"][res])
+    for slot, field in SLOT_FORM_FIELDS.items():
+        if kwargs["unavailable_component_slots"][slot]:
+            fields[f"component-{field}"] = "on"
+        if kwargs["unavailable_augment_slots"][slot]:
+            fields[f"augment-{field}"] = "on"
+    for faction, field in FACTION_FORM_FIELDS.items():
+        fields[field] = kwargs["player_faction_standings"][faction]
+    return fields
+
+
+def measure_memory(run: Callable[[], Any]) -> float:
+    """Peak memory traced while running the callable, in KiB."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(repeat: int) -> dict:
+    """Run the whole suite and collect per-phase samples."""
+    samples: dict[str, list[float]] = {phase: [] for phase in PHASES}
+    peaks: dict[str, float] = {}
+
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        load_catalog(COMPONENT_CSV_PATH, AUGMENT_CSV_PATH)
+        samples["load"].append(time.perf_counter() - start)
+    peaks["load"] = measure_memory(lambda: load_catalog(COMPONENT_CSV_PATH, AUGMENT_CSV_PATH))
+
+    catalog: ItemCatalog = get_catalog(COMPONENT_CSV_PATH, AUGMENT_CSV_PATH)
+    corpus: list[tuple[str, dict]] = build_corpus(catalog)
+    per_config: dict[str, float] = {}
+    for _ in range(repeat):
+        for name, config in corpus:
+            timings: dict[str, float] = run_phases(config, catalog)
+            for phase, seconds in timings.items():
+                samples[phase].append(seconds)
+            per_config[name] = min(per_config.get(name, float("inf")), timings["total"])
+    peaks["total"] = max(measure_memory(lambda config=config: run_phases(config, catalog)) for _, config in corpus)
+
+    # End to end through the Flask test client, without the result cache and the answer table
+    import web.app as web_app
+
+    web_app.result_cache = None
+    web_app.answer_table = None
+    client = web_app.app.test_client()
+    forms: list[dict] = [form_fields(config) for _, config in corpus]
+    for _ in range(repeat):
+        for fields in forms:
+            start = time.perf_counter()
+            response = client.post("/", data=fields)
+            samples["flask_form"].append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+    peaks["flask_form"] = max(measure_memory(lambda fields=fields: client.post("/", data=fields)) for fields in forms)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "corpus": [name for name, _ in corpus],
+        "phases": {
+            phase: {
+                "n": len(values),
+                "mean_ms": statistics.fmean(values) * 1000,
+                "p50_ms": percentile(values, 0.50) * 1000,
+                "p95_ms": percentile(values, 0.95) * 1000,
+                "peak_kib": peaks.get(phase),
+            }
+            for phase, values in samples.items()
+            if values
+        },
+        "configs_best_total_ms": {name: seconds * 1000 for name, seconds in per_config.items()},
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report: dict, baseline: dict | None) -> None:
+    print(f"commit {report['commit']}, python {report['python']}, {report['repeat']} repeats")
+    print(f"{'phase':<12}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>12}" + (f"{'p50 vs base':>14}" if baseline else ""))
+    for phase, stats in report["phases"].items():
+        peak: str = f"{stats['peak_kib']:.0f}" if stats["peak_kib"] is not None else "-"
+        line: str = f"{phase:<12}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{peak:>12}"
+        base_stats: dict | None = (baseline or {}).get("phases", {}).get(phase)
+        if base_stats:
+            line += f"{stats['p50_ms'] / base_stats['p50_ms']:>13.2f}x"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="Number of passes over the corpus")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report of a previous run to compare against")
+    args = parser.parse_args()
+
+    report: dict = run_suite(args.repeat)
+    baseline: dict | None = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Gunicorn settings of the web service, used by the Dockerfile.
+
+The application is created once in the master process (preload_app) and the workers are forked
+from it, so they start ready to serve and share the catalog and the imported modules
+copy-on-write. Every setting can still be overridden on the command line or through
+GUNICORN_CMD_ARGS.
+"""
+import gc
+import os
+import threading
+import time
+
+wsgi_app = "web.app:app"
+bind = os.environ.get("GD_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "gthread"
+threads = int(os.environ.get("GD_THREADS", 8))
+preload_app = True
+
+
+def when_ready(server):
+    """Report the startup phases of the master and freeze its objects before forking."""
+    from web.app import startup_seconds
+
+    server.log.info(
+        "Application loaded: %s", ", ".join(f"{phase} {seconds:.3f} s" for phase, seconds in startup_seconds.items())
+    )
+    # Keep the garbage collector of the workers from writing to, and thereby copying, the pages
+    # of the objects loaded by the master
+    gc.freeze()
+
+
+def pre_fork(server, worker):
+    worker.fork_started = time.perf_counter()
+
+
+def post_worker_init(worker):
+    """Report how long the worker took to become ready and start its solver processes."""
+    from web.app import record_startup, solver_pool
+
+    ready: float = time.perf_counter() - worker.fork_started
+    record_startup("worker", ready)
+    worker.log.info("Worker %s ready in %.3f s", worker.pid, ready)
+    # The first solve would otherwise wait for the solver processes to import the optimizer
+    threading.Thread(target=solver_pool.start, name="solver-pool-start", daemon=True).start()
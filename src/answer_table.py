@@ -0,0 +1,251 @@
+"""Precomputed answers for the most common request profiles.
+
+Usage:
+    python -m src.answer_table data/answer_table.sqlite [--levels 1,20,90] [--currents 0,40] [--workers 4]
+
+The generator solves every weapon template at each unlock level (the distinct required levels of the
+catalog) and each uniform current resistance value, with the default targets, armor absorption and
+faction standings of the web form. Each answer is stored in a SQLite table keyed by
+``ResistanceOptimizer.cache_key()``, which includes the catalog version, so that answers computed from
+other catalog CSVs never match.
+
+Lookups only hit on an exact match of every other input. The cache key reduces the character level to
+its unlock level, so any level of a grid template hits, but the current resistances must all equal one
+grid value: the 40 prefilled by the web form or the 0 the JSON API assumes for omitted resistances.
+Uniform values in between were dropped from the grid, no form submission produces them. A request
+that changes a single resistance, target, blocked slot, blacklist or standing misses; the hits and
+misses are reported under "answer_table" by /api/cache-stats.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Iterator
+
+from src.catalog import ItemCatalog, get_catalog
+from src.optimizer_config import RESISTANCE_KEYS, WEAPON_TEMPLATES, parse_optimizer_config
+from src.resistance_optimizer import ResistanceOptimizer
+
+DEFAULT_COMPONENT_CSV_PATH: str = "data/component_data.csv"
+DEFAULT_AUGMENT_CSV_PATH: str = "data/augment_data.csv"
+# Uniform current resistances of the grid: the JSON API default and the value prefilled by the web form
+DEFAULT_CURRENT_RESISTANCES: tuple[int, ...] = (0, 40)
+
+
+class AnswerTable:
+    """Read-only lookup of precomputed optimization results.
+
+    The SQLite file is opened lazily on the first lookup. Lookups for a catalog version other than
+    the one the table was generated from miss without touching the file, so editing the catalog
+    CSVs invalidates the table automatically.
+    """
+
+    def __init__(self, path: str):
+        """Create the lookup.
+
+        Args:
+            path (str): SQLite file written by generate_answer_table; a missing file disables the table.
+        """
+        self.path: str = path
+        self.catalog_version: str | None = None
+        self.entries: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._opened: bool = False
+        self._open_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's read-only connection to the table."""
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(f"file:{self.path}?mode=ro&immutable=1", uri=True)
+            self._local.connection = connection
+        return connection
+
+    def open(self) -> bool:
+        """Read the table metadata once.
+
+        Returns:
+            bool: True if the table exists and can answer lookups.
+        """
+        with self._open_lock:
+            if not self._opened:
+                self._opened = True
+                if os.path.exists(self.path):
+                    try:
+                        connection: sqlite3.Connection = self._connection()
+                        self.catalog_version = connection.execute(
+                            "SELECT value FROM meta WHERE name = 'catalog_version'"
+                        ).fetchone()[0]
+                        self.entries = connection.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+                    except (sqlite3.Error, TypeError):
+                        self.catalog_version = None
+        return self.catalog_version is not None
+
+    def get(self, key: str, catalog_version: str) -> Any | None:
+        """Look up a precomputed result.
+
+        Args:
+            key (str): Cache key of the optimizer inputs.
+            catalog_version (str): Version of the catalog the optimizer runs on.
+
+        Returns:
+            Any | None: The stored result, or None if the table has no answer for these inputs.
+        """
+        if not self.open() or catalog_version != self.catalog_version:
+            self.misses += 1
+            return None
+
+        row = self._connection().execute("SELECT value FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def stats(self) -> dict[str, Any]:
+        """Return the table counters.
+
+        Returns:
+            dict[str, Any]: Catalog version, number of stored answers, hits and misses.
+        """
+        self.open()
+        return {"catalog_version": self.catalog_version, "entries": self.entries, "hits": self.hits, "misses": self.misses}
+
+
+def common_profiles(levels: Iterable[int], current_values: Iterable[int]) -> Iterator[dict]:
+    """Yield the configurations of the answer table grid.
+
+    Args:
+        levels (Iterable[int]): Character levels.
+        current_values (Iterable[int]): Current value applied to every resistance.
+
+    Yields:
+        dict: Configuration in the schema accepted by parse_optimizer_config.
+    """
+    for template in WEAPON_TEMPLATES:
+        for level in levels:
+            for current in current_values:
+                yield {
+                    "weapon_template": template,
+                    "character_level": level,
+                    "current_resistances": {res: current for res in RESISTANCE_KEYS},
+                }
+
+
+def _solve_profile(config: dict, component_csv_path: str, augment_csv_path: str) -> tuple[str, str | None]:
+    """Solve one profile, returning its cache key and the JSON encoded result."""
+    optimizer = ResistanceOptimizer(
+        **parse_optimizer_config(config),
+        component_csv_path=component_csv_path,
+        augment_csv_path=augment_csv_path,
+    )
+    result = optimizer.solve_resistances()
+    return optimizer.cache_key(), json.dumps(result) if result[0] is not None else None
+
+
+def generate_answer_table(
+    path: str,
+    levels: Iterable[int] | None = None,
+    current_values: Iterable[int] = DEFAULT_CURRENT_RESISTANCES,
+    workers: int | None = None,
+    component_csv_path: str = DEFAULT_COMPONENT_CSV_PATH,
+    augment_csv_path: str = DEFAULT_AUGMENT_CSV_PATH,
+) -> int:
+    """Solve the grid of common profiles and write the answers to a new SQLite file.
+
+    The table is written to a temporary file and moved into place, so that readers never see a
+    partially written table.
+
+    Args:
+        path (str): SQLite file to write.
+        levels (Iterable[int] | None): Character levels of the grid, defaults to every unlock level.
+        current_values (Iterable[int]): Uniform current resistance values of the grid.
+        workers (int | None): Number of worker processes, defaults to the number of CPUs.
+        component_csv_path (str): Path to the component CSV.
+        augment_csv_path (str): Path to the augment CSV.
+
+    Returns:
+        int: Number of stored answers.
+    """
+    catalog: ItemCatalog = get_catalog(component_csv_path, augment_csv_path)
+    # Levels with the same unlock level share a cache key, each is solved once
+    unlock_levels: list[int] = (
+        catalog.unlock_levels().tolist()
+        if levels is None
+        else sorted({catalog.unlock_level(level) for level in levels})
+    )
+    profiles: list[dict] = list(common_profiles(unlock_levels, current_values))
+
+    temporary_path: str = f"{path}.tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    connection: sqlite3.Connection = sqlite3.connect(temporary_path)
+    connection.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    connection.execute("CREATE TABLE answers (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+    connection.execute("INSERT INTO meta VALUES ('catalog_version', ?)", (catalog.version,))
+
+    stored: int = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+        answers = executor.map(
+            _solve_profile,
+            profiles,
+            [component_csv_path] * len(profiles),
+            [augment_csv_path] * len(profiles),
+            chunksize=8,
+        )
+        for key, value in answers:
+            if value is not None:
+                connection.execute("INSERT OR REPLACE INTO answers VALUES (?, ?)", (key, value))
+                stored += 1
+
+    connection.commit()
+    connection.execute("VACUUM")
+    connection.close()
+    os.replace(temporary_path, path)
+    return stored
+
+
+def _grid(value: str) -> list[int]:
+    """Parse a grid argument, either "start:stop:step" with stop included or a comma-separated list."""
+    if ":" in value:
+        start, stop, step = (int(part) for part in value.split(":"))
+        return list(range(start, stop + 1, step))
+    return [int(part) for part in value.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute answers for the most common request profiles.")
+    parser.add_argument("output", help="SQLite file to write")
+    parser.add_argument(
+        "--levels",
+        type=_grid,
+        default=None,
+        help="Character levels as start:stop:step or a list, every unlock level by default",
+    )
+    parser.add_argument(
+        "--currents",
+        type=_grid,
+        default=DEFAULT_CURRENT_RESISTANCES,
+        help="Current resistances as start:stop:step or a list",
+    )
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--component-csv", default=DEFAULT_COMPONENT_CSV_PATH)
+    parser.add_argument("--augment-csv", default=DEFAULT_AUGMENT_CSV_PATH)
+    args = parser.parse_args()
+
+    start: float = time.perf_counter()
+    stored: int = generate_answer_table(
+        args.output, args.levels, args.currents, args.workers, args.component_csv, args.augment_csv
+    )
+    print(f"{stored} answers written to {args.output} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Solve many character configurations in parallel on a process pool.
+
+Usage:
+    python -m src.batch configs.jsonl [-o results.jsonl] [--workers 4]
+
+The input is a JSON list or a JSONL stream (use "-" for stdin) of configurations in the schema
+accepted by ``parse_optimizer_config``. Results are written as JSONL in input order.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable, Iterator
+
+from src.catalog import get_catalog
+from src.optimizer_config import ConfigError, parse_optimizer_config
+from src.resistance_optimizer import ResistanceOptimizer
+
+DEFAULT_COMPONENT_CSV_PATH: str = "data/component_data.csv"
+DEFAULT_AUGMENT_CSV_PATH: str = "data/augment_data.csv"
+
+# Jobs submitted ahead of the one being waited on, per worker, to keep the pool busy
+PREFETCH_PER_WORKER: int = 4
+
+_worker_csv_paths: tuple[str, str] = (DEFAULT_COMPONENT_CSV_PATH, DEFAULT_AUGMENT_CSV_PATH)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one configuration of a batch.
+
+    Attributes:
+        index (int): Position of the configuration in the input.
+        status (str): "optimal", "infeasible" or "error".
+        seconds (float): Wall time spent on the job inside the worker.
+        result (dict | None): Optimization summary, see ResistanceOptimizer.optimize_summary.
+        error (str | None): Error message of a failed job.
+    """
+
+    index: int
+    status: str
+    seconds: float
+    result: dict | None = None
+    error: str | None = None
+
+
+def _init_worker(component_csv_path: str, augment_csv_path: str) -> None:
+    """Load the catalog once per worker process so that every job reuses it."""
+    global _worker_csv_paths
+    _worker_csv_paths = (component_csv_path, augment_csv_path)
+    get_catalog(component_csv_path, augment_csv_path)
+
+
+def solve_config(index: int, config: Any) -> BatchResult:
+    """Solve one configuration, turning any failure into an error result.
+
+    Args:
+        index (int): Position of the configuration in the input.
+        config (Any): Configuration in the schema accepted by parse_optimizer_config.
+
+    Returns:
+        BatchResult: Outcome of the job.
+    """
+    start: float = time.perf_counter()
+    try:
+        if isinstance(config, ConfigError):
+            raise config
+        optimizer = ResistanceOptimizer(
+            **parse_optimizer_config(config),
+            component_csv_path=_worker_csv_paths[0],
+            augment_csv_path=_worker_csv_paths[1],
+        )
+        summary: dict = optimizer.optimize_summary()
+    except ConfigError as error:
+        return BatchResult(index, "error", time.perf_counter() - start, error=f"invalid configuration: {error}")
+    except Exception:
+        return BatchResult(index, "error", time.perf_counter() - start, error=traceback.format_exc(limit=3))
+
+    return BatchResult(index, summary["status"], time.perf_counter() - start, result=summary)
+
+
+def run_batch(
+    configs: Iterable[Any],
+    workers: int | None = None,
+    component_csv_path: str = DEFAULT_COMPONENT_CSV_PATH,
+    augment_csv_path: str = DEFAULT_AUGMENT_CSV_PATH,
+) -> Iterator[BatchResult]:
+    """Fan configurations out across a process pool and stream the results back in input order.
+
+    Configurations are consumed lazily, so arbitrarily long streams run in bounded memory. A
+    failing job yields an error result instead of aborting the batch.
+
+    Args:
+        configs (Iterable[Any]): Configurations in the schema accepted by parse_optimizer_config.
+        workers (int | None): Number of worker processes, defaults to the number of CPUs.
+        component_csv_path (str): Path to the component CSV.
+        augment_csv_path (str): Path to the augment CSV.
+
+    Yields:
+        BatchResult: Outcome of each configuration, in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending: deque[tuple[int, Future]] = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(component_csv_path, augment_csv_path),
+    ) as executor:
+        for index, config in enumerate(configs):
+            pending.append((index, executor.submit(solve_config, index, config)))
+            if len(pending) >= workers * PREFETCH_PER_WORKER:
+                yield _collect(*pending.popleft())
+
+        while pending:
+            yield _collect(*pending.popleft())
+
+
+def _collect(index: int, future: Future) -> BatchResult:
+    """Wait for a job, reporting a crashed worker as an error result."""
+    try:
+        return future.result()
+    except Exception as error:
+        return BatchResult(index, "error", 0.0, error=f"worker failed: {error!r}")
+
+
+def read_configs(stream) -> Iterator[Any]:
+    """Read configurations from a JSON list or a JSONL stream.
+
+    Args:
+        stream (TextIO): Text stream to read from.
+
+    Yields:
+        Any: Decoded configurations, or a ConfigError for a line that is not valid JSON.
+    """
+    first_line: str = stream.readline()
+    while first_line and not first_line.strip():
+        first_line = stream.readline()
+
+    if first_line.lstrip().startswith("["):
+        yield from json.loads(first_line + stream.read())
+        return
+
+    for number, line in enumerate(itertools.chain([first_line], stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            # Reported as a failed job so that one bad line doesn't abort the batch
+            yield ConfigError(f"line {number} is not valid JSON: {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve many character configurations in parallel.")
+    parser.add_argument("input", help='JSON list or JSONL file of configurations, "-" for stdin')
+    parser.add_argument("-o", "--output", default="-", help='JSONL file to write results to, "-" for stdout')
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--component-csv", default=DEFAULT_COMPONENT_CSV_PATH)
+    parser.add_argument("--augment-csv", default=DEFAULT_AUGMENT_CSV_PATH)
+    args = parser.parse_args()
+
+    source = nullcontext(sys.stdin) if args.input == "-" else open(args.input)
+    sink = nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w")
+
+    start: float = time.perf_counter()
+    counts: dict[str, int] = {}
+    with source as source, sink as sink:
+        for result in run_batch(read_configs(source), args.workers, args.component_csv, args.augment_csv):
+            counts[result.status] = counts.get(result.status, 0) + 1
+            sink.write(json.dumps(asdict(result)) + "\n")
+            sink.flush()
+
+    print(
+        f"{sum(counts.values())} configurations in {time.perf_counter() - start:.2f}s: {counts}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
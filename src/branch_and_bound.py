@@ -0,0 +1,364 @@
+"""Exact branch and bound solver for the one-item-per-slot resistance problem.
+
+Every available (gear slot, item kind) pair is a position that holds one of its eligible items or
+nothing. Positions are searched depth first, most valuable first, with the same objective as the
+MILP of build_resistance_model: RES_PENALTY per missing resistance point, ARMOR_PENALTY per missing
+armor absorption point and ITEM_PENALTY per item.
+
+Nodes are pruned with a Lagrangian lower bound: the shortfall constraints are relaxed with one
+multiplier per stat, taken from the LP relaxation of the root, which leaves each remaining position
+to pick its best item independently. Positions with identical item lists are interchangeable and
+filled in non-decreasing item order, and search states reached again with no fewer items are
+skipped.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from src.model_builder import ARMOR_PENALTY, ITEM_PENALTY, RES_PENALTY, ItemCandidates
+
+# Search nodes explored before giving up, so that callers can fall back to the MILP
+DEFAULT_MAX_NODES: int = 2000
+
+# Simplex pivots spent on the root LP relaxation; any intermediate solution still gives a valid bound
+MAX_PIVOTS: int = 200
+
+# Tolerance on objective and pivot comparisons
+EPSILON: float = 1e-9
+
+
+class NodeLimitExceeded(RuntimeError):
+    """Raised when the search explores more nodes than allowed.
+
+    Attributes:
+        incumbent (AssignmentSolution | None): Best assignment found before giving up, None if none was.
+        lower_bound (float): Lower bound on the objective of every assignment.
+    """
+
+    def __init__(self, message: str, incumbent: "AssignmentSolution | None" = None, lower_bound: float = 0.0):
+        super().__init__(message)
+        self.incumbent: AssignmentSolution | None = incumbent
+        self.lower_bound: float = lower_bound
+
+
+@dataclass
+class AssignmentSolution:
+    """Optimal choice of at most one component and one augment per gear slot.
+
+    Attributes:
+        component_items (np.ndarray): Candidate index of every chosen component.
+        component_slots (np.ndarray): Slot index, in ``components.slots``, of every chosen component.
+        augment_items (np.ndarray): Candidate index of every chosen augment.
+        augment_slots (np.ndarray): Slot index, in ``augments.slots``, of every chosen augment.
+        objective (float): Objective value with the same weighting as the MILP.
+        nodes (int): Number of search nodes explored.
+    """
+
+    component_items: np.ndarray
+    component_slots: np.ndarray
+    augment_items: np.ndarray
+    augment_slots: np.ndarray
+    objective: float
+    nodes: int
+
+
+@dataclass
+class _Position:
+    """One (gear slot, item kind) position and the items that may fill it."""
+
+    kind: str
+    slot: int
+    items: np.ndarray
+    stats: np.ndarray
+    # Index of the group of positions with the same kind and item list
+    group: int = 0
+    same_as_previous: bool = False
+
+
+def _maximize(objective: np.ndarray, constraints: np.ndarray, limits: np.ndarray, max_pivots: int) -> np.ndarray:
+    """Maximize ``objective @ y`` subject to ``constraints @ y <= limits`` and ``y >= 0``, with ``limits >= 0``.
+
+    Dense tableau simplex starting from the all-slack basis. The returned point is feasible even if
+    the pivot limit stops the simplex before the optimum.
+    """
+    rows, columns = constraints.shape
+    tableau: np.ndarray = np.zeros((rows + 1, columns + rows + 1))
+    tableau[:rows, :columns] = constraints
+    tableau[np.arange(rows), columns + np.arange(rows)] = 1
+    tableau[:rows, -1] = limits
+    tableau[rows, :columns] = -objective
+    basis: np.ndarray = np.arange(columns, columns + rows)
+
+    for _ in range(max_pivots):
+        entering: int = int(np.argmin(tableau[rows, :-1]))
+        if tableau[rows, entering] >= -EPSILON:
+            break
+        column: np.ndarray = tableau[:rows, entering]
+        ratios: np.ndarray = np.full(rows, np.inf)
+        positive: np.ndarray = column > EPSILON
+        ratios[positive] = tableau[:rows, -1][positive] / column[positive]
+        leaving: int = int(np.argmin(ratios))
+        if not np.isfinite(ratios[leaving]):
+            break
+        tableau[leaving] /= tableau[leaving, entering]
+        factors: np.ndarray = tableau[:, entering].copy()
+        factors[leaving] = 0
+        tableau -= np.outer(factors, tableau[leaving])
+        basis[leaving] = entering
+
+    solution: np.ndarray = np.zeros(columns + rows)
+    solution[basis] = tableau[:rows, -1]
+    return solution[:columns]
+
+
+def _root_multipliers(
+    group_stats: list[np.ndarray],
+    group_sizes: np.ndarray,
+    deficit: np.ndarray,
+    weights: np.ndarray,
+    max_items: int | None = None,
+) -> np.ndarray:
+    """Solve the dual of the root LP relaxation for one multiplier per stat.
+
+    The dual reads: maximize ``deficit @ mu - sum(size_g * t_g)`` subject to
+    ``min(stats_j, deficit) @ mu - t_g <= ITEM_PENALTY`` for every item j of group g and
+    ``mu <= weights``, where t_g is the value of the best item of group g. An item budget k
+    adds the multiplier l of the budget row, ``- k * l`` to the objective and ``- l`` to every
+    item row.
+    """
+    stats: np.ndarray = np.minimum(np.concatenate(group_stats), deficit)
+    groups: np.ndarray = np.repeat(np.arange(len(group_stats)), [len(group) for group in group_stats])
+    dimensions: int = len(deficit)
+    budgeted: int = int(max_items is not None)
+
+    constraints: np.ndarray = np.zeros((len(stats) + dimensions, dimensions + len(group_stats) + budgeted))
+    constraints[: len(stats), :dimensions] = stats
+    constraints[np.arange(len(stats)), dimensions + groups] = -1
+    constraints[len(stats) :, :dimensions] = np.eye(dimensions)
+    objective: np.ndarray = np.concatenate([deficit, -group_sizes.astype(np.float64)])
+    if budgeted:
+        constraints[: len(stats), -1] = -1
+        objective = np.append(objective, -float(max_items))
+    limits: np.ndarray = np.concatenate([np.full(len(stats), ITEM_PENALTY), weights])
+
+    return np.clip(_maximize(objective, constraints, limits, MAX_PIVOTS)[:dimensions], 0, weights)
+
+
+class _Search:
+    """Depth-first branch and bound over positions, one item or nothing per position."""
+
+    def __init__(self, positions: list[_Position], deficit: np.ndarray, weights: np.ndarray, integral: bool,
+                 max_nodes: int, max_items: int | None = None,
+                 on_incumbent: Callable[[list[int], float], None] | None = None):
+        self.positions: list[_Position] = positions
+        self.weights: np.ndarray = weights
+        self.max_nodes: int = max_nodes
+        self.on_incumbent: Callable[[list[int], float], None] | None = on_incumbent
+        self.max_items: int = len(positions) if max_items is None else min(max_items, len(positions))
+        self.nodes: int = 0
+        # With integral stats every objective value is an integer, so a bound above best - 1 suffices to prune
+        self.prune_margin: float = ITEM_PENALTY - 1e-6 if integral else EPSILON
+
+        # For every position p, the item stats of the groups still present from p on, where each group
+        # starts, how many of its positions remain, and the per-stat maximum these positions can add
+        group_stats: dict[int, np.ndarray] = {position.group: position.stats for position in positions}
+        self.suffix_stats: list[np.ndarray] = []
+        self.suffix_offsets: list[np.ndarray] = []
+        self.suffix_sizes: list[np.ndarray] = []
+        self.suffix_bound: list[np.ndarray] = []
+        for p in range(len(positions) + 1):
+            sizes: dict[int, int] = {}
+            for position in positions[p:]:
+                sizes[position.group] = sizes.get(position.group, 0) + 1
+            lengths: list[int] = [len(group_stats[group]) for group in sizes]
+            self.suffix_stats.append(
+                np.concatenate([group_stats[group] for group in sizes]) if sizes else np.zeros((0, len(weights)))
+            )
+            self.suffix_offsets.append(np.concatenate([[0], np.cumsum(lengths[:-1])]).astype(np.intp))
+            self.suffix_sizes.append(np.array(list(sizes.values()), dtype=np.float64))
+            self.suffix_bound.append(
+                sum((group_stats[group].max(axis=0) * size for group, size in sizes.items()), np.zeros(len(weights)))
+            )
+
+        self.multipliers: np.ndarray = np.zeros(len(weights))
+        if positions:
+            self.multipliers = _root_multipliers(
+                [group_stats[group] for group in dict.fromkeys(position.group for position in positions)],
+                self.suffix_sizes[0],
+                np.minimum(np.maximum(deficit, 0), self.suffix_bound[0]),
+                weights,
+                max_items,
+            )
+
+        # Fewest items with which each (position, clipped deficit) state has been searched
+        self.visited: dict[tuple[int, bytes], int] = {}
+        self.best_objective: float = np.inf
+        self.best_choices: list[int] = []
+        self.choices: list[int] = [-1] * len(positions)
+        self.root_bound: float = self.lower_bound(0, np.maximum(deficit, 0), self.max_items)
+
+    def lower_bound(self, p: int, remaining: np.ndarray, items_left: int) -> float:
+        """Lower bound on the cost of filling positions p onwards given the remaining deficit."""
+        reachable: np.ndarray = np.minimum(remaining, self.suffix_bound[p])
+        bound: float = float(self.weights @ (remaining - reachable))
+        if not len(self.suffix_stats[p]):
+            return bound
+        # Each remaining position picks the item whose priced contribution most exceeds its item penalty
+        profits: np.ndarray = np.minimum(self.suffix_stats[p], reachable) @ self.multipliers - ITEM_PENALTY
+        best_profits: np.ndarray = np.maximum(np.maximum.reduceat(profits, self.suffix_offsets[p]), 0)
+        if items_left >= len(self.positions) - p:
+            return bound + float(self.multipliers @ reachable) - float(best_profits @ self.suffix_sizes[p])
+        # Under an item budget, only the most profitable positions that fit in it can be filled
+        position_profits: np.ndarray = np.repeat(best_profits, self.suffix_sizes[p].astype(np.intp))
+        filled: float = float(np.sort(position_profits)[len(position_profits) - items_left :].sum())
+        return bound + float(self.multipliers @ reachable) - filled
+
+    def search(self, p: int, deficit: np.ndarray, items_used: int) -> None:
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise NodeLimitExceeded(f"branch and bound exceeded {self.max_nodes} nodes")
+
+        remaining: np.ndarray = np.maximum(deficit, 0)
+        if p == len(self.positions):
+            objective: float = float(self.weights @ remaining) + ITEM_PENALTY * items_used
+            if objective < self.best_objective - EPSILON:
+                self.best_objective = objective
+                self.best_choices = self.choices.copy()
+                if self.on_incumbent is not None:
+                    self.on_incumbent(self.best_choices, objective)
+            return
+
+        state: tuple[int, bytes] = (p, remaining.tobytes())
+        if self.visited.get(state, items_used + 1) <= items_used:
+            return
+        self.visited[state] = items_used
+        items_left: int = self.max_items - items_used
+        if ITEM_PENALTY * items_used + self.lower_bound(p, remaining, items_left) > self.best_objective - self.prune_margin:
+            return
+        if not items_left:
+            # The item budget is spent, the remaining positions stay empty
+            self.choices[p:] = [-1] * (len(self.positions) - p)
+            self.search(len(self.positions), deficit, items_used)
+            return
+
+        position: _Position = self.positions[p]
+        # Interchangeable positions take items in non-decreasing order, leaving them empty last
+        first: int = self.choices[p - 1] if position.same_as_previous else 0
+        if first >= 0:
+            covered: np.ndarray = np.minimum(position.stats[first:], remaining)
+            gains: np.ndarray = covered @ self.weights
+            # Items the root LP values most first, so that good loadouts are found early
+            for j in np.lexsort((-gains, -(covered @ self.multipliers))).tolist():
+                # An item must cover more than its own penalty to be part of a better loadout
+                if gains[j] <= ITEM_PENALTY:
+                    continue
+                self.choices[p] = first + j
+                self.search(p + 1, deficit - position.stats[first + j], items_used + 1)
+
+        self.choices[p] = -1
+        self.search(p + 1, deficit, items_used)
+
+
+def solve_assignment(
+    components: ItemCandidates,
+    augments: ItemCandidates,
+    resistance_types: list[str],
+    current_resistances: dict[str, int],
+    target_resistances: dict[str, int],
+    required_armor_abs_percentage: float,
+    max_nodes: int = DEFAULT_MAX_NODES,
+    max_items: int | None = None,
+    on_incumbent: Callable[[AssignmentSolution], None] | None = None,
+) -> AssignmentSolution:
+    """Solve the resistance optimization exactly without a MILP solver.
+
+    Args:
+        components (ItemCandidates): Candidate components.
+        augments (ItemCandidates): Candidate augments.
+        resistance_types (list[str]): Resistance names, in column order of the resistance arrays.
+        current_resistances (dict[str, int]): Current resistances of the character.
+        target_resistances (dict[str, int]): Target resistances of the character.
+        required_armor_abs_percentage (float): Armor absorption percentage needed to hit the cap.
+        max_nodes (int): Maximum number of search nodes.
+        max_items (int | None): Maximum number of components and augments placed, no limit if None.
+        on_incumbent (Callable[[AssignmentSolution], None] | None): Called with every assignment
+            that improves on the best one found so far, the last one being optimal.
+
+    Returns:
+        AssignmentSolution: Optimal assignment.
+
+    Raises:
+        NodeLimitExceeded: If the search needs more than ``max_nodes`` nodes, along with the best
+                           assignment it found and the lower bound of its root.
+    """
+    deficit: np.ndarray = np.array(
+        [target_resistances[res] - current_resistances[res] for res in resistance_types]
+        + [required_armor_abs_percentage],
+        dtype=np.float64,
+    )
+    weights: np.ndarray = np.array([RES_PENALTY] * len(resistance_types) + [ARMOR_PENALTY])
+
+    positions: list[_Position] = []
+    for kind, candidates in (("component", components), ("augment", augments)):
+        stats: np.ndarray = np.column_stack([candidates.resistances, candidates.armor_abs]).astype(np.float64)
+        for s in range(len(candidates.slots)):
+            items: np.ndarray = np.flatnonzero(candidates.eligibility[:, s])
+            # Items that contribute to no stat are never worth their item penalty
+            items = items[(stats[items] > 0).any(axis=1)]
+            if len(items):
+                positions.append(_Position(kind=kind, slot=s, items=items, stats=stats[items]))
+
+    # Most valuable positions first, interchangeable positions next to each other
+    positive_deficit: np.ndarray = np.maximum(deficit, 0)
+    positions.sort(
+        key=lambda position: (
+            -float((np.minimum(position.stats, positive_deficit) @ weights).max()),
+            position.kind,
+            position.items.tolist(),
+        )
+    )
+    for p, position in enumerate(positions):
+        previous: _Position | None = positions[p - 1] if p else None
+        position.same_as_previous = bool(
+            previous is not None and previous.kind == position.kind and np.array_equal(previous.items, position.items)
+        )
+        position.group = previous.group + (not position.same_as_previous) if previous is not None else 0
+
+    integral: bool = bool(
+        np.all(np.mod(deficit, 1) == 0) and all(np.all(np.mod(position.stats, 1) == 0) for position in positions)
+    )
+    def assignment(choices: list[int], objective: float, nodes: int) -> AssignmentSolution:
+        chosen: dict[str, tuple[list[int], list[int]]] = {"component": ([], []), "augment": ([], [])}
+        for position, choice in zip(positions, choices):
+            if choice >= 0:
+                chosen[position.kind][0].append(int(position.items[choice]))
+                chosen[position.kind][1].append(position.slot)
+        return AssignmentSolution(
+            component_items=np.array(chosen["component"][0], dtype=np.intp),
+            component_slots=np.array(chosen["component"][1], dtype=np.intp),
+            augment_items=np.array(chosen["augment"][0], dtype=np.intp),
+            augment_slots=np.array(chosen["augment"][1], dtype=np.intp),
+            objective=objective,
+            nodes=nodes,
+        )
+
+    search = _Search(
+        positions,
+        deficit,
+        weights,
+        integral,
+        max_nodes,
+        max_items,
+        None if on_incumbent is None else lambda choices, objective: on_incumbent(
+            assignment(choices, objective, search.nodes)
+        ),
+    )
+    try:
+        search.search(0, deficit, 0)
+    except NodeLimitExceeded as error:
+        if search.best_choices:
+            error.incumbent = assignment(search.best_choices, search.best_objective, search.nodes)
+        error.lower_bound = search.root_bound
+        raise
+    return assignment(search.best_choices, search.best_objective, search.nodes)
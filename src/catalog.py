@@ -0,0 +1,342 @@
+import hashlib
+import io
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ALL_GEAR_SLOTS: list[str] = [
+    "Helm",
+    "Chest",
+    "Shoulders",
+    "Gloves",
+    "Pants",
+    "Boots",
+    "Belt",
+    "Amulet",
+    "Ring 1",
+    "Ring 2",
+    "Medal",
+    'Melee-Caster-1h 1',
+    'Melee-Caster-1h 2',
+    'Ranged-1h 1',
+    'Ranged-1h 2',
+    'Melee-2h',
+    'Ranged-2h',
+    'Off-Hand',
+    'Shield',
+]
+
+RESISTANCE_TYPES: list[str] = [
+    "Fire Resistance",
+    "Cold Resistance",
+    "Lightning Resistance",
+    "Poison & Acid Resistance",
+    "Pierce Resistance",
+    "Bleeding Resistance",
+    "Vitality Resistance",
+    "Aether Resistance",
+    "Chaos Resistance",
+]
+
+# Mapping of faction standings from str to int
+STANDING_LEVELS: dict[str, int] = {
+    "Friendly": 1,
+    "Respected": 2,
+    "Honored": 3,
+    "Revered": 4,
+}
+UNREACHABLE_STANDING: int = max(STANDING_LEVELS.values()) + 1
+
+# Bit of every gear slot in a slot bitmask, bit i standing for ALL_GEAR_SLOTS[i]
+SLOT_BITS: dict[str, int] = {slot: 1 << i for i, slot in enumerate(ALL_GEAR_SLOTS)}
+ALL_SLOTS_MASK: int = (1 << len(ALL_GEAR_SLOTS)) - 1
+
+
+def slots_to_bits(slots: list[str]) -> int:
+    """Encode gear slot names as a slot bitmask."""
+    bits: int = 0
+    for slot in slots:
+        bits |= SLOT_BITS[slot]
+    return bits
+
+
+def bits_to_slots(bits: int) -> list[str]:
+    """Decode a slot bitmask into gear slot names, in the order of ALL_GEAR_SLOTS."""
+    return [slot for slot, bit in SLOT_BITS.items() if bits & bit]
+
+
+def pack_slot_mask(slot_mask: np.ndarray) -> np.ndarray:
+    """Pack a boolean (item, slot) matrix over ALL_GEAR_SLOTS into one uint32 slot bitmask per item."""
+    weights: np.ndarray = np.left_shift(np.uint32(1), np.arange(slot_mask.shape[1], dtype=np.uint32))
+    return (slot_mask.astype(np.uint32) * weights).sum(axis=1, dtype=np.uint32)
+
+
+def unpack_slot_bits(slot_bits: np.ndarray) -> np.ndarray:
+    """Unpack uint32 slot bitmasks into a boolean (item, slot) matrix over ALL_GEAR_SLOTS."""
+    return ((slot_bits[:, None] >> np.arange(len(ALL_GEAR_SLOTS), dtype=np.uint32)) & 1).astype(bool)
+
+
+@dataclass
+class ItemTable:
+    """Compiled, read-only view of one item CSV (components or augments).
+
+    Resistances, armor absorption and slot eligibility are kept as dense NumPy arrays
+    aligned with the rows of ``frame`` so that per-request filtering is a handful of
+    vectorized mask operations instead of DataFrame rebuilding. The gear slots an item fits
+    are a uint32 bitmask per item, see SLOT_BITS.
+    """
+
+    names: np.ndarray
+    resistances: np.ndarray
+    armor_abs: np.ndarray
+    slot_bits: np.ndarray
+    required_level: np.ndarray
+    # Faction gate: index into ``factions`` (0 means no faction) and the numeric standing
+    # required to use the item (0 means no requirement)
+    factions: list[str]
+    faction_code: np.ndarray
+    required_standing: np.ndarray
+    # Grim Dawn item ID and localization tag of every item
+    ids: np.ndarray
+    tags: np.ndarray
+    # Builds the full dataframe of the CSV, only called when ``frame`` is first accessed
+    frame_loader: Callable[[], "pd.DataFrame"] = field(repr=False, compare=False)
+    # Memoized structures derived from this table, e.g. dominance-pruned item buckets
+    derived: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self):
+        for array in (
+            self.names,
+            self.resistances,
+            self.armor_abs,
+            self.slot_bits,
+            self.required_level,
+            self.faction_code,
+            self.required_standing,
+            self.ids,
+            self.tags,
+        ):
+            array.setflags(write=False)
+
+    @cached_property
+    def slot_mask(self) -> np.ndarray:
+        """Boolean (item, slot) matrix over ALL_GEAR_SLOTS, unpacked from ``slot_bits``."""
+        slot_mask: np.ndarray = unpack_slot_bits(self.slot_bits)
+        slot_mask.setflags(write=False)
+        return slot_mask
+
+    @cached_property
+    def frame(self) -> "pd.DataFrame":
+        """Full dataframe of the item CSV, with every column."""
+        return self.frame_loader()
+
+    @classmethod
+    def from_frame(cls, frame: "pd.DataFrame") -> "ItemTable":
+        """Compile a raw item dataframe into dense arrays.
+
+        Args:
+            frame (pd.DataFrame): Dataframe as read from the item CSV.
+
+        Returns:
+            ItemTable: Compiled item table.
+        """
+        import pandas as pd
+
+        # Encode factions as small integer codes, reserving code 0 for items without a faction
+        faction_codes, factions = pd.factorize(frame["Faction"])
+        faction_code: np.ndarray = faction_codes.astype(np.int64) + 1
+
+        if "Required Faction Level" in frame.columns:
+            # Items with an unknown requirement can never be unlocked
+            required_standing: np.ndarray = (
+                frame["Required Faction Level"].str.title().map(STANDING_LEVELS)
+                .fillna(UNREACHABLE_STANDING).to_numpy(dtype=np.int64)
+            )
+        else:
+            required_standing = np.zeros(len(frame), dtype=np.int64)
+
+        return cls(
+            names=frame["Item"].to_numpy(dtype=object),
+            resistances=frame[RESISTANCE_TYPES].to_numpy(dtype=np.int64),
+            armor_abs=frame["Armor Absorption %"].to_numpy(dtype=np.float64),
+            slot_bits=pack_slot_mask(frame[ALL_GEAR_SLOTS].to_numpy(dtype=bool)),
+            required_level=frame["Required Player Level"].to_numpy(dtype=np.int64),
+            factions=[""] + list(factions),
+            faction_code=faction_code,
+            required_standing=required_standing,
+            ids=frame["ID"].to_numpy(dtype=np.int64),
+            tags=frame["Item Tag"].astype(str).to_numpy(dtype=object),
+            frame_loader=lambda: frame,
+        )
+
+    def standing_levels(self, player_faction_standings: dict[str, str]) -> np.ndarray:
+        """Encode player faction standings as a lookup array indexed by faction code.
+
+        Args:
+            player_faction_standings (dict[str, str]): Player standing name per faction.
+
+        Returns:
+            np.ndarray: Numeric player standing for every faction code of this table.
+        """
+        levels: np.ndarray = np.zeros(len(self.factions), dtype=np.int64)
+        for code, faction in enumerate(self.factions):
+            standing: str | None = player_faction_standings.get(faction)
+            if code and standing:
+                levels[code] = STANDING_LEVELS.get(standing.title(), 0)
+        return levels
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+@dataclass(frozen=True, slots=True)
+class ItemInfo:
+    """Compact record of one item: metadata needed to decorate results and its stats."""
+
+    id: int
+    tag: str
+    kind: str
+    resistances: tuple[int, ...] = ()
+    armor_abs: float = 0.0
+    slot_bits: int = 0
+
+
+@dataclass
+class ItemCatalog:
+    """Process-wide, compiled component and augment catalogs."""
+
+    components: ItemTable
+    augments: ItemTable
+    # Content hash of both source files, used to key anything derived from the catalog
+    version: str
+    source_mtimes: tuple[float, float] = (0.0, 0.0)
+    # Item name -> ID, tag and kind; components take precedence over augments of the same name
+    item_index: dict[str, ItemInfo] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.item_index:
+            for kind, table in (("component", self.components), ("augment", self.augments)):
+                for name, item_id, tag, resistances, armor_abs, slot_bits in zip(
+                    table.names.tolist(),
+                    table.ids.tolist(),
+                    table.tags.tolist(),
+                    table.resistances.tolist(),
+                    table.armor_abs.tolist(),
+                    table.slot_bits.tolist(),
+                ):
+                    self.item_index.setdefault(
+                        name,
+                        ItemInfo(
+                            id=item_id,
+                            tag=str(tag),
+                            kind=kind,
+                            resistances=tuple(resistances),
+                            armor_abs=armor_abs,
+                            slot_bits=slot_bits,
+                        ),
+                    )
+
+    def unlock_levels(self) -> np.ndarray:
+        """Return the sorted distinct required player levels of all items."""
+        return np.union1d(self.components.required_level, self.augments.required_level)
+
+    def unlock_level(self, character_level: int) -> int:
+        """Return the highest required player level a character level reaches.
+
+        Character levels with the same unlock level have the same items available, and therefore
+        the same optimization results.
+
+        Args:
+            character_level (int): Level of the character.
+
+        Returns:
+            int: Highest required level of an item at or below the character level, 0 if none.
+        """
+        levels: np.ndarray = self.unlock_levels()
+        reached: np.ndarray = levels[levels <= character_level]
+        return int(reached[-1]) if len(reached) else 0
+
+
+_catalogs: dict[tuple[str, str], ItemCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def load_catalog(component_csv_path: str, augment_csv_path: str, use_artifact: bool = True) -> ItemCatalog:
+    """Read and compile both item CSVs, bypassing the process-wide cache.
+
+    When a compiled catalog (see src.catalog_compiler) built from the same CSV contents sits next
+    to the CSVs, it is memory-mapped instead of parsing the CSVs.
+
+    Args:
+        component_csv_path (str): Path to the component CSV.
+        augment_csv_path (str): Path to the augment CSV.
+        use_artifact (bool): Whether to use an up-to-date compiled catalog when there is one.
+
+    Returns:
+        ItemCatalog: Freshly compiled catalog.
+    """
+    mtimes: tuple[float, float] = (
+        os.stat(component_csv_path).st_mtime,
+        os.stat(augment_csv_path).st_mtime,
+    )
+    # The CSVs stay the source of truth, their contents version the catalog either way
+    sources: list[bytes] = []
+    digest = hashlib.sha256()
+    for csv_path in (component_csv_path, augment_csv_path):
+        with open(csv_path, "rb") as csv_file:
+            sources.append(csv_file.read())
+        digest.update(sources[-1])
+    version: str = digest.hexdigest()[:16]
+
+    if use_artifact:
+        from src.catalog_compiler import default_artifact_path, read_compiled_catalog
+
+        catalog: ItemCatalog | None = read_compiled_catalog(default_artifact_path(component_csv_path), version)
+        if catalog is not None:
+            catalog.source_mtimes = mtimes
+            return catalog
+
+    # pandas is only imported when there is no up-to-date compiled catalog to map
+    import pandas as pd
+
+    components, augments = (ItemTable.from_frame(pd.read_csv(io.BytesIO(raw))) for raw in sources)
+    return ItemCatalog(
+        components=components,
+        augments=augments,
+        version=version,
+        source_mtimes=mtimes,
+    )
+
+
+def get_catalog(component_csv_path: str, augment_csv_path: str) -> ItemCatalog:
+    """Return the shared catalog for the given CSVs, loading it on first use.
+
+    The catalog is reloaded only when the modification time of either CSV changes.
+
+    Args:
+        component_csv_path (str): Path to the component CSV.
+        augment_csv_path (str): Path to the augment CSV.
+
+    Returns:
+        ItemCatalog: Shared compiled catalog.
+    """
+    key: tuple[str, str] = (os.path.abspath(component_csv_path), os.path.abspath(augment_csv_path))
+    mtimes: tuple[float, float] = (os.stat(key[0]).st_mtime, os.stat(key[1]).st_mtime)
+
+    catalog: ItemCatalog | None = _catalogs.get(key)
+    if catalog is not None and catalog.source_mtimes == mtimes:
+        return catalog
+
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None or catalog.source_mtimes != mtimes:
+            catalog = load_catalog(*key)
+            _catalogs[key] = catalog
+    return catalog
@@ -0,0 +1,289 @@
+"""Compile the item CSVs into a binary catalog that loads without text parsing.
+
+Usage:
+    python -m src.catalog_compiler [data/component_data.csv data/augment_data.csv] [-o data/catalog.bin]
+
+The CSVs remain the editable source of truth. The artifact records the content hash of the CSVs it
+was compiled from and is ignored once they change, in which case the catalog is parsed from CSV.
+
+File layout, all integers little endian::
+
+    magic        8 bytes, b"GDCATv1\\0"
+    header size  uint64
+    header       UTF-8 JSON describing every array: offset, dtype and shape
+    padding      up to the next multiple of 8 bytes
+    data         8 byte aligned arrays, offsets are relative to the start of this section
+
+Per item table the data holds fixed-width stat arrays in the dtypes ItemTable uses, a uint32 bitmask
+of the gear slots of every item (bit i is ``ALL_GEAR_SLOTS[i]``) and, for every text column, indices
+into a string table shared by both tables.
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from src.catalog import ALL_GEAR_SLOTS, RESISTANCE_TYPES, ItemCatalog, ItemTable, unpack_slot_bits
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+MAGIC: bytes = b"GDCATv1\0"
+FORMAT_VERSION: int = 1
+ALIGNMENT: int = 8
+
+# Artifact looked up next to the component CSV when no path is given
+DEFAULT_ARTIFACT_NAME: str = "catalog.bin"
+
+# String index of a missing value in a text column
+MISSING_STRING: int = -1
+
+
+def default_artifact_path(component_csv_path: str) -> str:
+    """Return where the compiled catalog of the given CSVs lives by default."""
+    return os.path.join(os.path.dirname(os.path.abspath(component_csv_path)), DEFAULT_ARTIFACT_NAME)
+
+
+class _ArtifactWriter:
+    """Accumulate aligned arrays and the header entries describing them."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.size: int = 0
+        self.strings: dict[str, int] = {}
+
+    def add(self, array: np.ndarray) -> dict[str, Any]:
+        array = np.ascontiguousarray(array)
+        array = array.astype(array.dtype.newbyteorder("<"), copy=False)
+        entry: dict[str, Any] = {"offset": self.size, "dtype": array.dtype.str, "shape": list(array.shape)}
+        payload: bytes = array.tobytes()
+        self.chunks.append(payload)
+        self.size += len(payload)
+        padding: int = -self.size % ALIGNMENT
+        self.chunks.append(b"\0" * padding)
+        self.size += padding
+        return entry
+
+    def intern(self, values: "pd.Series") -> np.ndarray:
+        """Map a text column onto indices into the shared string table."""
+        import pandas as pd
+
+        return np.array(
+            [MISSING_STRING if pd.isna(value) else self.strings.setdefault(str(value), len(self.strings))
+             for value in values],
+            dtype=np.int32,
+        )
+
+    def string_table(self) -> dict[str, Any]:
+        encoded: list[bytes] = [string.encode("utf-8") for string in self.strings]
+        offsets: np.ndarray = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        np.cumsum([len(string) for string in encoded], out=offsets[1:])
+        return {
+            "offsets": self.add(offsets),
+            "data": self.add(np.frombuffer(b"".join(encoded), dtype=np.uint8)),
+        }
+
+
+def _compile_table(writer: _ArtifactWriter, table: ItemTable) -> dict[str, Any]:
+    frame: "pd.DataFrame" = table.frame
+    other_numbers: list[str] = [
+        column for column in frame.columns
+        if column not in RESISTANCE_TYPES and column not in ALL_GEAR_SLOTS and frame[column].dtype != object
+    ]
+
+    # Column order and dtypes of the CSV, so that the dataframe can be rebuilt exactly
+    columns: list[list[str]] = []
+    for column in frame.columns:
+        if column in ALL_GEAR_SLOTS:
+            kind = "slot"
+        elif column in RESISTANCE_TYPES:
+            kind = "resistance"
+        elif frame[column].dtype == object:
+            kind = "text"
+        else:
+            kind = "number"
+        columns.append([column, kind, frame[column].dtype.str])
+
+    return {
+        "rows": len(table),
+        "columns": columns,
+        "factions": table.factions,
+        "arrays": {
+            "resistances": writer.add(table.resistances),
+            "armor_abs": writer.add(table.armor_abs),
+            "slot_bits": writer.add(table.slot_bits),
+            "required_level": writer.add(table.required_level),
+            "faction_code": writer.add(table.faction_code),
+            "required_standing": writer.add(table.required_standing),
+            "numbers": writer.add(frame[other_numbers].to_numpy(dtype=np.float64)),
+            "text": writer.add(
+                np.column_stack([writer.intern(frame[column]) for column, kind, _ in columns if kind == "text"])
+            ),
+        },
+        "number_columns": other_numbers,
+    }
+
+
+def compile_catalog(catalog: ItemCatalog, artifact_path: str) -> None:
+    """Write a compiled catalog artifact.
+
+    The artifact is written to a temporary file and moved into place, so that readers never see
+    a partially written file.
+
+    Args:
+        catalog (ItemCatalog): Catalog parsed from the CSVs.
+        artifact_path (str): File to write.
+    """
+    writer = _ArtifactWriter()
+    tables: dict[str, Any] = {
+        "components": _compile_table(writer, catalog.components),
+        "augments": _compile_table(writer, catalog.augments),
+    }
+    header: bytes = json.dumps(
+        {
+            "format": FORMAT_VERSION,
+            "version": catalog.version,
+            "slots": ALL_GEAR_SLOTS,
+            "tables": tables,
+            "strings": writer.string_table(),
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    temporary_path: str = f"{artifact_path}.tmp"
+    with open(temporary_path, "wb") as artifact:
+        artifact.write(MAGIC)
+        artifact.write(struct.pack("<Q", len(header)))
+        artifact.write(header)
+        artifact.write(b"\0" * (-(len(MAGIC) + 8 + len(header)) % ALIGNMENT))
+        for chunk in writer.chunks:
+            artifact.write(chunk)
+    os.replace(temporary_path, artifact_path)
+
+
+def _read_header(buffer: mmap.mmap) -> tuple[dict, int]:
+    if buffer[: len(MAGIC)] != MAGIC:
+        raise ValueError("not a compiled catalog")
+    (header_size,) = struct.unpack_from("<Q", buffer, len(MAGIC))
+    header_end: int = len(MAGIC) + 8 + header_size
+    header: dict = json.loads(bytes(buffer[len(MAGIC) + 8 : header_end]))
+    if header.get("format") != FORMAT_VERSION or header.get("slots") != ALL_GEAR_SLOTS:
+        raise ValueError("incompatible compiled catalog")
+    return header, header_end + (-header_end % ALIGNMENT)
+
+
+def _frame_loader(header: dict, arrays: dict[str, np.ndarray], strings: np.ndarray):
+    """Return a callable rebuilding the full dataframe of a table from its arrays."""
+
+    def load() -> "pd.DataFrame":
+        # Reading the catalog does not need pandas, only rebuilding the dataframe does
+        import pandas as pd
+
+        slot_mask: np.ndarray = unpack_slot_bits(arrays["slot_bits"])
+        data: dict[str, Any] = {}
+        text_index: int = 0
+        for column, kind, dtype in header["columns"]:
+            if kind == "slot":
+                data[column] = slot_mask[:, ALL_GEAR_SLOTS.index(column)]
+            elif kind == "resistance":
+                values: np.ndarray = arrays["resistances"][:, RESISTANCE_TYPES.index(column)]
+                data[column] = values.astype(dtype)
+            elif kind == "number":
+                values = arrays["numbers"][:, header["number_columns"].index(column)]
+                data[column] = values.astype(dtype)
+            else:
+                codes: np.ndarray = arrays["text"][:, text_index]
+                data[column] = np.where(codes == MISSING_STRING, np.nan, strings[codes]).astype(object)
+                text_index += 1
+        return pd.DataFrame(data)
+
+    return load
+
+
+def read_compiled_catalog(artifact_path: str, expected_version: str | None = None) -> ItemCatalog | None:
+    """Memory-map a compiled catalog.
+
+    Stat arrays are zero-copy, read-only views into the mapping; the full dataframe of each
+    table is only rebuilt when first accessed.
+
+    Args:
+        artifact_path (str): Compiled catalog file.
+        expected_version (str | None): Content hash of the source CSVs; a mismatch means the artifact is stale.
+
+    Returns:
+        ItemCatalog | None: The catalog, or None if the artifact is missing, stale or unreadable.
+    """
+    try:
+        with open(artifact_path, "rb") as artifact:
+            buffer: mmap.mmap = mmap.mmap(artifact.fileno(), 0, access=mmap.ACCESS_READ)
+        header, data_start = _read_header(buffer)
+    except (OSError, ValueError):
+        return None
+    if expected_version is not None and header["version"] != expected_version:
+        return None
+
+    def view(entry: dict) -> np.ndarray:
+        dtype = np.dtype(entry["dtype"])
+        count: int = int(np.prod(entry["shape"]))
+        return np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + entry["offset"]).reshape(
+            entry["shape"]
+        )
+
+    offsets: np.ndarray = view(header["strings"]["offsets"])
+    string_data: bytes = view(header["strings"]["data"]).tobytes()
+    strings: np.ndarray = np.array(
+        [string_data[start:end].decode("utf-8") for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+        + [""],
+        dtype=object,
+    )
+
+    tables: dict[str, ItemTable] = {}
+    for name, table_header in header["tables"].items():
+        arrays: dict[str, np.ndarray] = {key: view(entry) for key, entry in table_header["arrays"].items()}
+        text_columns: list[str] = [column for column, kind, _ in table_header["columns"] if kind == "text"]
+        item_codes: np.ndarray = arrays["text"][:, text_columns.index("Item")]
+        tag_codes: np.ndarray = arrays["text"][:, text_columns.index("Item Tag")]
+
+        tables[name] = ItemTable(
+            names=strings[item_codes],
+            resistances=arrays["resistances"],
+            armor_abs=arrays["armor_abs"],
+            slot_bits=arrays["slot_bits"],
+            required_level=arrays["required_level"],
+            factions=table_header["factions"],
+            faction_code=arrays["faction_code"],
+            required_standing=arrays["required_standing"],
+            ids=arrays["numbers"][:, table_header["number_columns"].index("ID")].astype(np.int64),
+            tags=strings[tag_codes],
+            frame_loader=_frame_loader(table_header, arrays, strings),
+        )
+
+    return ItemCatalog(components=tables["components"], augments=tables["augments"], version=header["version"])
+
+
+def main() -> None:
+    from src.catalog import load_catalog
+
+    parser = argparse.ArgumentParser(description="Compile the item CSVs into a binary catalog.")
+    parser.add_argument("component_csv", nargs="?", default="data/component_data.csv")
+    parser.add_argument("augment_csv", nargs="?", default="data/augment_data.csv")
+    parser.add_argument("-o", "--output", default=None, help="Artifact to write, defaults to catalog.bin next to the CSVs")
+    args = parser.parse_args()
+
+    output: str = args.output or default_artifact_path(args.component_csv)
+    catalog: ItemCatalog = load_catalog(args.component_csv, args.augment_csv, use_artifact=False)
+    compile_catalog(catalog, output)
+    print(
+        f"{len(catalog.components)} components and {len(catalog.augments)} augments compiled to {output}"
+        f" ({os.path.getsize(output)} bytes, version {catalog.version})",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
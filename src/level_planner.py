@@ -0,0 +1,449 @@
+import dataclasses
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pulp
+
+from src.catalog import ItemTable
+from src.model_builder import ITEM_PENALTY, ItemCandidates, ResistanceModel, build_resistance_model
+from src.resistance_optimizer import ResistanceOptimizer
+from src.solvers import make_solver, solution_status
+
+# Default objective cost of a swap: a swap is worth less than an item, so keeping an item that no
+# longer helps never beats dropping it, but among equally good loadouts the one closest to the
+# previous checkpoint wins
+DEFAULT_SWAP_PENALTY: float = ITEM_PENALTY / 2
+
+# Default time limit in seconds of the joint solve. Plans of two or three blocks solve to optimality
+# in seconds, but the joint branch and bound grows with every block: ten blocks did not finish in
+# ten minutes. The solve stops at the limit with the best plan found, never worse than the sequential one.
+DEFAULT_JOINT_TIME_LIMIT: float = 60
+
+
+@dataclass
+class LevelCheckpoint:
+    """One character level of a levelling plan.
+
+    Attributes:
+        level (int): Character level of the checkpoint.
+        player_faction_standings (dict[str, str] | None): Faction standings reached by then, those
+                                                           of the planner's optimizer if None.
+        current_resistances (dict[str, int] | None): Resistances of the character without the
+                                                     planned items, those of the optimizer if None.
+        current_armor_abs_percentage (int | None): Armor absorption of the character, that of the
+                                                   optimizer if None.
+    """
+
+    level: int
+    player_faction_standings: dict[str, str] | None = None
+    current_resistances: dict[str, int] | None = None
+    current_armor_abs_percentage: int | None = None
+
+
+class LevelPlanner:
+    """Plan components and augments over a series of character levels.
+
+    The candidate items are gathered once for the whole plan: every (item, slot) pair worth
+    modelling at one of the checkpoints is offered at each checkpoint where the item is
+    unlocked, so an item can be kept after a better one unlocks. Consecutive checkpoints that
+    unlock the same items for the same inputs share one block, solved once.
+
+    The blocks are first solved in levelling order, each charged ``swap_penalty`` for every
+    slot whose item of the previous block it replaces or removes, and warm-started from that
+    loadout. Filling an empty slot is not a swap. Every block is thus optimal given the one
+    before it, but this sequential plan is a heuristic: a loadout that costs one more item now
+    may save swaps later, which no block can see. The plan is then re-solved as a single model
+    over all blocks, warm-started from the sequential plan, whose optimum minimizes the
+    objectives of all blocks plus the swap penalties. Its branch and bound multiplies the search
+    trees of the blocks, so the joint solve is capped by ``joint_time_limit``; a plan it stops
+    is reported "feasible". With a single block or free swaps, the sequential plan is already
+    the joint optimum and the joint model is not solved.
+    """
+
+    def __init__(
+        self,
+        optimizer: ResistanceOptimizer,
+        checkpoints: list[int | LevelCheckpoint],
+        swap_penalty: float = DEFAULT_SWAP_PENALTY,
+        joint_time_limit: float | None = DEFAULT_JOINT_TIME_LIMIT,
+    ):
+        """Build the block models of the optimizer's inputs at every checkpoint.
+
+        Args:
+            optimizer (ResistanceOptimizer): Optimizer holding the inputs shared by all checkpoints
+                                             (template, blocked slots, blacklists, targets, solver).
+            checkpoints (list[int | LevelCheckpoint]): Checkpoints in strictly increasing level order,
+                                                       plain levels keep the other inputs of the optimizer.
+            swap_penalty (float): Objective cost of a swap; one item costs ITEM_PENALTY and one
+                                  missing resistance point RES_PENALTY. 0 plans every block on its own.
+            joint_time_limit (float | None): Time limit in seconds of the joint solve, no limit if None.
+                                             The solver time limit of the optimizer applies if lower.
+
+        Raises:
+            ValueError: If there are no checkpoints, their levels do not strictly increase or the
+                        swap penalty is negative.
+        """
+        if not checkpoints:
+            raise ValueError("A levelling plan needs at least one checkpoint")
+        if swap_penalty < 0:
+            raise ValueError(f"The swap penalty must not be negative, got {swap_penalty}")
+
+        self.optimizer: ResistanceOptimizer = optimizer
+        self.checkpoints: list[LevelCheckpoint] = [
+            checkpoint if isinstance(checkpoint, LevelCheckpoint) else LevelCheckpoint(level=checkpoint)
+            for checkpoint in checkpoints
+        ]
+        levels: list[int] = [checkpoint.level for checkpoint in self.checkpoints]
+        if any(later <= earlier for earlier, later in zip(levels, levels[1:])):
+            raise ValueError(f"Checkpoint levels must strictly increase, got {levels}")
+        self.swap_penalty: float = swap_penalty
+        self.joint_time_limit: float | None = joint_time_limit
+        # One optimizer per checkpoint, sharing the catalog; they filter the items and decode the plan
+        self.checkpoint_optimizers: list[ResistanceOptimizer] = [
+            dataclasses.replace(
+                optimizer,
+                character_level=checkpoint.level,
+                player_faction_standings=(
+                    optimizer.player_faction_standings
+                    if checkpoint.player_faction_standings is None
+                    else checkpoint.player_faction_standings
+                ),
+                current_resistances=(
+                    optimizer.current_resistances
+                    if checkpoint.current_resistances is None
+                    else checkpoint.current_resistances
+                ),
+                current_armor_abs_percentage=(
+                    optimizer.current_armor_abs_percentage
+                    if checkpoint.current_armor_abs_percentage is None
+                    else checkpoint.current_armor_abs_percentage
+                ),
+                result_cache=None,
+                answer_table=None,
+            )
+            for checkpoint in self.checkpoints
+        ]
+        # Checkpoint indices of each block, and the model of each block
+        self.blocks: list[list[int]] = []
+        self.models: list[ResistanceModel] = []
+        # Single model over all blocks, built when there are several
+        self.joint_prob: pulp.LpProblem | None = None
+        # Keep indicator of every item that may stay in its slot between two blocks, with the
+        # variables placing it in the earlier and in the later block
+        self.joint_keeps: list[tuple[pulp.LpVariable, pulp.LpVariable, pulp.LpVariable]] = []
+        self.solver_status: str | None = None
+        # Wall time of the build, solve and decode phases in seconds, and size of the built models
+        self.timings: dict[str, float] = {}
+        self.model_stats: dict[str, int] = {}
+        self.build()
+
+    @staticmethod
+    def plan_candidates(
+        items: ItemTable, per_checkpoint: list[ItemCandidates]
+    ) -> tuple[ItemCandidates, list[np.ndarray]]:
+        """Merge the candidate items of one kind of every checkpoint into candidates for the whole plan.
+
+        Args:
+            items (ItemTable): Compiled catalog table of the item kind.
+            per_checkpoint (list[ItemCandidates]): Candidates of each checkpoint, over the same slots.
+
+        Returns:
+            tuple[ItemCandidates, list[np.ndarray]]: Candidates worth modelling at any checkpoint,
+                                                     and per checkpoint their eligibility restricted
+                                                     to the items unlocked by then.
+        """
+        slots: list[str] = per_checkpoint[0].slots
+
+        # Union of the pairs worth modelling, indexed by catalog row
+        pairs: np.ndarray = np.zeros((len(items), len(slots)), dtype=bool)
+        for candidates in per_checkpoint:
+            pairs[candidates.rows] |= candidates.eligibility
+        rows: np.ndarray = np.flatnonzero(pairs.any(axis=1))
+
+        shared: ItemCandidates = ItemCandidates(
+            rows=rows,
+            names=items.names[rows],
+            resistances=items.resistances[rows],
+            armor_abs=items.armor_abs[rows],
+            slots=slots,
+            eligibility=pairs[rows],
+        )
+        unlocked: list[np.ndarray] = [
+            shared.eligibility & np.isin(rows, candidates.rows)[:, None] for candidates in per_checkpoint
+        ]
+        return shared, unlocked
+
+    def build(self) -> None:
+        """Group the checkpoints into blocks and build the model of each block."""
+        start: float = time.perf_counter()
+        checkpoint_candidates: list[tuple[ItemCandidates, ItemCandidates]] = [
+            optimizer.build_candidates() for optimizer in self.checkpoint_optimizers
+        ]
+        components, component_unlocked = self.plan_candidates(
+            self.optimizer.catalog.components, [candidates[0] for candidates in checkpoint_candidates]
+        )
+        augments, augment_unlocked = self.plan_candidates(
+            self.optimizer.catalog.augments, [candidates[1] for candidates in checkpoint_candidates]
+        )
+
+        # Consecutive checkpoints facing the same problem share a block. Keeping one loadout
+        # throughout is then optimal, as a swap inside the run can move to either of its ends.
+        self.blocks = []
+        previous_key: tuple | None = None
+        for t, optimizer in enumerate(self.checkpoint_optimizers):
+            key: tuple = (
+                component_unlocked[t].tobytes(),
+                augment_unlocked[t].tobytes(),
+                tuple(
+                    optimizer.target_resistances[res] - optimizer.current_resistances[res]
+                    for res in optimizer.resistance_types
+                ),
+                optimizer.required_armor_abs_percentage,
+            )
+            if key == previous_key:
+                self.blocks[-1].append(t)
+            else:
+                self.blocks.append([t])
+            previous_key = key
+
+        self.models = []
+        for block in self.blocks:
+            optimizer: ResistanceOptimizer = self.checkpoint_optimizers[block[0]]
+            self.models.append(
+                build_resistance_model(
+                    dataclasses.replace(components, eligibility=component_unlocked[block[0]]),
+                    dataclasses.replace(augments, eligibility=augment_unlocked[block[0]]),
+                    optimizer.resistance_types,
+                    optimizer.current_resistances,
+                    optimizer.target_resistances,
+                    optimizer.required_armor_abs_percentage,
+                )
+            )
+
+        self.joint_prob = self.build_joint_model() if len(self.blocks) > 1 else None
+
+        self.timings = {"build": time.perf_counter() - start}
+        self.model_stats = {
+            "checkpoints": len(self.checkpoints),
+            "blocks": len(self.blocks),
+            "variables": sum(model.prob.numVariables() for model in self.models),
+            "constraints": sum(model.prob.numConstraints() for model in self.models),
+            "component_candidates": len(components.rows),
+            "augment_candidates": len(augments.rows),
+            "joint_variables": self.joint_prob.numVariables() if self.joint_prob is not None else 0,
+        }
+
+    def build_joint_model(self) -> pulp.LpProblem:
+        """Build a single model over all blocks, charging the swap penalty between consecutive blocks.
+
+        The variables and constraints of the block models are shared with it, renamed per block, so
+        solving it sets the loadouts of the block models.
+
+        Returns:
+            pulp.LpProblem: Joint model of the plan.
+        """
+        prob = pulp.LpProblem("Level_Plan", pulp.LpMinimize)
+        self.joint_keeps = []
+        objective: list[pulp.LpAffineExpression] = []
+        previous: dict[tuple[str, int, int], pulp.LpVariable] = {}
+        for b, model in enumerate(self.models):
+            for var in model.prob.variables():
+                var.name = f"block{b}_{var.name}"
+            for name, constraint in model.prob.constraints.items():
+                prob.addConstraint(constraint.copy(), f"block{b}_{name}")
+            objective.append(model.prob.objective)
+
+            current: dict[tuple[str, int, int], pulp.LpVariable] = self.slot_variables(model)
+            if previous:
+                # Every item of the previous block is a swap, unless it is kept in its slot. An item
+                # is kept if it is placed in both blocks, which the objective pushes ``keep`` up to.
+                keeps: list[pulp.LpVariable] = []
+                for key, var in current.items():
+                    if key in previous:
+                        keep = pulp.LpVariable(f"keep_{b}_{len(keeps)}", lowBound=0, upBound=1)
+                        prob += keep <= previous[key]
+                        prob += keep <= var
+                        keeps.append(keep)
+                        self.joint_keeps.append((keep, previous[key], var))
+                objective.append(
+                    pulp.LpAffineExpression(
+                        [(var, self.swap_penalty) for var in previous.values()]
+                        + [(keep, -self.swap_penalty) for keep in keeps]
+                    )
+                )
+            previous = current
+        prob += pulp.lpSum(objective)
+        return prob
+
+    def solve(self) -> dict:
+        """Solve the blocks in levelling order, then the joint model over all of them.
+
+        Returns:
+            dict: The "status" of the plan ("optimal" if every model was solved to optimality,
+                  "feasible" if a time limit stopped one, or "infeasible"), the "method" that
+                  produced it ("sequential" or "joint"), whether the plan is a "heuristic" one, i.e.
+                  not proven to be the optimum of the whole plan, the total number of "swaps" and,
+                  per checkpoint, the summary of ResistanceOptimizer.shortfall_summary along with
+                  its "level" and the number of "swaps" since the previous checkpoint.
+        """
+        start: float = time.perf_counter()
+        status, plan = self.solve_sequential()
+        self.timings["solve"] = time.perf_counter() - start
+        method: str = "sequential"
+
+        # With free swaps the blocks are independent, and their sequential plan is the joint optimum
+        joint: bool = self.joint_prob is not None and self.swap_penalty > 0
+        if status in ("Optimal", "Feasible") and joint:
+            start = time.perf_counter()
+            joint_status: str = self.solve_joint()
+            self.timings["joint_solve"] = time.perf_counter() - start
+            if joint_status in ("Optimal", "Feasible"):
+                status, method = joint_status, "joint"
+                plan = [
+                    self.checkpoint_optimizers[block[0]].solution_selections(model)
+                    for block, model in zip(self.blocks, self.models)
+                ]
+        self.solver_status = status
+        if status not in ("Optimal", "Feasible"):
+            return {"status": "infeasible"}
+
+        start = time.perf_counter()
+        checkpoints: list[dict] = []
+        previous: dict[tuple[str, int], int] = {}
+        for block, selections in zip(self.blocks, plan):
+            placed: dict[tuple[str, int], int] = self.placed_items(selections)
+            for t in block:
+                checkpoint_optimizer: ResistanceOptimizer = self.checkpoint_optimizers[t]
+                checkpoint_optimizer.solver_status = status
+                checkpoints.append(
+                    {"level": self.checkpoints[t].level, "swaps": self.count_swaps(previous, placed)}
+                    | checkpoint_optimizer.shortfall_summary(selections)
+                )
+                previous = placed
+        self.timings["decode"] = time.perf_counter() - start
+
+        return {
+            "status": "feasible" if status == "Feasible" else "optimal",
+            "method": method,
+            "heuristic": status != "Optimal" or (joint and method == "sequential"),
+            "swaps": sum(checkpoint["swaps"] for checkpoint in checkpoints),
+            "checkpoints": checkpoints,
+        }
+
+    def solve_sequential(self) -> tuple[str, list[list[tuple]]]:
+        """Solve the blocks in levelling order, each given the loadout of the one before.
+
+        Returns:
+            tuple[str, list[list[tuple]]]: PuLP status of the plan and, per block solved, its loadout
+                                           as returned by ResistanceOptimizer.solution_selections.
+        """
+        optimizer: ResistanceOptimizer = self.optimizer
+        plan: list[list[tuple]] = []
+        status: str = "Optimal"
+        previous: dict[tuple[str, int], int] = {}
+        for block, model in zip(self.blocks, self.models):
+            objective: pulp.LpAffineExpression = model.prob.objective
+            kept: list[pulp.LpVariable] = self.keep_loadout(model, previous)
+            if self.swap_penalty > 0:
+                # Every swap costs the penalty, i.e. every kept item saves it
+                model.prob.setObjective(objective + pulp.LpAffineExpression((var, -self.swap_penalty) for var in kept))
+            model.prob.solve(
+                make_solver(
+                    optimizer.solver_backend,
+                    optimizer.solver_time_limit,
+                    optimizer.solver_mip_gap,
+                    warm_start=bool(kept),
+                )
+            )
+            model.prob.setObjective(objective)
+
+            block_status: str = solution_status(model.prob)
+            if block_status not in ("Optimal", "Feasible"):
+                status = block_status
+                break
+            if block_status == "Feasible":
+                status = "Feasible"
+            plan.append(self.checkpoint_optimizers[block[0]].solution_selections(model))
+            previous = self.placed_items(plan[-1])
+        return status, plan
+
+    def solve_joint(self) -> str:
+        """Solve the joint model, warm-started from the sequential plan the block variables hold.
+
+        The solve is limited to the lower of ``joint_time_limit`` and the solver time limit of the optimizer.
+
+        Returns:
+            str: PuLP status of the joint solve, "Feasible" if the solver time limit stopped it, and
+                 "Not Solved" if it stopped at a plan worse than the sequential one.
+        """
+        optimizer: ResistanceOptimizer = self.optimizer
+        # The block variables hold the sequential plan, the keep variables follow from it
+        for keep, earlier, later in self.joint_keeps:
+            keep.setInitialValue(min(round(earlier.varValue or 0), round(later.varValue or 0)))
+        sequential_objective: float = pulp.value(self.joint_prob.objective)
+        time_limits: list[float] = [
+            limit for limit in (self.joint_time_limit, optimizer.solver_time_limit) if limit is not None
+        ]
+        self.joint_prob.solve(
+            make_solver(
+                optimizer.solver_backend,
+                min(time_limits, default=None),
+                optimizer.solver_mip_gap,
+                warm_start=True,
+            )
+        )
+        status: str = solution_status(self.joint_prob)
+        # Solvers ignoring the warm start may stop before reaching the sequential plan
+        if status == "Feasible" and pulp.value(self.joint_prob.objective) > sequential_objective + 1e-6:
+            status = "Not Solved"
+        return status
+
+    @staticmethod
+    def keep_loadout(model: ResistanceModel, previous: dict[tuple[str, int], int]) -> list[pulp.LpVariable]:
+        """Set the variables of a block model to the previous loadout, as far as it is still allowed.
+
+        Args:
+            model (ResistanceModel): Model of the block.
+            previous (dict[tuple[str, int], int]): Loadout of the previous block, see placed_items.
+
+        Returns:
+            list[pulp.LpVariable]: Variables that keep an item of the previous loadout in its slot.
+        """
+        kept: list[pulp.LpVariable] = []
+        for kind, candidates, items, slots, variables in (
+            ("component", model.components, model.component_items, model.component_slots, model.component_vars),
+            ("augment", model.augments, model.augment_items, model.augment_slots, model.augment_vars),
+        ):
+            for row, s, var in zip(candidates.rows[items].tolist(), slots.tolist(), variables):
+                keeps: bool = previous.get((kind, s)) == row
+                var.setInitialValue(1 if keeps else 0)
+                if keeps:
+                    kept.append(var)
+        return kept
+
+    @staticmethod
+    def slot_variables(model: ResistanceModel) -> dict[tuple[str, int, int], pulp.LpVariable]:
+        """Map each (kind, slot index, catalog row) of a block model to its decision variable."""
+        return {
+            (kind, s, row): var
+            for kind, candidates, items, slots, variables in (
+                ("component", model.components, model.component_items, model.component_slots, model.component_vars),
+                ("augment", model.augments, model.augment_items, model.augment_slots, model.augment_vars),
+            )
+            for row, s, var in zip(candidates.rows[items].tolist(), slots.tolist(), variables)
+        }
+
+    @staticmethod
+    def placed_items(selections: list[tuple]) -> dict[tuple[str, int], int]:
+        """Map each occupied (kind, slot index) of a loadout to the catalog row of its item."""
+        return {
+            (kind, s): candidates.rows[i].item()
+            for candidates, items, slots, kind in selections
+            for i, s in zip(items.tolist(), slots.tolist())
+        }
+
+    @staticmethod
+    def count_swaps(previous: dict[tuple[str, int], int], placed: dict[tuple[str, int], int]) -> int:
+        """Count the slots whose item of the previous loadout is replaced or removed."""
+        return sum(1 for key, row in previous.items() if placed.get(key) != row)
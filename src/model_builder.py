@@ -0,0 +1,272 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+import pulp
+
+# Penalize shortfalls heavily in the objective function to prioritize meeting resistance and armor absorption targets
+RES_PENALTY: float = 1e4
+ARMOR_PENALTY: float = 1e3
+ITEM_PENALTY: float = 1
+
+
+@dataclass
+class ItemCandidates:
+    """Items of one kind (components or augments) that may be placed in the available slots.
+
+    Attributes:
+        rows (np.ndarray): Catalog row of each candidate item.
+        names (np.ndarray): Name of each candidate item.
+        resistances (np.ndarray): Resistance values, one row per item and one column per resistance type.
+        armor_abs (np.ndarray): Armor absorption percentage of each item.
+        slots (list[str]): Available gear slots, in column order of ``eligibility``.
+        eligibility (np.ndarray): Boolean matrix, True where the item fits the slot.
+    """
+
+    rows: np.ndarray
+    names: np.ndarray
+    resistances: np.ndarray
+    armor_abs: np.ndarray
+    slots: list[str]
+    eligibility: np.ndarray
+
+    def pairs(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (item, slot) index of every decision variable.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Candidate indices and slot indices of all eligible pairs.
+        """
+        return np.nonzero(self.eligibility)
+
+
+@dataclass
+class ResistanceModel:
+    """Built MILP model together with the index needed to read back its solution."""
+
+    prob: pulp.LpProblem
+    components: ItemCandidates
+    augments: ItemCandidates
+    component_items: np.ndarray
+    component_slots: np.ndarray
+    component_vars: list[pulp.LpVariable]
+    augment_items: np.ndarray
+    augment_slots: np.ndarray
+    augment_vars: list[pulp.LpVariable]
+    resistance_shortfall: dict[str, pulp.LpVariable]
+    armor_shortfall: pulp.LpVariable
+    resistance_constraints: dict[str, pulp.LpConstraint]
+    armor_constraint: pulp.LpConstraint
+    # Binary "item is used in some slot" indicators, created on demand by exclude_item_set
+    usage_vars: dict[tuple[str, int], pulp.LpVariable] = field(default_factory=dict)
+    # Cap on the number of items placed, created on demand by set_item_budget
+    item_budget: pulp.LpConstraint | None = None
+
+    def selected_items(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the candidate indices of the components and augments used by the solution.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Sorted unique component and augment candidate indices.
+        """
+        return (
+            np.unique(self.component_items[self.selected(self.component_vars)]),
+            np.unique(self.augment_items[self.selected(self.augment_vars)]),
+        )
+
+    def usage_var(self, kind: str, item: int) -> pulp.LpVariable:
+        """Return the indicator forced to 1 whenever the candidate item occupies any slot.
+
+        Args:
+            kind (str): "component" or "augment".
+            item (int): Candidate index of the item.
+
+        Returns:
+            pulp.LpVariable: Binary usage indicator of the item.
+        """
+        key: tuple[str, int] = (kind, item)
+        if key not in self.usage_vars:
+            items, variables = (
+                (self.component_items, self.component_vars) if kind == "component"
+                else (self.augment_items, self.augment_vars)
+            )
+            used = pulp.LpVariable(f"used_{kind}_{item}", cat="Binary")
+            for k in np.flatnonzero(items == item).tolist():
+                self.prob += pulp.LpConstraint(
+                    pulp.LpAffineExpression([(variables[k], 1), (used, -1)]),
+                    sense=pulp.LpConstraintLE,
+                    rhs=0,
+                    name=f"uses_{kind}_{item}_{k}",
+                )
+            self.usage_vars[key] = used
+        return self.usage_vars[key]
+
+    def exclude_item_set(self, component_items: np.ndarray, augment_items: np.ndarray) -> None:
+        """Forbid every solution that uses all of the given items, wherever they are placed.
+
+        This no-good cut also excludes supersets of the item set, so the next solution has to
+        drop at least one of the items rather than merely add or move some.
+
+        Args:
+            component_items (np.ndarray): Candidate indices of the components of the set.
+            augment_items (np.ndarray): Candidate indices of the augments of the set.
+        """
+        used: list[pulp.LpVariable] = [self.usage_var("component", i) for i in component_items.tolist()] + [
+            self.usage_var("augment", i) for i in augment_items.tolist()
+        ]
+        self.prob += pulp.LpConstraint(
+            pulp.LpAffineExpression((var, 1) for var in used),
+            sense=pulp.LpConstraintLE,
+            rhs=len(used) - 1,
+            name=f"exclude_{len(self.prob.constraints)}",
+        )
+
+    def set_item_budget(self, budget: int) -> None:
+        """Allow at most ``budget`` components and augments in the solution, replacing any earlier cap.
+
+        Args:
+            budget (int): Maximum number of occupied (item, slot) pairs.
+        """
+        if self.item_budget is None:
+            self.item_budget = pulp.LpConstraint(
+                pulp.LpAffineExpression((var, 1) for var in self.component_vars + self.augment_vars),
+                sense=pulp.LpConstraintLE,
+                rhs=budget,
+                name="item_budget",
+            )
+            self.prob += self.item_budget
+        else:
+            self.item_budget.changeRHS(budget)
+
+    def item_count(self) -> int:
+        """Return the number of components and augments placed by the solution."""
+        return int(self.selected(self.component_vars).sum() + self.selected(self.augment_vars).sum())
+
+    def selected(self, variables: list[pulp.LpVariable]) -> np.ndarray:
+        """Return a boolean array marking which of the given binary variables are set.
+
+        Args:
+            variables (list[pulp.LpVariable]): Decision variables of one item kind.
+
+        Returns:
+            np.ndarray: True where the variable's value is above 0.5.
+        """
+        return np.array(
+            [var.varValue is not None and var.varValue > 0.5 for var in variables], dtype=bool
+        )
+
+
+def _slot_variables(
+    prob: pulp.LpProblem, candidates: ItemCandidates, prefix: str
+) -> tuple[np.ndarray, np.ndarray, list[pulp.LpVariable]]:
+    """Create one binary variable per eligible (item, slot) pair and the one-item-per-slot rows."""
+    items, slots = candidates.pairs()
+    variables: list[pulp.LpVariable] = [
+        pulp.LpVariable(f"{prefix}_{i}_{s}", cat="Binary") for i, s in zip(items.tolist(), slots.tolist())
+    ]
+
+    # Constraint: Each gear slot can only hold one item of this kind
+    for s, slot in enumerate(candidates.slots):
+        slot_vars: list[pulp.LpVariable] = [variables[k] for k in np.flatnonzero(slots == s)]
+        if slot_vars:
+            prob += pulp.LpConstraint(
+                pulp.LpAffineExpression((var, 1) for var in slot_vars),
+                sense=pulp.LpConstraintLE,
+                rhs=1,
+                name=f"{prefix}_slot_{s}",
+            )
+    return items, slots, variables
+
+
+def _sparse_row(variables: list[pulp.LpVariable], coefficients: np.ndarray) -> list[tuple[pulp.LpVariable, float]]:
+    """Pair each variable with its coefficient, skipping zero entries."""
+    return [(variables[k], coefficients[k].item()) for k in np.flatnonzero(coefficients)]
+
+
+def build_resistance_model(
+    components: ItemCandidates,
+    augments: ItemCandidates,
+    resistance_types: list[str],
+    current_resistances: dict[str, int],
+    target_resistances: dict[str, int],
+    required_armor_abs_percentage: float,
+) -> ResistanceModel:
+    """Build the resistance optimization MILP from dense item arrays.
+
+    The (item, slot) variable index is derived once from the eligibility matrices, and each
+    resistance and armor row is emitted as a single sparse coefficient vector.
+
+    Args:
+        components (ItemCandidates): Candidate components.
+        augments (ItemCandidates): Candidate augments.
+        resistance_types (list[str]): Resistance names, in column order of the resistance arrays.
+        current_resistances (dict[str, int]): Current resistances of the character.
+        target_resistances (dict[str, int]): Target resistances of the character.
+        required_armor_abs_percentage (float): Armor absorption percentage needed to hit the cap.
+
+    Returns:
+        ResistanceModel: Built model, ready to be solved.
+    """
+    # Create the problem - minimizing the total shortfall in resistances and armor absorption percentage
+    prob = pulp.LpProblem("Resistance_Optimization", pulp.LpMinimize)
+
+    # Decision variables: binary variable for each eligible component-slot and augment-slot combination
+    component_items, component_slots, component_vars = _slot_variables(prob, components, "comp")
+    augment_items, augment_slots, augment_vars = _slot_variables(prob, augments, "aug")
+    all_vars: list[pulp.LpVariable] = component_vars + augment_vars
+
+    # Stats of the item behind every decision variable, aligned with all_vars
+    pair_resistances: np.ndarray = np.concatenate(
+        [components.resistances[component_items], augments.resistances[augment_items]]
+    )
+    pair_armor_abs: np.ndarray = np.concatenate(
+        [components.armor_abs[component_items], augments.armor_abs[augment_items]]
+    )
+
+    # Error variables for shortfall in resistances and armor absorption percentage
+    resistance_shortfall: dict[str, pulp.LpVariable] = {
+        res: pulp.LpVariable(f"shortfall_{res}", lowBound=0, cat="Continuous")
+        for res in resistance_types
+    }
+    armor_shortfall = pulp.LpVariable("shortfall_armor", lowBound=0, cat="Continuous")
+
+    # Primary objective: Minimize total shortfall in resistances
+    resistance_constraints: dict[str, pulp.LpConstraint] = {}
+    for r, res in enumerate(resistance_types):
+        gained = _sparse_row(all_vars, pair_resistances[:, r])
+        resistance_constraints[res] = pulp.LpConstraint(
+            pulp.LpAffineExpression(gained + [(resistance_shortfall[res], 1)]),
+            sense=pulp.LpConstraintGE,
+            rhs=target_resistances[res] - current_resistances[res],
+            name=f"resistance_{r}",
+        )
+        prob += resistance_constraints[res]
+
+    # Make sure armor abs percentage gained from items is more than the required 43% to hit the cap
+    armor_constraint = pulp.LpConstraint(
+        pulp.LpAffineExpression(_sparse_row(all_vars, pair_armor_abs) + [(armor_shortfall, 1)]),
+        sense=pulp.LpConstraintGE,
+        rhs=required_armor_abs_percentage,
+        name="armor_absorption",
+    )
+    prob += armor_constraint
+
+    # Secondary objective: Minimize number of components and augments used
+    prob += pulp.LpAffineExpression(
+        [(resistance_shortfall[res], RES_PENALTY) for res in resistance_types]
+        + [(armor_shortfall, ARMOR_PENALTY)]
+        + [(var, ITEM_PENALTY) for var in all_vars]
+    )
+
+    return ResistanceModel(
+        prob=prob,
+        components=components,
+        augments=augments,
+        component_items=component_items,
+        component_slots=component_slots,
+        component_vars=component_vars,
+        augment_items=augment_items,
+        augment_slots=augment_slots,
+        augment_vars=augment_vars,
+        resistance_shortfall=resistance_shortfall,
+        armor_shortfall=armor_shortfall,
+        resistance_constraints=resistance_constraints,
+        armor_constraint=armor_constraint,
+    )
@@ -0,0 +1,208 @@
+from typing import Any
+
+from src.catalog import RESISTANCE_TYPES, STANDING_LEVELS
+
+WEAPON_TEMPLATES: list[str] = [
+    "one-hand-shield",
+    "one-hand-offhand",
+    "one-hand-one-hand",
+    "ranged-offhand",
+    "ranged-ranged",
+    "two-hand-melee",
+    "two-hand-ranged",
+]
+
+# Slots as presented to the user, "Weapon" and "Off-Hand/Shield" each block a group of gear slots
+BLOCKABLE_SLOTS: list[str] = [
+    "Helm",
+    "Chest",
+    "Shoulders",
+    "Gloves",
+    "Pants",
+    "Boots",
+    "Belt",
+    "Amulet",
+    "Ring 1",
+    "Ring 2",
+    "Medal",
+    "Weapon",
+    "Off-Hand/Shield",
+]
+
+FACTIONS: list[str] = [
+    "Devil's Crossing",
+    "Rovers",
+    "Homestead",
+    "Kymon's Chosen",
+    "Order of Death's Vigil",
+    "The Black Legion",
+    "The Outcast",
+    "Coven of Ugdenbog",
+    "Barrowholm",
+    "Malmouth Resistance",
+    "Cult of Bysmiel",
+    "Cult of Dreeg",
+    "Cult of Solael",
+    "Kurn",
+]
+
+# Short resistance keys accepted in configs, e.g. {"fire": 40} instead of {"Fire Resistance": 40}
+RESISTANCE_KEYS: dict[str, str] = {
+    "fire": "Fire Resistance",
+    "cold": "Cold Resistance",
+    "lightning": "Lightning Resistance",
+    "poison": "Poison & Acid Resistance",
+    "pierce": "Pierce Resistance",
+    "bleeding": "Bleeding Resistance",
+    "vitality": "Vitality Resistance",
+    "aether": "Aether Resistance",
+    "chaos": "Chaos Resistance",
+}
+
+DEFAULT_CHARACTER_LEVEL: int = 100
+DEFAULT_WEAPON_TEMPLATE: str = "one-hand-offhand"
+DEFAULT_ARMOR_ABS_PERCENTAGE: int = 70
+DEFAULT_CURRENT_RESISTANCE: int = 0
+DEFAULT_TARGET_RESISTANCE: int = 80
+DEFAULT_STANDING: str = "Revered"
+
+CONFIG_FIELDS: set[str] = {
+    "character_level",
+    "weapon_template",
+    "armor_absorption",
+    "current_resistances",
+    "target_resistances",
+    "unavailable_component_slots",
+    "unavailable_augment_slots",
+    "component_blacklist",
+    "augment_blacklist",
+    "faction_standings",
+}
+
+
+class ConfigError(ValueError):
+    """Raised when an optimizer configuration does not match the expected schema."""
+
+
+def _integer(value: Any, field: str, minimum: int, maximum: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ConfigError(f"{field} must be an integer")
+    if not minimum <= value <= maximum:
+        raise ConfigError(f"{field} must be between {minimum} and {maximum}")
+    return value
+
+
+def _resistances(value: Any, field: str, default: int) -> dict[str, int]:
+    if value is None:
+        value = {}
+    if not isinstance(value, dict):
+        raise ConfigError(f"{field} must be an object")
+
+    resistances: dict[str, int] = {res: default for res in RESISTANCE_TYPES}
+    for key, amount in value.items():
+        res: str | None = RESISTANCE_KEYS.get(key, key if key in RESISTANCE_TYPES else None)
+        if res is None:
+            raise ConfigError(f"{field} has unknown resistance {key!r}")
+        resistances[res] = _integer(amount, f"{field}.{key}", -1000, 1000)
+    return resistances
+
+
+def _blocked_slots(value: Any, field: str) -> dict[str, bool]:
+    if value is None:
+        value = []
+    if isinstance(value, dict):
+        value = [slot for slot, status in value.items() if status is True]
+    if not isinstance(value, list):
+        raise ConfigError(f"{field} must be a list of slot names")
+
+    unknown: list[str] = [slot for slot in value if slot not in BLOCKABLE_SLOTS]
+    if unknown:
+        raise ConfigError(f"{field} has unknown slots {unknown}")
+    return {slot: slot in value for slot in BLOCKABLE_SLOTS}
+
+
+def _names(value: Any, field: str) -> list[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+        raise ConfigError(f"{field} must be a list of item names")
+    return value
+
+
+def _standings(value: Any) -> dict[str, str]:
+    if value is None:
+        value = {}
+    if not isinstance(value, dict):
+        raise ConfigError("faction_standings must be an object")
+
+    standings: dict[str, str] = {faction: DEFAULT_STANDING for faction in FACTIONS}
+    for faction, standing in value.items():
+        if faction not in FACTIONS:
+            raise ConfigError(f"faction_standings has unknown faction {faction!r}")
+        if not isinstance(standing, str) or (standing.title() not in STANDING_LEVELS and standing.title() != "Neutral"):
+            raise ConfigError(
+                f"faction_standings.{faction} must be Neutral or one of {list(STANDING_LEVELS)}"
+            )
+        standings[faction] = standing
+    return standings
+
+
+def parse_optimizer_config(payload: Any) -> dict[str, Any]:
+    """Validate an optimizer configuration and convert it into ResistanceOptimizer arguments.
+
+    Every field is optional and falls back to the defaults of the web form. Example::
+
+        {
+            "character_level": 100,
+            "weapon_template": "one-hand-shield",
+            "armor_absorption": 70,
+            "current_resistances": {"fire": 40, "Chaos Resistance": 20},
+            "target_resistances": {"fire": 80},
+            "unavailable_component_slots": ["Helm", "Weapon"],
+            "unavailable_augment_slots": [],
+            "component_blacklist": ["Aether Soul"],
+            "augment_blacklist": [],
+            "faction_standings": {"Kurn": "Honored"}
+        }
+
+    Args:
+        payload (Any): Decoded JSON configuration.
+
+    Returns:
+        dict[str, Any]: Keyword arguments for ResistanceOptimizer.
+
+    Raises:
+        ConfigError: If the configuration does not match the schema.
+    """
+    if not isinstance(payload, dict):
+        raise ConfigError("configuration must be an object")
+    unknown: list[str] = sorted(set(payload) - CONFIG_FIELDS)
+    if unknown:
+        raise ConfigError(f"unknown configuration fields {unknown}")
+
+    weapon_template: Any = payload.get("weapon_template", DEFAULT_WEAPON_TEMPLATE)
+    if weapon_template not in WEAPON_TEMPLATES:
+        raise ConfigError(f"weapon_template must be one of {WEAPON_TEMPLATES}")
+
+    return {
+        "character_level": _integer(payload.get("character_level", DEFAULT_CHARACTER_LEVEL), "character_level", 1, 200),
+        "weapon_template": weapon_template,
+        "current_armor_abs_percentage": _integer(
+            payload.get("armor_absorption", DEFAULT_ARMOR_ABS_PERCENTAGE), "armor_absorption", 1, 100
+        ),
+        "current_resistances": _resistances(
+            payload.get("current_resistances"), "current_resistances", DEFAULT_CURRENT_RESISTANCE
+        ),
+        "target_resistances": _resistances(
+            payload.get("target_resistances"), "target_resistances", DEFAULT_TARGET_RESISTANCE
+        ),
+        "unavailable_component_slots": _blocked_slots(
+            payload.get("unavailable_component_slots"), "unavailable_component_slots"
+        ),
+        "unavailable_augment_slots": _blocked_slots(
+            payload.get("unavailable_augment_slots"), "unavailable_augment_slots"
+        ),
+        "component_blacklist": _names(payload.get("component_blacklist"), "component_blacklist"),
+        "augment_blacklist": _names(payload.get("augment_blacklist"), "augment_blacklist"),
+        "player_faction_standings": _standings(payload.get("faction_standings")),
+    }
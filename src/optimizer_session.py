@@ -0,0 +1,232 @@
+import time
+
+import numpy as np
+
+from src.catalog import SLOT_BITS, ItemTable, slots_to_bits
+from src.model_builder import ItemCandidates, ResistanceModel, build_resistance_model
+from src.pruning import dominance_bucket
+from src.resistance_optimizer import ResistanceOptimizer
+from src.solvers import make_solver, solution_status
+
+# Inputs that only move right-hand sides or fix variables of an already built model
+INCREMENTAL_FIELDS: set[str] = {
+    "current_resistances",
+    "target_resistances",
+    "current_armor_abs_percentage",
+    "unavailable_component_slots",
+    "unavailable_augment_slots",
+    "component_blacklist",
+    "augment_blacklist",
+}
+
+# Inputs that change which items or slots exist in the model, and therefore require a rebuild
+STRUCTURAL_FIELDS: set[str] = {
+    "character_level",
+    "weapon_template",
+    "player_faction_standings",
+}
+
+
+class OptimizerSession:
+    """Keep a built model alive across small edits of the same build.
+
+    The model covers the unlocked, non-dominated items in every gear slot of the weapon
+    template. Resistance and armor edits only update constraint right-hand sides, while blocked
+    slots and blacklisted items fix their variables to zero. Blacklisting an item that dominates
+    pairs missing from the model, or changing the level, template or faction standings, rebuilds
+    it. Each re-solve is warm-started from the previous solution where the backend supports it.
+    """
+
+    def __init__(self, optimizer: ResistanceOptimizer):
+        """Build the session model for the optimizer's current inputs.
+
+        Args:
+            optimizer (ResistanceOptimizer): Optimizer holding the inputs; it is updated in place.
+        """
+        self.optimizer: ResistanceOptimizer = optimizer
+        self.model: ResistanceModel | None = None
+        # (item, slot) pairs the built model contains, as a slot bitmask per catalog table row
+        self.component_pairs: np.ndarray | None = None
+        self.augment_pairs: np.ndarray | None = None
+        self.solves: int = 0
+        # Wall time of the phases of the last update/solve, in seconds
+        self.timings: dict[str, float] = {}
+        self.build()
+
+    def required_pairs(self, items: ItemTable, blacklist: list[str]) -> np.ndarray:
+        """Return the (item, slot) pairs the model must contain for the current inputs.
+
+        Args:
+            items (ItemTable): Compiled catalog table of the item kind.
+            blacklist (list[str]): Blacklisted item names.
+
+        Returns:
+            np.ndarray: Slot bitmask per table row.
+        """
+        optimizer: ResistanceOptimizer = self.optimizer
+        standing_levels: np.ndarray = items.standing_levels(optimizer.player_faction_standings)
+        if optimizer.prune_dominated:
+            pairs: np.ndarray = dominance_bucket(items, optimizer.character_level, standing_levels).eligibility(
+                np.isin(items.names, blacklist)
+            )
+        else:
+            contributes: np.ndarray = (items.resistances > 0).any(axis=1) | (items.armor_abs > 0)
+            pairs = np.where(contributes, items.slot_bits, np.uint32(0))
+
+        unlocked: np.ndarray = (items.required_level <= optimizer.character_level) & (
+            standing_levels[items.faction_code] >= items.required_standing
+        )
+        return np.where(unlocked, pairs, np.uint32(0))
+
+    def session_candidates(self, items: ItemTable, pairs: np.ndarray, template_slots: list[str]) -> ItemCandidates:
+        """Collect the items of the given pairs in the gear slots of the weapon template."""
+        column_bits: np.ndarray = np.array([SLOT_BITS[slot] for slot in template_slots], dtype=np.uint32)
+        rows: np.ndarray = np.flatnonzero(pairs & np.uint32(slots_to_bits(template_slots)))
+        return ItemCandidates(
+            rows=rows,
+            names=items.names[rows],
+            resistances=items.resistances[rows],
+            armor_abs=items.armor_abs[rows],
+            slots=template_slots,
+            eligibility=(pairs[rows, None] & column_bits) != 0,
+        )
+
+    def build(self, component_pairs: np.ndarray | None = None, augment_pairs: np.ndarray | None = None) -> None:
+        """Build the model from scratch for the structural inputs of the optimizer.
+
+        Args:
+            component_pairs (np.ndarray | None): Component pairs to model, defaults to the required ones.
+            augment_pairs (np.ndarray | None): Augment pairs to model, defaults to the required ones.
+        """
+        start: float = time.perf_counter()
+        optimizer: ResistanceOptimizer = self.optimizer
+        template_slots: list[str] = optimizer.process_weapon_template(optimizer.all_gear_slots.copy())
+
+        components: ItemTable = optimizer.catalog.components
+        augments: ItemTable = optimizer.catalog.augments
+        if component_pairs is None:
+            component_pairs = self.required_pairs(components, optimizer.component_blacklist)
+        if augment_pairs is None:
+            augment_pairs = self.required_pairs(augments, optimizer.augment_blacklist)
+        self.component_pairs = component_pairs
+        self.augment_pairs = augment_pairs
+
+        self.model = build_resistance_model(
+            self.session_candidates(components, component_pairs, template_slots),
+            self.session_candidates(augments, augment_pairs, template_slots),
+            optimizer.resistance_types,
+            optimizer.current_resistances,
+            optimizer.target_resistances,
+            optimizer.required_armor_abs_percentage,
+        )
+        self.solves = 0
+        self.timings = {"build": time.perf_counter() - start}
+        self.apply_inputs()
+
+    def apply_inputs(self) -> None:
+        """Push the incremental inputs of the optimizer into the built model."""
+        start: float = time.perf_counter()
+        optimizer: ResistanceOptimizer = self.optimizer
+        model: ResistanceModel = self.model
+
+        for res, constraint in model.resistance_constraints.items():
+            constraint.changeRHS(optimizer.target_resistances[res] - optimizer.current_resistances[res])
+        model.armor_constraint.changeRHS(optimizer.required_armor_abs_percentage)
+
+        for candidates, items, slots, variables, blacklist, available_slots in (
+            (
+                model.components,
+                model.component_items,
+                model.component_slots,
+                model.component_vars,
+                optimizer.component_blacklist,
+                optimizer.available_component_slots,
+            ),
+            (
+                model.augments,
+                model.augment_items,
+                model.augment_slots,
+                model.augment_vars,
+                optimizer.augment_blacklist,
+                optimizer.available_augment_slots,
+            ),
+        ):
+            usable: np.ndarray = (
+                ~np.isin(candidates.names, blacklist)[items]
+                & np.isin(np.array(candidates.slots), available_slots)[slots]
+            )
+            for variable, is_usable in zip(variables, usable.tolist()):
+                variable.upBound = 1 if is_usable else 0
+                # Drop a previous choice that is no longer allowed so the warm start stays feasible
+                if not is_usable and variable.varValue:
+                    variable.setInitialValue(0)
+
+        self.timings["update"] = time.perf_counter() - start
+
+    def update(self, **changes) -> None:
+        """Change some optimizer inputs, rebuilding the model only when its structure changes.
+
+        Args:
+            **changes: New values for ResistanceOptimizer fields, e.g. ``current_resistances``.
+
+        Raises:
+            ValueError: If a field cannot be changed within a session.
+        """
+        unknown: set[str] = set(changes) - INCREMENTAL_FIELDS - STRUCTURAL_FIELDS
+        if unknown:
+            raise ValueError(f"Fields {sorted(unknown)} cannot be changed within a session")
+
+        optimizer: ResistanceOptimizer = self.optimizer
+        for name, value in changes.items():
+            setattr(optimizer, name, value)
+
+        # Refresh the derived inputs of the optimizer, all of which are cheap
+        optimizer.calculate_remaining_resistances()
+        optimizer.calculate_required_armor_abs_percentage()
+        optimizer.filter_useful_components_augments()
+        optimizer.available_component_slots = optimizer.check_available_slots(optimizer.unavailable_component_slots)
+        optimizer.available_augment_slots = optimizer.check_available_slots(optimizer.unavailable_augment_slots)
+
+        if STRUCTURAL_FIELDS & set(changes):
+            self.build()
+            return
+
+        # Blacklisting a dominating item brings back pairs that were pruned from the model
+        component_pairs: np.ndarray = self.required_pairs(optimizer.catalog.components, optimizer.component_blacklist)
+        augment_pairs: np.ndarray = self.required_pairs(optimizer.catalog.augments, optimizer.augment_blacklist)
+        if (component_pairs & ~self.component_pairs).any() or (augment_pairs & ~self.augment_pairs).any():
+            self.build(component_pairs | self.component_pairs, augment_pairs | self.augment_pairs)
+        else:
+            self.timings = {}
+            self.apply_inputs()
+
+    def solve(self):
+        """Solve the session model for the current inputs.
+
+        Sets the optimizer's ``solver_status``, "Feasible" if the solver time limit stopped the solve.
+
+        Returns:
+            tuple: Same as ResistanceOptimizer.optimize_resistances.
+        """
+        optimizer: ResistanceOptimizer = self.optimizer
+        start: float = time.perf_counter()
+        self.model.prob.solve(
+            make_solver(
+                optimizer.solver_backend,
+                optimizer.solver_time_limit,
+                optimizer.solver_mip_gap,
+                warm_start=self.solves > 0,
+            )
+        )
+        self.solves += 1
+        self.timings["solve"] = time.perf_counter() - start
+
+        status: str = solution_status(self.model.prob)
+        optimizer.solver_status = status
+        if status not in ("Optimal", "Feasible"):
+            return None, None, None
+
+        start = time.perf_counter()
+        result = optimizer.decode_solution(self.model)
+        self.timings["decode"] = time.perf_counter() - start
+        return result
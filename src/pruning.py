@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.catalog import ALL_GEAR_SLOTS, ItemTable
+
+# Maximum number of (level, faction standing) buckets remembered per item table
+MAX_BUCKETS: int = 256
+
+
+@dataclass
+class DominanceBucket:
+    """Item/slot pairs worth modelling for one (character level, faction standing) bucket.
+
+    Attributes:
+        keep (np.ndarray): Slot bitmask per table row of the slots where the item fits,
+                           contributes something and is not dominated.
+        slot_candidates (list[np.ndarray]): Per gear slot, table rows of the contributing items
+                                            that fit the slot.
+        slot_dominance (list[np.ndarray]): Per gear slot, boolean matrix over ``slot_candidates``
+                                           where ``[a, b]`` means item a dominates item b.
+    """
+
+    keep: np.ndarray
+    slot_candidates: list[np.ndarray]
+    slot_dominance: list[np.ndarray]
+
+    def eligibility(self, blacklisted: np.ndarray) -> np.ndarray:
+        """Return the kept (item, slot) pairs once the given items are blacklisted.
+
+        A dominated pair can only be dropped while one of its dominators is still usable, so
+        every pair dominated by a blacklisted item is restored.
+
+        Args:
+            blacklisted (np.ndarray): Boolean mask over table rows of blacklisted items.
+
+        Returns:
+            np.ndarray: Slot bitmask per table row.
+        """
+        if not blacklisted.any():
+            return self.keep
+
+        keep: np.ndarray = self.keep.copy()
+        for s, (candidates, dominance) in enumerate(zip(self.slot_candidates, self.slot_dominance)):
+            blocked: np.ndarray = blacklisted[candidates]
+            if blocked.any():
+                keep[candidates[dominance[blocked].any(axis=0)]] |= np.uint32(1 << s)
+        return keep
+
+
+def _slot_dominance(stats: np.ndarray) -> np.ndarray:
+    """Compute the strict dominance relation between items that fit the same slot.
+
+    Item a dominates item b when it is at least as good on every resistance and on armor
+    absorption. Exact ties are broken by row order so that the relation stays a strict partial
+    order and exactly one of a group of identical items survives.
+    """
+    at_least: np.ndarray = (stats[:, None, :] >= stats[None, :, :]).all(axis=2)
+    order: np.ndarray = np.arange(len(stats))
+    return at_least & (~at_least.T | (order[:, None] < order[None, :]))
+
+
+def build_dominance_bucket(items: ItemTable, available: np.ndarray) -> DominanceBucket:
+    """Drop zero-contribution items and Pareto-dominated (item, slot) pairs.
+
+    Every pair is compared only with items available in the same bucket, so a dominating item
+    never has a stricter level or faction requirement than the item it replaces. As items may
+    be reused across slots, swapping a dominated item for its dominator is always feasible and
+    never worse, hence the optimum of the pruned model is identical.
+
+    Args:
+        items (ItemTable): Compiled item table.
+        available (np.ndarray): Boolean mask over table rows of the items in this bucket.
+
+    Returns:
+        DominanceBucket: Pruned eligibility of the bucket.
+    """
+    stats: np.ndarray = np.column_stack([items.resistances, items.armor_abs])
+    contributes: np.ndarray = available & (stats > 0).any(axis=1)
+
+    keep: np.ndarray = np.zeros(len(items), dtype=np.uint32)
+    slot_candidates: list[np.ndarray] = []
+    slot_dominance: list[np.ndarray] = []
+    for s in range(len(ALL_GEAR_SLOTS)):
+        bit: np.uint32 = np.uint32(1 << s)
+        candidates: np.ndarray = np.flatnonzero(contributes & ((items.slot_bits & bit) != 0))
+        dominance: np.ndarray = _slot_dominance(stats[candidates])
+        keep[candidates[~dominance.any(axis=0)]] |= bit
+        slot_candidates.append(candidates)
+        slot_dominance.append(dominance)
+
+    return DominanceBucket(keep=keep, slot_candidates=slot_candidates, slot_dominance=slot_dominance)
+
+
+def dominance_bucket(items: ItemTable, character_level: int, standing_levels: np.ndarray) -> DominanceBucket:
+    """Return the pruned eligibility for a character level and faction standing, computing it once.
+
+    Levels are bucketed on the required levels that actually occur in the table, so every
+    character level that unlocks the same items shares one bucket.
+
+    Args:
+        items (ItemTable): Compiled item table.
+        character_level (int): Level of the character.
+        standing_levels (np.ndarray): Player standing per faction code of the table.
+
+    Returns:
+        DominanceBucket: Pruned eligibility of the bucket.
+    """
+    unlocked_levels: np.ndarray = items.required_level[items.required_level <= character_level]
+    level_bucket: int = int(unlocked_levels.max()) if len(unlocked_levels) else -1
+    faction_gated: bool = bool(items.required_standing.any())
+    key: tuple = ("dominance", level_bucket, tuple(standing_levels.tolist()) if faction_gated else ())
+
+    bucket: DominanceBucket | None = items.derived.get(key)
+    if bucket is None:
+        available: np.ndarray = (items.required_level <= level_bucket) & (
+            standing_levels[items.faction_code] >= items.required_standing
+        )
+        bucket = build_dominance_bucket(items, available)
+        if len(items.derived) >= MAX_BUCKETS:
+            items.derived.clear()
+        items.derived[key] = bucket
+    return bucket
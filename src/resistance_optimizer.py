@@ -1,17 +1,109 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from math import ceil
+from typing import TYPE_CHECKING, Callable
 
-import pandas as pd
+import numpy as np
 import pulp
 
+from src.branch_and_bound import AssignmentSolution, NodeLimitExceeded, solve_assignment
+from src.catalog import (
+    ALL_GEAR_SLOTS,
+    RESISTANCE_TYPES,
+    SLOT_BITS,
+    ItemCatalog,
+    ItemInfo,
+    ItemTable,
+    bits_to_slots,
+    get_catalog,
+    slots_to_bits,
+)
+from src.model_builder import (
+    ARMOR_PENALTY,
+    ITEM_PENALTY,
+    RES_PENALTY,
+    ItemCandidates,
+    ResistanceModel,
+    build_resistance_model,
+)
+from src.optimizer_config import BLOCKABLE_SLOTS
+from src.pruning import DominanceBucket, dominance_bucket
+from src.result_cache import ResultCache
+from src.solvers import DEFAULT_SOLVER_BACKEND, make_solver, mip_bound, solution_status
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from src.answer_table import AnswerTable
+    from src.optimizer_session import OptimizerSession
+
+WEAPON_SLOTS: list[str] = [
+    "Melee-Caster-1h 1",
+    "Melee-Caster-1h 2",
+    "Ranged-1h 1",
+    "Ranged-1h 2",
+    "Melee-2h",
+    "Ranged-2h",
+    "Off-Hand",
+    "Shield",
+]
+
+# Weapon slots in use for each weapon template
+WEAPON_TEMPLATE_SLOTS: dict[str, list[str]] = {
+    "one-hand-shield": ["Melee-Caster-1h 1", "Shield"],
+    "one-hand-offhand": ["Melee-Caster-1h 1", "Off-Hand"],
+    "one-hand-one-hand": ["Melee-Caster-1h 1", "Melee-Caster-1h 2"],
+    "ranged-offhand": ["Ranged-1h 1", "Off-Hand"],
+    "ranged-ranged": ["Ranged-1h 1", "Ranged-1h 2"],
+    "two-hand-melee": ["Melee-2h"],
+    "two-hand-ranged": ["Ranged-2h"],
+}
+
+# "milp" solves the PuLP model with the configured solver backend, "bnb" runs the exact branch and
+# bound search of src.branch_and_bound in process and only falls back to the MILP on hard inputs
+OPTIMIZER_ENGINES: tuple[str, ...] = ("milp", "bnb")
+
+# Constructor arguments holding the optimization inputs, enough to recreate an optimizer in another process
+INPUT_FIELDS: tuple[str, ...] = (
+    "unavailable_component_slots",
+    "unavailable_augment_slots",
+    "component_blacklist",
+    "augment_blacklist",
+    "player_faction_standings",
+    "current_resistances",
+    "target_resistances",
+    "component_csv_path",
+    "augment_csv_path",
+    "weapon_template",
+    "character_level",
+    "current_armor_abs_percentage",
+    "solver_backend",
+    "solver_time_limit",
+    "solver_mip_gap",
+    "engine",
+    "prune_dominated",
+)
+
+# Gear slots covered by the grouped "Weapon" and "Off-Hand/Shield" blocking options
+BLOCKED_SLOT_GROUPS: dict[str, list[str]] = {
+    "Weapon": ["Melee-Caster-1h 1", "Melee-Caster-1h 2", "Ranged-1h 1", "Ranged-1h 2", "Melee-2h", "Ranged-2h"],
+    "Off-Hand/Shield": ["Melee-Caster-1h 2", "Ranged-1h 2", "Off-Hand", "Shield"],
+}
+
 
 @dataclass
 class ResistanceOptimizer:
     all_gear_slots: list[str] = None
     resistance_types: list[str] = None
 
-    useful_components: pd.DataFrame = None
-    useful_augments: pd.DataFrame = None
+    catalog: ItemCatalog = None
+    useful_component_rows: np.ndarray = None
+    useful_augment_rows: np.ndarray = None
 
     unavailable_component_slots: dict[str, bool] = None
     available_component_slots: list[str] = None
@@ -34,49 +126,46 @@ class ResistanceOptimizer:
     required_armor_abs_percentage: int = 43
     final_armor_abs_percentage: int = 70
 
+    # Solver backend ("auto", "highs" or "cbc"), optional time limit in seconds and relative MIP gap
+    solver_backend: str = DEFAULT_SOLVER_BACKEND
+    solver_time_limit: float = None
+    solver_mip_gap: float = None
+    # Optimization engine, one of OPTIMIZER_ENGINES; the solver settings above only apply to the MILP
+    engine: str = "milp"
+
+    # Drop zero-contribution and Pareto-dominated (item, slot) pairs before building the model
+    prune_dominated: bool = True
+
+    # Optional cache of results keyed on the canonicalized inputs
+    result_cache: ResultCache = None
+    # Optional table of precomputed results for common inputs, consulted before the result cache
+    answer_table: "AnswerTable" = None
+
+    # Wall time of the load, filter, build, solve and decode phases in seconds, size of the built
+    # model and outcome of the last optimization ("cached" or a PuLP status such as "Optimal")
+    timings: dict[str, float] = None
+    model_stats: dict[str, int] = None
+    solver_status: str = None
+
     def __post_init__(self):
         """Post Init function to perform certain operations on object creation."""
+        self.timings = {}
+        self.model_stats = {}
+        start: float = time.perf_counter()
         self.set_defaults()
+        self.timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
         self.calculate_remaining_resistances()
         self.calculate_required_armor_abs_percentage()
         self.filter_useful_components_augments()
         self.available_component_slots = self.check_available_slots(self.unavailable_component_slots)
         self.available_augment_slots = self.check_available_slots(self.unavailable_augment_slots)
+        self.timings["filter"] = time.perf_counter() - start
 
     def set_defaults(self) -> None:
-        self.all_gear_slots: list[str] = [
-            "Helm",
-            "Chest",
-            "Shoulders",
-            "Gloves",
-            "Pants",
-            "Boots",
-            "Belt",
-            "Amulet",
-            "Ring 1",
-            "Ring 2",
-            "Medal",
-            'Melee-Caster-1h 1',
-            'Melee-Caster-1h 2',
-            'Ranged-1h 1',
-            'Ranged-1h 2',
-            'Melee-2h',
-            'Ranged-2h',
-            'Off-Hand',
-            'Shield',
-        ]
-
-        self.resistance_types: list[str] = [
-            "Fire Resistance",
-            "Cold Resistance",
-            "Lightning Resistance",
-            "Poison & Acid Resistance",
-            "Pierce Resistance",
-            "Bleeding Resistance",
-            "Vitality Resistance",
-            "Aether Resistance",
-            "Chaos Resistance",
-        ]
+        self.all_gear_slots: list[str] = ALL_GEAR_SLOTS.copy()
+        self.resistance_types: list[str] = RESISTANCE_TYPES.copy()
 
         if self.current_resistances is None:
             self.current_resistances = {res: 40 for res in self.resistance_types}
@@ -87,6 +176,15 @@ class ResistanceOptimizer:
         if self.unavailable_augment_slots is None:
             self.unavailable_augment_slots = {slot: False for slot in self.all_gear_slots}
 
+        if self.component_blacklist is None:
+            self.component_blacklist = []
+
+        if self.augment_blacklist is None:
+            self.augment_blacklist = []
+
+        if self.catalog is None:
+            self.catalog = get_catalog(self.component_csv_path, self.augment_csv_path)
+
     def calculate_remaining_resistances(self) -> None:
         """Calculate the remaining resistances based on current resistances."""
         self.remaining_resistances = {
@@ -100,27 +198,34 @@ class ResistanceOptimizer:
 
     def filter_useful_components_augments(self) -> None:
         """Filter out useful components and augments based on character level and player faction standings."""
-        # Load the component and augment databases
-        component_df: pd.DataFrame = pd.read_csv(self.component_csv_path)
-        augment_df: pd.DataFrame = pd.read_csv(self.augment_csv_path)
-
-        # Filter components based on blacklist
-        filtered_component_df: pd.DataFrame = component_df[~component_df['Item'].isin(self.component_blacklist)]
-        # Remove components that don't meet required player level
-        self.useful_components = filtered_component_df[
-            (filtered_component_df["Required Player Level"] <= self.character_level)
-        ]
-        self.useful_components = self.useful_components.reset_index(drop=True)
-
-        # First filter augments based on player faction standings
-        filtered_augment_df: pd.DataFrame = self.filter_augment_db(augment_df)
-        # Filter augments based on blacklist
-        filtered_augment_df = filtered_augment_df[~filtered_augment_df['Item'].isin(self.augment_blacklist)]
-        # Remove augments that don't meet required player level
-        self.useful_augments = filtered_augment_df[
-            (filtered_augment_df["Required Player Level"] <= self.character_level)
-        ]
-        self.useful_augments = self.useful_augments.reset_index(drop=True)
+        # Views over the shared, already compiled catalogs
+        components = self.catalog.components
+        augments = self.catalog.augments
+
+        # Filter components based on blacklist and required player level
+        component_mask: np.ndarray = (
+            ~np.isin(components.names, self.component_blacklist)
+            & (components.required_level <= self.character_level)
+        )
+        self.useful_component_rows = np.flatnonzero(component_mask)
+
+        # Filter augments based on player faction standings, blacklist and required player level
+        augment_mask: np.ndarray = (
+            self.filter_augment_db(augments)
+            & ~np.isin(augments.names, self.augment_blacklist)
+            & (augments.required_level <= self.character_level)
+        )
+        self.useful_augment_rows = np.flatnonzero(augment_mask)
+
+    @property
+    def useful_components(self) -> "pd.DataFrame":
+        """Catalog rows of the useful components, built on access only."""
+        return self.catalog.components.frame.iloc[self.useful_component_rows].reset_index(drop=True)
+
+    @property
+    def useful_augments(self) -> "pd.DataFrame":
+        """Catalog rows of the useful augments, built on access only."""
+        return self.catalog.augments.frame.iloc[self.useful_augment_rows].reset_index(drop=True)
 
     def check_available_slots(
         self, unavailable_gear_slots: dict[str, bool]
@@ -134,39 +239,30 @@ class ResistanceOptimizer:
         Returns:
             list[str]: List of available gear slots based on weapon template as well as given unavailability.
         """
-        available_gear_slots: list[str] = self.all_gear_slots.copy()
+        return bits_to_slots(self.available_slot_bits(unavailable_gear_slots))
 
-        # Remove unavailable gear slots based on weapon template
-        available_gear_slots = self.process_weapon_template(available_gear_slots)
-
-        for slot, status in unavailable_gear_slots.items():
-            gear_to_remove: list[str] = []
-            if (status is True) and (slot == "Weapon"):
-                gear_to_remove = ["Melee-Caster-1h 1", "Melee-Caster-1h 2", "Ranged-1h 1", "Ranged-1h 2", "Melee-2h", "Ranged-2h"]
-            elif (status is True) and (slot == "Off-Hand/Shield"):
-                gear_to_remove = ["Melee-Caster-1h 2", "Ranged-1h 2", "Off-Hand", "Shield"]
-            elif status is True:
-                gear_to_remove = [slot]
-            available_gear_slots = self.remove_multiple_gear_slots(available_gear_slots, gear_to_remove)
-        
-        return available_gear_slots
-
-    def remove_multiple_gear_slots(self, available_gear_slots: list[str], gear_to_remove: list[str]) -> list[str]:
-        """Given a list of slots, remove them from all from the available list
+    def available_slot_bits(self, unavailable_gear_slots: dict[str, bool]) -> int:
+        """Calculate the slot bitmask of the gear slots available for the weapon template and blocked slots.
 
         Args:
-            available_gear_slots (list[str]): List of available gear slots
-            gear_to_remove (list[str]): List of gear to be removed
+            unavailable_gear_slots (dict[str, bool]): Dictionary containing availability info
+                                                        of each gear slot denoted by True/False.
 
         Returns:
-            list[str]: List of available gear slots
+            int: Slot bitmask, see SLOT_BITS.
         """
-        for gear in gear_to_remove:
-            try:
-                available_gear_slots.remove(gear)
-            except ValueError:
-                pass
-        return available_gear_slots
+        blocked_bits: int = 0
+        for slot, status in unavailable_gear_slots.items():
+            if status is True:
+                blocked_bits |= slots_to_bits(BLOCKED_SLOT_GROUPS.get(slot, [slot] if slot in SLOT_BITS else []))
+        return self.weapon_template_bits() & ~blocked_bits
+
+    def weapon_template_bits(self) -> int:
+        """Return the slot bitmask of every gear slot usable with the weapon template."""
+        unused_weapon_slots: list[str] = [
+            slot for slot in WEAPON_SLOTS if slot not in WEAPON_TEMPLATE_SLOTS.get(self.weapon_template, [])
+        ]
+        return slots_to_bits(self.all_gear_slots) & ~slots_to_bits(unused_weapon_slots)
 
     def process_weapon_template(self, available_gear_slots: list[str]) -> list[str]:
         """Adjust list of available gear slots based on the weapon template
@@ -177,115 +273,48 @@ class ResistanceOptimizer:
         Returns:
             list[str]: List of available gear slots
         """
-        weapon_template_gear_slots: list[str] = [
-            'Melee-Caster-1h 1',
-            'Melee-Caster-1h 2',
-            'Ranged-1h 1',
-            'Ranged-1h 2',
-            'Melee-2h',
-            'Ranged-2h',
-            'Off-Hand',
-            'Shield',
-        ]
-        gear_to_remove: list[str] = []
-        gear_to_keep: list[str] = []
-        if self.weapon_template == "one-hand-shield":
-            gear_to_keep = ["Melee-Caster-1h 1", "Shield"]
-        elif self.weapon_template == "one-hand-offhand":
-            gear_to_keep = ["Melee-Caster-1h 1", "Off-Hand"]
-        elif self.weapon_template == "one-hand-one-hand":
-            gear_to_keep = ["Melee-Caster-1h 1", "Melee-Caster-1h 2"]
-        elif self.weapon_template == "ranged-offhand":
-            gear_to_keep = ["Ranged-1h 1", "Off-Hand"]
-        elif self.weapon_template == "ranged-ranged":
-            gear_to_keep = ["Ranged-1h 1", "Ranged-1h 2"]
-        elif self.weapon_template == "two-hand-melee":
-            gear_to_keep = ["Melee-2h"]
-        elif self.weapon_template == "two-hand-ranged":
-            gear_to_keep = ["Ranged-2h"]
-        gear_to_remove = [gear_piece for gear_piece in weapon_template_gear_slots if gear_piece not in gear_to_keep]
-        available_gear_slots = self.remove_multiple_gear_slots(available_gear_slots, gear_to_remove)
-    
-        return available_gear_slots
-
-    def filter_augment_db(self, augment_df: pd.DataFrame) -> pd.DataFrame:
+        template_bits: int = self.weapon_template_bits()
+        return [slot for slot in available_gear_slots if SLOT_BITS[slot] & template_bits]
+
+    def filter_augment_db(self, augments: ItemTable) -> np.ndarray:
         """Filter augment database based on player faction standings.
 
         Args:
-            augment_df (pd.DataFrame): Dataframe containing all augment info.
+            augments (ItemTable): Compiled table containing all augment info.
 
         Returns:
-            pd.DataFrame: Augment db dataframe filtered by player faction standings.
+            np.ndarray: Boolean mask over the augment table, True where the player meets the faction requirement.
         """
-        # Mapping of faction standings from str to int
-        standing_levels: dict[str, int] = {
-            "Friendly": 1,
-            "Respected": 2,
-            "Honored": 3,
-            "Revered": 4,
-        }
+        # Map player's standings to numeric levels, indexed by the catalog's faction codes
+        player_standings_num: np.ndarray = augments.standing_levels(self.player_faction_standings)
 
-        # Map player's standings to numeric levels
-        player_standings_num: dict[str, int] = {
-            faction: standing_levels.get(level.title(), 0)
-            for faction, level in self.player_faction_standings.items()
-        }
-
-        # Create numeric required standing column
-        augment_df["RequiredStandingNum"] = (
-            augment_df["Required Faction Level"].str.title().map(standing_levels)
-        )
-
-        # Define filter function
-        def player_meets_requirement(row):
-            player_level: int = player_standings_num.get(row["Faction"], 0)
-            required_level: int = row["RequiredStandingNum"]
-            if pd.isna(required_level):
-                return False  # or True, as your policy
-            return player_level >= required_level
-
-        # Filter dataframe based on player standings
-        filtered_augments = augment_df[
-            augment_df.apply(player_meets_requirement, axis=1)
-        ]
-
-        return filtered_augments
+        # Single vectorized comparison against the precomputed required standing of each augment
+        return player_standings_num[augments.faction_code] >= augments.required_standing
 
     def generate_item_urls_and_tags(
         self,
         selected_items: dict[str, dict[str, str]],
-        component_df: pd.DataFrame,
-        augment_df: pd.DataFrame,
     ) -> dict[str, dict[str, dict[str, str]]]:
         """Generate item URLs and tags based on item name for both components and augments.
 
         Args:
             selected_items (dict[str, dict[str, str]]): Dictionary containing names of selected components and augments.
-            component_df (pd.DataFrame): Dataframe containing info of useful components.
-            augment_df (pd.DataFrame): Dataframe containing info of useful augments.
 
         Returns:
             dict[str, dict[str, dict[str, str]]]: Dictionary containing names, URLs, and tags for selected components and augments.
             """
-        combined_df: pd.DataFrame = pd.concat(
-            [component_df, augment_df], ignore_index=True
-        )
+        item_index: dict[str, ItemInfo] = self.catalog.item_index
 
         def get_item_url(name: str) -> str:
-            if not name:
-                return ""
-            item_info: pd.Series = combined_df[combined_df["Item"] == name]
-            if not item_info.empty:
-                item_id: int = int(item_info["ID"].iloc[0])
-                return f"https://www.grimtools.com/db/items/{item_id}"
+            item_info: ItemInfo | None = item_index.get(name) if name else None
+            if item_info is not None:
+                return f"https://www.grimtools.com/db/items/{item_info.id}"
             return ""
 
         def get_item_tag(name: str) -> str:
-            if not name:
-                return ""
-            item_info: pd.Series = combined_df[combined_df["Item"] == name]
-            if not item_info.empty:
-                return str(item_info["Item Tag"].iloc[0])
+            item_info: ItemInfo | None = item_index.get(name) if name else None
+            if item_info is not None:
+                return item_info.tag
             return ""
 
         selected_items_with_urls_and_tags: dict[str, dict[str, dict[str, str]]] = {}
@@ -322,143 +351,802 @@ class ResistanceOptimizer:
         }
         return selected_items
 
+    def item_candidates(
+        self,
+        items: ItemTable,
+        rows: np.ndarray,
+        available_gear_slots: list[str],
+        blacklist: list[str],
+        keep_dominated_by: np.ndarray | None = None,
+    ) -> ItemCandidates:
+        """Gather the dense stats and slot eligibility of the useful items of one kind.
+
+        Args:
+            items (ItemTable): Compiled catalog table of the item kind.
+            rows (np.ndarray): Catalog rows of the useful items.
+            available_gear_slots (list[str]): Gear slots that can still hold an item of this kind.
+            blacklist (list[str]): Blacklisted item names, needed to undo pruning against them.
+            keep_dominated_by (np.ndarray | None): Boolean mask over catalog rows of further items whose
+                                                   dominated pairs must be kept.
+
+        Returns:
+            ItemCandidates: Candidate items restricted to the available slots.
+        """
+        pair_bits: np.ndarray = items.slot_bits
+        if self.prune_dominated:
+            bucket: DominanceBucket = dominance_bucket(
+                items, self.character_level, items.standing_levels(self.player_faction_standings)
+            )
+            restored: np.ndarray = np.isin(items.names, blacklist)
+            if keep_dominated_by is not None:
+                restored |= keep_dominated_by
+            pair_bits = bucket.eligibility(restored)
+        # The eligible (item, slot) pairs are where the item's slot bits meet an available slot
+        column_bits: np.ndarray = np.array([SLOT_BITS[slot] for slot in available_gear_slots], dtype=np.uint32)
+        return ItemCandidates(
+            rows=rows,
+            names=items.names[rows],
+            resistances=items.resistances[rows],
+            armor_abs=items.armor_abs[rows],
+            slots=available_gear_slots,
+            eligibility=(pair_bits[rows, None] & column_bits) != 0,
+        )
+
+    def canonical_inputs(self) -> dict:
+        """Collect every input that influences the optimization result in a canonical form.
+
+        Blocked slots, blacklists and faction standings are normalized so that equivalent
+        submissions (e.g. different key order or standing capitalization) compare equal, and the
+        character level is reduced to the unlock level it reaches.
+
+        Returns:
+            dict: JSON serializable description of the optimization inputs.
+        """
+        return {
+            "catalog": self.catalog.version,
+            "level": self.catalog.unlock_level(self.character_level),
+            "template": self.weapon_template,
+            "current": [self.current_resistances[res] for res in self.resistance_types],
+            "target": [self.target_resistances[res] for res in self.resistance_types],
+            "armor": self.current_armor_abs_percentage,
+            "blocked_components": sorted(slot for slot, status in self.unavailable_component_slots.items() if status is True),
+            "blocked_augments": sorted(slot for slot, status in self.unavailable_augment_slots.items() if status is True),
+            "component_blacklist": sorted(set(self.component_blacklist)),
+            "augment_blacklist": sorted(set(self.augment_blacklist)),
+            "standings": self.catalog.augments.standing_levels(self.player_faction_standings).tolist(),
+            "time_limit": self.solver_time_limit,
+            "mip_gap": self.solver_mip_gap,
+        }
+
+    def cache_key(self) -> str:
+        """Hash the canonical optimizer inputs into a cache key.
+
+        Returns:
+            str: Hex digest identifying the optimization inputs.
+        """
+        canonical: str = json.dumps(self.canonical_inputs(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
     def optimize_resistances(self):
-        # Create the problem - now minimizing the total shortfall in resistances and armor absorption percentage
-        prob = pulp.LpProblem("Resistance_Optimization", pulp.LpMinimize)
-
-        # Decision variables: binary variable for each component-slot combination
-        component_slot_vars = {}
-        for i, item in self.useful_components.iterrows():
-            allowed_gear_slots = [slot for slot in self.available_component_slots if item[slot]]
-            for slot in allowed_gear_slots:
-                component_slot_vars[(i, slot)] = pulp.LpVariable(f"comp_{i}_{slot}", cat="Binary")
-
-        # Decision variables: binary variable for each augment-slot combination
-        augment_slot_vars = {}
-        for i, item in self.useful_augments.iterrows():
-            allowed_gear_slots = [slot for slot in self.available_augment_slots if item[slot]]
-            for slot in allowed_gear_slots:
-                augment_slot_vars[(i, slot)] = pulp.LpVariable(f"aug_{i}_{slot}", cat="Binary")
-
-        # Constraint: Each gear slot can only have one component
-        for slot in self.available_component_slots:
-            items_for_slot = [
-                (i, slot)
-                for i, item in self.useful_components.iterrows()
-                if item[slot] and (i, slot) in component_slot_vars
+        """Optimize the resistances, answering from the answer table or the result cache when possible."""
+        stored = self.lookup_result()
+        if stored is not None:
+            return stored
+
+        result = self.solve_resistances()
+        self.store_result(result)
+        return result
+
+    def lookup_result(self):
+        """Look up the result of the current inputs in the answer table, then in the result cache.
+
+        Returns:
+            tuple | None: The stored result as returned by solve_resistances, None if neither has it.
+        """
+        if self.result_cache is None and self.answer_table is None:
+            return None
+
+        key: str = self.cache_key()
+        stored = None
+        if self.answer_table is not None:
+            stored = self.answer_table.get(key, self.catalog.version)
+            self.solver_status = "precomputed"
+        if stored is None and self.result_cache is not None:
+            stored = self.result_cache.get(key)
+            self.solver_status = "cached"
+        if stored is None:
+            return None
+
+        selected_items_with_urls_and_tags, final_resistances, self.final_armor_abs_percentage = stored
+        return selected_items_with_urls_and_tags, final_resistances, self.final_armor_abs_percentage
+
+    def store_result(self, result) -> None:
+        """Add a result of solve_resistances for the current inputs to the result cache.
+
+        Args:
+            result (tuple): Selected items, final resistances and final armor absorption percentage.
+        """
+        # Non-optimal outcomes are not cached, they may succeed on a retry
+        if result[0] is not None and self.solver_status == "Optimal" and self.result_cache is not None:
+            self.result_cache.set(self.cache_key(), result)
+
+    def optimize_summary(self) -> dict:
+        """Optimize the resistances and summarize the outcome in a JSON serializable form.
+
+        Returns:
+            dict: Selected items, final resistances and armor absorption along with the remaining gaps.
+        """
+        return self.summarize(*self.optimize_resistances())
+
+    def summarize(self, selected_items_with_urls_and_tags, final_resistances, final_armor_abs_percentage) -> dict:
+        """Summarize an optimization result in a JSON serializable form.
+
+        Args:
+            selected_items_with_urls_and_tags (dict | None): Selected items, None if there is no solution.
+            final_resistances (dict | None): Final resistances, None if there is no solution.
+            final_armor_abs_percentage (float | None): Final armor absorption percentage.
+
+        Returns:
+            dict: Selected items, final resistances and armor absorption along with the remaining gaps.
+        """
+        if final_resistances is None:
+            return {"status": "infeasible"}
+
+        return {
+            # A solve stopped by its time limit returns the best loadout it found
+            "status": "feasible" if self.solver_status == "Feasible" else "optimal",
+            "items": selected_items_with_urls_and_tags,
+            "final_resistances": final_resistances,
+            # Calculate the resistance gaps if any after optimization
+            "gap_resistances": {
+                res: max(0, self.target_resistances[res] - final_resistances[res])
+                for res in self.resistance_types
+            },
+            "final_armor_absorption": final_armor_abs_percentage,
+            "gap_armor_absorption": int(max(100 - final_armor_abs_percentage, 0)),
+        }
+
+    def optimize_alternatives(self, count: int) -> list[dict]:
+        """Find the best loadouts that differ in the items they use, best first.
+
+        After every solve, a no-good cut forbids using all of the items of that loadout again, so
+        every alternative drops at least one item of each earlier loadout instead of merely moving
+        items between slots or adding unneeded ones. Pairs dominated by an item of a cut may be
+        needed by the next alternative, so they are kept like those of blacklisted items.
+
+        Args:
+            count (int): Maximum number of loadouts to return.
+
+        Returns:
+            list[dict]: Summaries as returned by optimize_summary, each with its "objective" value.
+                        Fewer than ``count`` are returned when the alternatives run out, or when a
+                        solve stops at the solver time limit: that loadout, the last one, then has
+                        the status "feasible".
+        """
+        # Catalog rows of the components and augments of every loadout found so far
+        cuts: list[tuple[np.ndarray, np.ndarray]] = []
+        cut_components: np.ndarray = np.zeros(len(self.catalog.components), dtype=bool)
+        cut_augments: np.ndarray = np.zeros(len(self.catalog.augments), dtype=bool)
+        alternatives: list[dict] = []
+        self.timings["build"] = self.timings["solve"] = 0.0
+
+        while len(alternatives) < count:
+            start: float = time.perf_counter()
+            model: ResistanceModel = self.build_model(keep_dominated_by=(cut_components, cut_augments))
+            for component_rows, augment_rows in cuts:
+                model.exclude_item_set(
+                    np.searchsorted(model.components.rows, component_rows),
+                    np.searchsorted(model.augments.rows, augment_rows),
+                )
+            self.timings["build"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            model.prob.solve(make_solver(self.solver_backend, self.solver_time_limit, self.solver_mip_gap))
+            self.timings["solve"] += time.perf_counter() - start
+            status: str = solution_status(model.prob)
+            self.solver_status = status
+            if status not in ("Optimal", "Feasible"):
+                break
+
+            summary: dict = self.summarize(*self.decode_solution(model))
+            summary["objective"] = round(pulp.value(model.prob.objective), 6)
+            alternatives.append(summary)
+            if status == "Feasible":
+                # A better loadout than this one may still exist, later ones could not be ordered after it
+                break
+
+            component_items, augment_items = model.selected_items()
+            if not len(component_items) and not len(augment_items):
+                # An empty loadout has no alternative without items
+                break
+            cuts.append((model.components.rows[component_items], model.augments.rows[augment_items]))
+            cut_components[cuts[-1][0]] = True
+            cut_augments[cuts[-1][1]] = True
+
+        return alternatives
+
+    def optimize_frontier(self) -> list[dict]:
+        """Trace the trade-off between the number of items used and the remaining shortfall.
+
+        The unconstrained optimum gives the largest budget worth considering, every smaller item
+        budget is then solved in increasing order. Each budget is first solved by the branch and
+        bound search of src.branch_and_bound, whose bound accounts for the budget. From the first
+        budget on which it exceeds its node limit, budgets are solved on one MILP model instead:
+        its item budget constraint is raised between solves, which keeps the previous solution
+        feasible as a warm start.
+        Budgets that do not lower the shortfall are left out of the frontier.
+
+        Returns:
+            list[dict]: One summary per Pareto-optimal budget as returned by optimize_summary,
+                        fewest items first, each with its "item_count", "resistance_shortfall"
+                        and "armor_shortfall". Empty if the model has no optimal solution.
+        """
+        start: float = time.perf_counter()
+        components, augments = self.build_candidates()
+        self.timings["build"] = time.perf_counter() - start
+        self.timings["solve"] = 0.0
+        self.model_stats = {
+            "component_candidates": len(components.rows),
+            "augment_candidates": len(augments.rows),
+            "nodes": 0,
+            "milp_solves": 0,
+        }
+        # MILP model of the budgets the search gives up on, built on first use
+        model: ResistanceModel | None = None
+
+        def search(budget: int | None) -> list[tuple] | None:
+            try:
+                solution: AssignmentSolution = solve_assignment(
+                    components,
+                    augments,
+                    self.resistance_types,
+                    self.current_resistances,
+                    self.target_resistances,
+                    self.required_armor_abs_percentage,
+                    max_items=budget,
+                )
+            except NodeLimitExceeded:
+                return None
+            self.model_stats["nodes"] += solution.nodes
+            self.solver_status = "Optimal"
+            return [
+                (components, solution.component_items, solution.component_slots, "component"),
+                (augments, solution.augment_items, solution.augment_slots, "augment"),
             ]
-            if items_for_slot:
-                prob += pulp.lpSum(component_slot_vars[idx] for idx in items_for_slot) <= 1
-
-        # Constraint: Each gear slot can only have one augment
-        for slot in self.available_augment_slots:
-            items_for_slot = [
-                (i, slot)
-                for i, item in self.useful_augments.iterrows()
-                if item[slot] and (i, slot) in augment_slot_vars
+
+        def solve_milp(budget: int | None) -> list[tuple] | None:
+            nonlocal model
+            if model is None:
+                model = build_resistance_model(
+                    components,
+                    augments,
+                    self.resistance_types,
+                    self.current_resistances,
+                    self.target_resistances,
+                    self.required_armor_abs_percentage,
+                )
+            # Budgets only grow after the first solve, so an earlier budgeted solution stays feasible
+            warm_start: bool = model.item_budget is not None
+            if budget is not None:
+                model.set_item_budget(budget)
+            model.prob.solve(
+                make_solver(self.solver_backend, self.solver_time_limit, self.solver_mip_gap, warm_start=warm_start)
+            )
+            self.model_stats["milp_solves"] += 1
+            self.solver_status = pulp.LpStatus[model.prob.status]
+            return self.solution_selections(model) if self.solver_status == "Optimal" else None
+
+        def solve_point(budget: int | None) -> dict | None:
+            start: float = time.perf_counter()
+            # Budgets that are hard for the search come in runs, once it gives up the MILP takes over
+            selections: list[tuple] | None = None
+            if model is None or model.item_budget is None:
+                selections = search(budget)
+            if selections is None:
+                selections = solve_milp(budget)
+                if selections is None:
+                    return None
+            self.timings["solve"] += time.perf_counter() - start
+            return self.shortfall_summary(selections)
+
+        best: dict | None = solve_point(None)
+        if best is None:
+            return []
+
+        def penalty(point: dict) -> float:
+            return RES_PENALTY * point["resistance_shortfall"] + ARMOR_PENALTY * point["armor_shortfall"]
+
+        frontier: list[dict] = []
+        for budget in range(best["item_count"] + 1):
+            point: dict | None = solve_point(budget) if budget < best["item_count"] else best
+            if point is None:
+                break
+            # A larger budget that does not lower the shortfall adds a dominated point
+            if not frontier or penalty(point) < penalty(frontier[-1]):
+                frontier.append(point)
+        return frontier
+
+    def optimize_anytime(self, time_budget: float, on_incumbent: Callable[[dict], None] | None = None) -> dict:
+        """Find the best loadout within a time budget, along with how far from optimal it may still be.
+
+        The branch and bound search of src.branch_and_bound runs first: it finds good loadouts
+        within milliseconds and proves the easy inputs optimal. When it exceeds its node limit, the
+        MILP is solved for the rest of the budget, warm-started from the best loadout of the search.
+        Loadouts that improve on the previous ones are reported as they are found; during the MILP
+        only the HiGHS backend reports them, CBC runs in a subprocess and only returns its last one.
+
+        Args:
+            time_budget (float): Seconds to spend. The solver may exceed it by the time it takes to stop.
+            on_incumbent (Callable[[dict], None] | None): Called with the summary of every improving
+                loadout, as returned by shortfall_summary along with its "status" "feasible" and its
+                "objective".
+
+        Returns:
+            dict: Summary of the best loadout as returned by shortfall_summary, with the "status"
+                  "optimal" if it is proven optimal or "feasible" if the budget ran out first, its
+                  "objective", the lower "bound" on the objective proven by then and the relative
+                  "gap" between them. Only {"status": "infeasible"} if no loadout was found.
+        """
+        deadline: float = time.perf_counter() + time_budget
+        start: float = time.perf_counter()
+        components, augments = self.build_candidates()
+        self.timings["build"] = time.perf_counter() - start
+        self.model_stats = {
+            "component_candidates": len(components.rows),
+            "augment_candidates": len(augments.rows),
+        }
+        # Objective of the last loadout reported to on_incumbent
+        reported: float = np.inf
+
+        def search_selections(solution: AssignmentSolution) -> list[tuple]:
+            return [
+                (components, solution.component_items, solution.component_slots, "component"),
+                (augments, solution.augment_items, solution.augment_slots, "augment"),
             ]
-            if items_for_slot:
-                prob += pulp.lpSum(augment_slot_vars[idx] for idx in items_for_slot) <= 1
 
-        # Error variables for shortfall in resistances and armor absorption percentage
-        resistance_shortfall = {
-            res: pulp.LpVariable(f"shortfall_{res}", lowBound=0, cat="Continuous")
-            for res in self.resistance_types
+        def summary(selections: list[tuple], status: str) -> dict:
+            point: dict = self.shortfall_summary(selections)
+            point["status"] = status
+            point["objective"] = (
+                RES_PENALTY * point["resistance_shortfall"]
+                + ARMOR_PENALTY * point["armor_shortfall"]
+                + ITEM_PENALTY * point["item_count"]
+            )
+            return point
+
+        def bounded(point: dict, bound: float) -> dict:
+            point["bound"] = min(bound, point["objective"])
+            point["gap"] = round(1 - point["bound"] / point["objective"], 6) if point["objective"] > 0 else 0.0
+            return point
+
+        def report(selections: list[tuple]) -> None:
+            nonlocal reported
+            point: dict = summary(selections, "feasible")
+            if point["objective"] < reported:
+                reported = point["objective"]
+                on_incumbent(point)
+
+        start = time.perf_counter()
+        try:
+            solution: AssignmentSolution = solve_assignment(
+                components,
+                augments,
+                self.resistance_types,
+                self.current_resistances,
+                self.target_resistances,
+                self.required_armor_abs_percentage,
+                on_incumbent=None if on_incumbent is None else lambda found: report(search_selections(found)),
+            )
+        except NodeLimitExceeded as error:
+            incumbent: AssignmentSolution | None = error.incumbent
+            search_bound: float = error.lower_bound
+        else:
+            self.timings["solve"] = time.perf_counter() - start
+            self.model_stats["nodes"] = solution.nodes
+            self.solver_status = "Optimal"
+            point: dict = summary(search_selections(solution), "optimal")
+            return bounded(point, point["objective"])
+
+        model: ResistanceModel = build_resistance_model(
+            components,
+            augments,
+            self.resistance_types,
+            self.current_resistances,
+            self.target_resistances,
+            self.required_armor_abs_percentage,
+        )
+        self.model_stats["variables"] = model.prob.numVariables()
+        self.model_stats["constraints"] = model.prob.numConstraints()
+        if incumbent is not None:
+            for variables, items, slots, chosen_items, chosen_slots in (
+                (model.component_vars, model.component_items, model.component_slots,
+                 incumbent.component_items, incumbent.component_slots),
+                (model.augment_vars, model.augment_items, model.augment_slots,
+                 incumbent.augment_items, incumbent.augment_slots),
+            ):
+                chosen: set[tuple[int, int]] = set(zip(chosen_items.tolist(), chosen_slots.tolist()))
+                for variable, item, slot in zip(variables, items.tolist(), slots.tolist()):
+                    variable.setInitialValue(1 if (item, slot) in chosen else 0)
+
+        def improving_solution(values: np.ndarray) -> None:
+            report([
+                (candidates, items[used], slots[used], kind)
+                for candidates, items, slots, used, kind in (
+                    (model.components, model.component_items, model.component_slots,
+                     values[[variable.index for variable in model.component_vars]] > 0.5, "component"),
+                    (model.augments, model.augment_items, model.augment_slots,
+                     values[[variable.index for variable in model.augment_vars]] > 0.5, "augment"),
+                )
+            ])
+
+        best: dict | None = None
+        if incumbent is not None:
+            best = bounded(summary(search_selections(incumbent), "feasible"), search_bound)
+        remaining: float = deadline - time.perf_counter()
+        if remaining > 0 or incumbent is None:
+            with tempfile.TemporaryDirectory() as log_dir:
+                log_path: str = os.path.join(log_dir, "cbc.log")
+                model.prob.solve(
+                    make_solver(
+                        self.solver_backend,
+                        max(remaining, 1.0),
+                        self.solver_mip_gap,
+                        warm_start=incumbent is not None,
+                        log_path=log_path,
+                        on_solution=None if on_incumbent is None else improving_solution,
+                    )
+                )
+                bound: float = max(search_bound, mip_bound(model.prob, log_path) or 0.0)
+            self.timings["solve"] = time.perf_counter() - start
+
+            if model.prob.sol_status == pulp.LpSolutionOptimal:
+                self.solver_status = "Optimal"
+                point = summary(self.solution_selections(model), "optimal")
+                return bounded(point, point["objective"])
+            if model.prob.sol_status == pulp.LpSolutionIntegerFeasible:
+                found: dict = summary(self.solution_selections(model), "feasible")
+                # HiGHS does not take the warm start, its last loadout may be worse than the search's
+                if best is None or found["objective"] < best["objective"]:
+                    best = found
+                best = bounded(best, bound)
+            elif best is None:
+                self.solver_status = pulp.LpStatus[model.prob.status]
+                return {"status": "infeasible"}
+
+        self.timings["solve"] = time.perf_counter() - start
+        self.solver_status = "Feasible"
+        return best
+
+    def slot_sensitivity(self, workers: int = 1) -> dict:
+        """Measure how blocking each available slot, or freeing each blocked one, changes the shortfall.
+
+        Every component and augment slot option of BLOCKABLE_SLOTS that matters for the weapon
+        template is toggled on its own. Blocking a slot the current solution leaves empty keeps that
+        solution and needs no solve. The current inputs and the other toggles are solved on one
+        OptimizerSession, whose model is built once: a toggle only fixes or frees the variables of
+        its slots, and each re-solve is warm-started from the previous solution. With several
+        workers those toggles are split between processes, each with a session of its own. The
+        session model is a MILP whatever the engine.
+
+        Args:
+            workers (int): Number of processes to evaluate the toggles in, 1 to stay in this process.
+
+        Returns:
+            dict: "base", the current inputs summarized as by shortfall_summary, and "slots", one row
+                  per toggle as returned by evaluate_slot_toggles, with the
+                  "resistance_shortfall_change" and "armor_shortfall_change" of the optimal ones.
+                  The base is None and the rows are empty if the current inputs have no optimal
+                  solution.
+        """
+        unavailable: dict[str, dict[str, bool]] = {
+            "component": self.unavailable_component_slots,
+            "augment": self.unavailable_augment_slots,
+        }
+        toggles: list[tuple[str, str]] = []
+        for kind, unavailable_slots in unavailable.items():
+            for slot in BLOCKABLE_SLOTS:
+                toggled: dict[str, bool] = unavailable_slots | {slot: unavailable_slots.get(slot) is not True}
+                # Slot options outside of the weapon template change nothing
+                if self.available_slot_bits(toggled) != self.available_slot_bits(unavailable_slots):
+                    toggles.append((kind, slot))
+
+        # Imported here, the session module builds on this one
+        from src.optimizer_session import OptimizerSession
+
+        start: float = time.perf_counter()
+        session: OptimizerSession = OptimizerSession(self)
+        self.timings["build"] = time.perf_counter() - start
+        start = time.perf_counter()
+        session.solve()
+        self.timings["solve"] = time.perf_counter() - start
+        self.model_stats = {"toggles": len(toggles)}
+        if self.solver_status not in ("Optimal", "Feasible"):
+            return {"base": None, "slots": []}
+        selections: list[tuple] = self.solution_selections(session.model)
+        base: dict = self.shortfall_summary(selections)
+
+        # Blocking only removes options, so a solution that leaves the blocked slot empty stays optimal
+        used_bits: dict[str, int] = {
+            kind: slots_to_bits([candidates.slots[s] for s in slots.tolist()])
+            for candidates, _, slots, kind in selections
+        }
+        unchanged: list[tuple[str, str]] = []
+        for kind, slot in toggles:
+            if unavailable[kind].get(slot) is True:
+                continue
+            removed_bits: int = self.available_slot_bits(unavailable[kind]) & ~self.available_slot_bits(
+                unavailable[kind] | {slot: True}
+            )
+            if not removed_bits & used_bits[kind]:
+                unchanged.append((kind, slot))
+        solved: list[tuple[str, str]] = [toggle for toggle in toggles if toggle not in unchanged]
+        self.model_stats["solved_toggles"] = len(solved)
+
+        start = time.perf_counter()
+        workers = max(1, min(workers, len(solved)))
+        if workers == 1:
+            rows: list[dict] = self.evaluate_slot_toggles(solved, session)
+        else:
+            optimizer_kwargs: dict = {name: getattr(self, name) for name in INPUT_FIELDS}
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = executor.map(
+                    evaluate_slot_toggles, [optimizer_kwargs] * workers, [solved[w::workers] for w in range(workers)]
+                )
+                rows = [row for chunk in chunks for row in chunk]
+        self.timings["solve"] += time.perf_counter() - start
+
+        shortfalls: dict = self.selection_shortfalls(selections)
+        rows.extend({"slot": slot, "kind": kind, "blocked": False, "status": "optimal"} | shortfalls
+                    for kind, slot in unchanged)
+        rows.sort(key=lambda row: toggles.index((row["kind"], row["slot"])))
+        for row in rows:
+            if row["status"] == "optimal":
+                row["resistance_shortfall_change"] = row["resistance_shortfall"] - base["resistance_shortfall"]
+                row["armor_shortfall_change"] = round(row["armor_shortfall"] - base["armor_shortfall"], 6)
+        return {"base": base, "slots": rows}
+
+    def evaluate_slot_toggles(
+        self, toggles: list[tuple[str, str]], session: "OptimizerSession | None" = None
+    ) -> list[dict]:
+        """Solve the current inputs once per slot option toggled on its own.
+
+        Args:
+            toggles (list[tuple[str, str]]): Item kind ("component" or "augment") and slot option of
+                                             BLOCKABLE_SLOTS to block if it is available, or free if
+                                             it is blocked.
+            session (OptimizerSession | None): Session of this optimizer to re-solve, one is built if None.
+
+        Returns:
+            list[dict]: One row per toggle with its "slot", "kind", whether the slot is "blocked" now
+                        and the "status" of the solve; optimal rows also hold the "item_count",
+                        "resistance_shortfall" and "armor_shortfall" of selection_shortfalls.
+        """
+        if session is None:
+            from src.optimizer_session import OptimizerSession
+
+            session = OptimizerSession(self)
+        unavailable: dict[str, dict[str, bool]] = {
+            "component": self.unavailable_component_slots,
+            "augment": self.unavailable_augment_slots,
+        }
+        rows: list[dict] = []
+        try:
+            for kind, slot in toggles:
+                blocked: bool = unavailable[kind].get(slot) is True
+                toggled: dict[str, dict[str, bool]] = unavailable | {kind: unavailable[kind] | {slot: not blocked}}
+                session.update(
+                    unavailable_component_slots=toggled["component"], unavailable_augment_slots=toggled["augment"]
+                )
+                session.solve()
+                row: dict = {"slot": slot, "kind": kind, "blocked": blocked, "status": self.solver_status.lower()}
+                if self.solver_status in ("Optimal", "Feasible"):
+                    row |= self.selection_shortfalls(self.solution_selections(session.model))
+                rows.append(row)
+        finally:
+            # The session updated this optimizer in place
+            session.update(
+                unavailable_component_slots=unavailable["component"], unavailable_augment_slots=unavailable["augment"]
+            )
+        return rows
+
+    def shortfall_summary(self, selections) -> dict:
+        """Summarize a chosen assignment along with its item count and remaining shortfalls.
+
+        Args:
+            selections: (candidates, item indices, slot indices, kind) of the chosen components and augments.
+
+        Returns:
+            dict: Summary as returned by optimize_summary, with the values of selection_shortfalls.
+        """
+        return self.summarize(*self.decode_selection(selections)) | self.selection_shortfalls(selections)
+
+    def selection_shortfalls(self, selections) -> dict:
+        """Count the items of a chosen assignment and the shortfalls it leaves.
+
+        Args:
+            selections: (candidates, item indices, slot indices, kind) of the chosen components and augments.
+
+        Returns:
+            dict: The "item_count", the summed "resistance_shortfall" and the "armor_shortfall" in
+                  percentage points.
+        """
+        deficit: np.ndarray = np.array(
+            [self.target_resistances[res] - self.current_resistances[res] for res in self.resistance_types]
+        )
+        gained_resistances: np.ndarray = sum(
+            candidates.resistances[items].sum(axis=0) for candidates, items, _, _ in selections
+        )
+        gained_armor: float = sum(candidates.armor_abs[items].sum().item() for candidates, items, _, _ in selections)
+        return {
+            "item_count": sum(len(items) for _, items, _, _ in selections),
+            "resistance_shortfall": int(np.maximum(deficit - gained_resistances, 0).sum()),
+            "armor_shortfall": max(self.required_armor_abs_percentage - gained_armor, 0.0),
         }
-        armor_shortfall = pulp.LpVariable("shortfall_armor", lowBound=0, cat="Continuous")
-
-        # Secondary objective: Minimize number of components used
-        component_count = []
-        for i, item in self.useful_components.iterrows():
-            allowed_gear_slots = [slot for slot in self.available_component_slots if item[slot]]
-            if allowed_gear_slots:
-                component_count.append(pulp.lpSum(component_slot_vars[(i, slot)] for slot in allowed_gear_slots))
-
-        # Secondary objective: Minimize number of augments used
-        augment_count = []
-        for i, item in self.useful_augments.iterrows():
-            allowed_gear_slots = [slot for slot in self.available_augment_slots if item[slot]]
-            if allowed_gear_slots:
-                augment_count.append(pulp.lpSum(augment_slot_vars[(i, slot)] for slot in allowed_gear_slots))
-
-        # Primary objective: Minimize total shortfall in resistances
-        for res in self.resistance_types:
-            gained = []
-            for i, item in self.useful_components.iterrows():
-                for slot in self.available_component_slots:
-                    if item[slot] and (i, slot) in component_slot_vars:
-                        gained.append(component_slot_vars[(i, slot)] * item[res])
-
-            for i, item in self.useful_augments.iterrows():
-                for slot in self.available_augment_slots:
-                    if item[slot] and (i, slot) in augment_slot_vars:
-                        gained.append(augment_slot_vars[(i, slot)] * item[res])
-
-            prob += self.current_resistances[res] + pulp.lpSum(gained) + resistance_shortfall[res] >= self.target_resistances[res]
-
-        # Primary objective: Minimize total shortfall in armor absorption percentage
-        armor_abs_gained = []
-        for i, item in self.useful_components.iterrows():
-            for slot in self.available_component_slots:
-                if item[slot] and (i, slot) in component_slot_vars:
-                    armor_abs_gained.append(component_slot_vars[(i, slot)] * item.get("Armor Absorption %", 0))
-
-        for i, item in self.useful_augments.iterrows():
-            for slot in self.available_augment_slots:
-                if item[slot] and (i, slot) in augment_slot_vars:
-                    armor_abs_gained.append(augment_slot_vars[(i, slot)] * item.get("Armor Absorption %", 0))
-
-        # Make sure armor abs percentage gained from items is more than the required 43% to hit the cap
-        armor_absorption_percentage_gained = pulp.lpSum(armor_abs_gained)
-        prob += armor_absorption_percentage_gained + armor_shortfall >= self.required_armor_abs_percentage
-
-        # Penalize shortfalls heavily in the objective function to prioritize meeting resistance and armor absorption targets
-        res_penalty = 1e4
-        armor_penalty = 1e3
-        item_penalty = 1
-
-        prob += (
-            (res_penalty * pulp.lpSum(resistance_shortfall.values()))
-            + (armor_penalty * armor_shortfall)
-            + (item_penalty * (pulp.lpSum(component_count) + pulp.lpSum(augment_count)))
+
+    def build_model(self, keep_dominated_by: tuple[np.ndarray, np.ndarray] | None = None) -> ResistanceModel:
+        """Build the optimization model for the current inputs.
+
+        Args:
+            keep_dominated_by (tuple[np.ndarray, np.ndarray] | None): Boolean masks over the component
+                and augment catalog rows of items whose dominated pairs must not be pruned.
+
+        Returns:
+            ResistanceModel: Model over the useful items and available slots.
+        """
+        components, augments = self.build_candidates(keep_dominated_by)
+        return build_resistance_model(
+            components,
+            augments,
+            self.resistance_types,
+            self.current_resistances,
+            self.target_resistances,
+            self.required_armor_abs_percentage,
         )
 
+    def build_candidates(
+        self, keep_dominated_by: tuple[np.ndarray, np.ndarray] | None = None
+    ) -> tuple[ItemCandidates, ItemCandidates]:
+        """Select the candidate components and augments for the current inputs.
+
+        Args:
+            keep_dominated_by (tuple[np.ndarray, np.ndarray] | None): Boolean masks over the component
+                and augment catalog rows of items whose dominated pairs must not be pruned.
+
+        Returns:
+            tuple[ItemCandidates, ItemCandidates]: Candidate components and augments.
+        """
+        components: ItemCandidates = self.item_candidates(
+            self.catalog.components,
+            self.useful_component_rows,
+            self.available_component_slots,
+            self.component_blacklist,
+            keep_dominated_by[0] if keep_dominated_by else None,
+        )
+        augments: ItemCandidates = self.item_candidates(
+            self.catalog.augments,
+            self.useful_augment_rows,
+            self.available_augment_slots,
+            self.augment_blacklist,
+            keep_dominated_by[1] if keep_dominated_by else None,
+        )
+        return components, augments
+
+    def solve_resistances(self):
+        """Build and solve the optimization model for the current inputs with the selected engine."""
+        if self.engine not in OPTIMIZER_ENGINES:
+            raise ValueError(f"Unknown optimizer engine {self.engine!r}, expected one of {OPTIMIZER_ENGINES}")
+        if self.engine == "bnb":
+            return self.solve_branch_and_bound()
+        return self.solve_milp()
+
+    def solve_milp(self):
+        """Build and solve the MILP model for the current inputs."""
+        start: float = time.perf_counter()
+        model: ResistanceModel = self.build_model()
+        self.timings["build"] = time.perf_counter() - start
+        self.model_stats = {
+            "variables": model.prob.numVariables(),
+            "constraints": model.prob.numConstraints(),
+            "component_candidates": len(model.components.rows),
+            "augment_candidates": len(model.augments.rows),
+        }
+
         # Initialize the solver and solve the problem
-        prob.solve(pulp.PULP_CBC_CMD(msg=0))
+        start = time.perf_counter()
+        model.prob.solve(make_solver(self.solver_backend, self.solver_time_limit, self.solver_mip_gap))
+        self.timings["solve"] = time.perf_counter() - start
 
-        status = pulp.LpStatus[prob.status]
-        if status != "Optimal":
+        status: str = solution_status(model.prob)
+        self.solver_status = status
+        if status not in ("Optimal", "Feasible"):
             return None, None, None
 
+        start = time.perf_counter()
+        result = self.decode_solution(model)
+        self.timings["decode"] = time.perf_counter() - start
+        return result
+
+    def solve_branch_and_bound(self):
+        """Solve the current inputs with the combinatorial branch and bound engine.
+
+        Falls back to the MILP if the search exceeds its node limit.
+        """
+        start: float = time.perf_counter()
+        components, augments = self.build_candidates()
+        self.timings["build"] = time.perf_counter() - start
+        self.model_stats = {
+            "component_candidates": len(components.rows),
+            "augment_candidates": len(augments.rows),
+        }
+
+        start = time.perf_counter()
+        try:
+            solution: AssignmentSolution = solve_assignment(
+                components,
+                augments,
+                self.resistance_types,
+                self.current_resistances,
+                self.target_resistances,
+                self.required_armor_abs_percentage,
+            )
+        except NodeLimitExceeded:
+            return self.solve_milp()
+        self.timings["solve"] = time.perf_counter() - start
+        self.model_stats["nodes"] = solution.nodes
+        self.solver_status = "Optimal"
+
+        start = time.perf_counter()
+        result = self.decode_selection(
+            (
+                (components, solution.component_items, solution.component_slots, "component"),
+                (augments, solution.augment_items, solution.augment_slots, "augment"),
+            )
+        )
+        self.timings["decode"] = time.perf_counter() - start
+        return result
+
+    def decode_solution(self, model: ResistanceModel):
+        """Read the selected items, final resistances and armor absorption back from a solved model.
+
+        Args:
+            model (ResistanceModel): Solved model.
+
+        Returns:
+            tuple: Selected items with URLs and tags, final resistances and final armor absorption percentage.
+        """
+        return self.decode_selection(self.solution_selections(model))
+
+    def solution_selections(self, model: ResistanceModel) -> list[tuple]:
+        """Return the (candidates, item indices, slot indices, kind) chosen by a solved model, per item kind."""
+        selections = []
+        for candidates, items, slots, variables, kind in (
+            (model.components, model.component_items, model.component_slots, model.component_vars, "component"),
+            (model.augments, model.augment_items, model.augment_slots, model.augment_vars, "augment"),
+        ):
+            chosen: np.ndarray = model.selected(variables)
+            selections.append((candidates, items[chosen], slots[chosen], kind))
+        return selections
+
+    def decode_selection(self, selections):
+        """Compute the selected items, final resistances and armor absorption of a chosen assignment.
+
+        Args:
+            selections: (candidates, item indices, slot indices, kind) of the chosen components and augments.
+
+        Returns:
+            tuple: Selected items with URLs and tags, final resistances and final armor absorption percentage.
+        """
         selected_items = self.generated_selected_items_dict()
         final_resistances = self.current_resistances.copy()
         armor_absorption_percentage_gained = 0
 
-        for i, item in self.useful_components.iterrows():
-            allowed_gear_slots = [slot for slot in self.available_component_slots if item[slot]]
-            for slot in allowed_gear_slots:
-                if (
-                    (i, slot) in component_slot_vars
-                    and component_slot_vars[(i, slot)].varValue is not None
-                    and component_slot_vars[(i, slot)].varValue > 0.5
-                ):
-                    selected_items[slot]["component"] = item["Item"]
-                    armor_absorption_percentage_gained += item.get("Armor Absorption %", 0)
-                    for res in self.resistance_types:
-                        final_resistances[res] += item[res]
-
-        for i, item in self.useful_augments.iterrows():
-            allowed_gear_slots = [slot for slot in self.available_augment_slots if item[slot]]
-            for slot in allowed_gear_slots:
-                if (
-                    (i, slot) in augment_slot_vars
-                    and augment_slot_vars[(i, slot)].varValue is not None
-                    and augment_slot_vars[(i, slot)].varValue > 0.5
-                ):
-                    selected_items[slot]["augment"] = item["Item"]
-                    armor_absorption_percentage_gained += item.get("Armor Absorption %", 0)
-                    for res in self.resistance_types:
-                        final_resistances[res] += item[res]
+        for candidates, items, slots, kind in selections:
+            for i, s in zip(items.tolist(), slots.tolist()):
+                selected_items[candidates.slots[s]][kind] = candidates.names[i]
+            armor_absorption_percentage_gained += candidates.armor_abs[items].sum().item()
+            gained_resistances: np.ndarray = candidates.resistances[items].sum(axis=0)
+            for r, res in enumerate(self.resistance_types):
+                final_resistances[res] += gained_resistances[r].item()
 
         for key in selected_items:
             if key not in self.available_component_slots:
@@ -466,11 +1154,22 @@ class ResistanceOptimizer:
             if key not in self.available_augment_slots:
                 selected_items[key]["augment"] = "Slot Unavailable"
 
-        selected_items_with_urls_and_tags = self.generate_item_urls_and_tags(
-            selected_items, self.useful_components, self.useful_augments
-        )
+        selected_items_with_urls_and_tags = self.generate_item_urls_and_tags(selected_items)
 
         self.final_armor_abs_percentage = round(
             self.current_armor_abs_percentage * (1 + (armor_absorption_percentage_gained / 100)), 1
         )
         return selected_items_with_urls_and_tags, final_resistances, self.final_armor_abs_percentage
+
+
+def evaluate_slot_toggles(optimizer_kwargs: dict, toggles: list[tuple[str, str]]) -> list[dict]:
+    """Evaluate slot toggles on an optimizer of its own, in a worker process of ResistanceOptimizer.slot_sensitivity.
+
+    Args:
+        optimizer_kwargs (dict): Input arguments of ResistanceOptimizer, see INPUT_FIELDS.
+        toggles (list[tuple[str, str]]): Toggles as taken by ResistanceOptimizer.evaluate_slot_toggles.
+
+    Returns:
+        list[dict]: Rows as returned by ResistanceOptimizer.evaluate_slot_toggles.
+    """
+    return ResistanceOptimizer(**optimizer_kwargs).evaluate_slot_toggles(toggles)
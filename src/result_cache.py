@@ -0,0 +1,155 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Purge expired rows from the shared store once every this many writes
+SQLITE_PURGE_INTERVAL: int = 256
+
+
+class ResultCache:
+    """LRU/TTL cache of optimization results keyed on canonicalized optimizer inputs.
+
+    Entries live in an in-process LRU. When ``sqlite_path`` is given, entries are also
+    written to a SQLite file so that several worker processes on the same host share hits.
+    Values must be JSON serializable and are handed out as fresh copies.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, sqlite_path: str | None = None):
+        """Create the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept in process memory.
+            ttl (float): Seconds after which an entry expires.
+            sqlite_path (str | None): Optional SQLite file shared between processes.
+        """
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self.sqlite_path: str | None = sqlite_path
+
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes: int = 0
+
+        self.hits: int = 0
+        self.shared_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+        if self.sqlite_path:
+            # Not kept open: a cache created before gunicorn forks its workers must not hand them a
+            # connection inherited from the master
+            connection: sqlite3.Connection = self._connect()
+            try:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+                )
+            finally:
+                connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection = sqlite3.connect(self.sqlite_path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection to the shared store."""
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._connect()
+            self._local.connection = connection
+        return connection
+
+    def _remember(self, key: str, expires: float, payload: str) -> None:
+        """Insert an entry into the in-process LRU, evicting the least recently used one if full."""
+        self._entries[key] = (expires, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Any | None:
+        """Look up a cached result.
+
+        Args:
+            key (str): Canonical key of the optimizer inputs.
+
+        Returns:
+            Any | None: A copy of the cached value, or None on a miss.
+        """
+        now: float = time.time()
+        with self._lock:
+            entry: tuple[float, str] | None = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(entry[1])
+                del self._entries[key]
+                self.expirations += 1
+
+        if self.sqlite_path:
+            row = self._connection().execute(
+                "SELECT value, expires FROM results WHERE key = ? AND expires > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                with self._lock:
+                    self._remember(key, row[1], row[0])
+                    self.hits += 1
+                    self.shared_hits += 1
+                return json.loads(row[0])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a result.
+
+        Args:
+            key (str): Canonical key of the optimizer inputs.
+            value (Any): JSON serializable result.
+        """
+        payload: str = json.dumps(value)
+        expires: float = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, expires, payload)
+            self._writes += 1
+            purge: bool = self._writes % SQLITE_PURGE_INTERVAL == 0
+
+        if self.sqlite_path:
+            connection: sqlite3.Connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires) VALUES (?, ?, ?)", (key, payload, expires)
+            )
+            if purge:
+                connection.execute("DELETE FROM results WHERE expires <= ?", (time.time(),))
+
+    def clear(self) -> None:
+        """Drop all entries from memory and from the shared store."""
+        with self._lock:
+            self._entries.clear()
+        if self.sqlite_path:
+            self._connection().execute("DELETE FROM results")
+
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters.
+
+        Returns:
+            dict[str, int]: Hit, miss, eviction and expiration counts plus the current size.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+            }
@@ -0,0 +1,121 @@
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+import pulp
+
+logger = logging.getLogger(__name__)
+
+# "auto" prefers the in-process HiGHS backend and falls back to CBC when highspy is missing.
+# CBC stays the default: on the pruned models HiGHS' branch-and-bound is slower than the
+# process spawn it saves.
+SOLVER_BACKENDS: tuple[str, ...] = ("auto", "highs", "cbc")
+DEFAULT_SOLVER_BACKEND: str = os.environ.get("GD_SOLVER_BACKEND", "cbc")
+
+
+@lru_cache(maxsize=None)
+def highs_available() -> bool:
+    """Check whether the in-process HiGHS backend (highspy) can be used."""
+    return pulp.HiGHS(msg=False).available()
+
+
+def make_solver(
+    backend: str = DEFAULT_SOLVER_BACKEND,
+    time_limit: float | None = None,
+    mip_gap: float | None = None,
+    warm_start: bool = False,
+    log_path: str | None = None,
+    on_solution: Callable[[np.ndarray], None] | None = None,
+) -> pulp.LpSolver:
+    """Create the PuLP solver for the requested backend.
+
+    The "highs" backend drives HiGHS through its Python API inside this process, which avoids
+    the subprocess spawn and MPS/solution file round-trip of the CBC command-line backend.
+    CBC remains the fallback whenever highspy is not installed.
+
+    Args:
+        backend (str): One of SOLVER_BACKENDS.
+        time_limit (float | None): Maximum solve time in seconds, no limit if None.
+        mip_gap (float | None): Relative MIP gap at which the solver may stop. HiGHS defaults
+                                to 0 here, as its own default gap is loose enough to trade
+                                extra items against the much larger shortfall penalties.
+        warm_start (bool): Pass the current variable values to the solver as a starting solution.
+                           Only the CBC backend supports this through PuLP, HiGHS ignores it.
+        log_path (str | None): File to write the CBC log to, from which mip_bound reads the bound.
+        on_solution (Callable[[np.ndarray], None] | None): Called with the column values, indexed
+            by the ``index`` PuLP gives each variable, of every improving solution found during
+            the solve. Only HiGHS reports them, CBC runs in a subprocess and ignores it.
+
+    Returns:
+        pulp.LpSolver: Configured solver instance.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+    """
+    if backend not in SOLVER_BACKENDS:
+        raise ValueError(f"Unknown solver backend {backend!r}, expected one of {SOLVER_BACKENDS}")
+
+    if backend in ("auto", "highs"):
+        if highs_available():
+            callbacks: dict = {}
+            if on_solution is not None:
+                import highspy
+
+                def improving_solution(callback_type, message, data_out, data_in, user_data) -> None:
+                    on_solution(data_out.mip_solution)
+
+                callbacks = {
+                    "callbackTuple": (improving_solution, None),
+                    "callbacksToActivate": [highspy.cb.HighsCallbackType.kCallbackMipImprovingSolution],
+                }
+            return pulp.HiGHS(
+                msg=False, timeLimit=time_limit, gapRel=0.0 if mip_gap is None else mip_gap, **callbacks
+            )
+        if backend == "highs":
+            logger.warning("highspy is not installed, falling back to the CBC solver backend")
+
+    return pulp.PULP_CBC_CMD(msg=0, timeLimit=time_limit, gapRel=mip_gap, warmStart=warm_start, logPath=log_path)
+
+
+def solution_status(prob: pulp.LpProblem) -> str:
+    """Return the status of the last solve of a problem.
+
+    PuLP reports the best solution of a solve stopped by its time limit as "Optimal" too, such a
+    solution is reported as "Feasible" here.
+
+    Args:
+        prob (pulp.LpProblem): Problem solved by a solver of make_solver.
+
+    Returns:
+        str: PuLP status name, or "Feasible".
+    """
+    status: str = pulp.LpStatus[prob.status]
+    if status == "Optimal" and prob.sol_status == pulp.LpSolutionIntegerFeasible:
+        return "Feasible"
+    return status
+
+
+def mip_bound(prob: pulp.LpProblem, log_path: str | None = None) -> float | None:
+    """Return the lower bound on the objective proven by the last solve of a problem.
+
+    Args:
+        prob (pulp.LpProblem): Problem solved by a solver of make_solver.
+        log_path (str | None): Log file the CBC solver was created with.
+
+    Returns:
+        float | None: The bound, None if the solver did not report one.
+    """
+    solver_model = getattr(prob, "solverModel", None)
+    if solver_model is not None:
+        # HiGHS keeps its model, and the statistics of the solve, in this process
+        return float(solver_model.getInfo().mip_dual_bound)
+    if log_path is None or not os.path.exists(log_path):
+        return None
+    with open(log_path) as log:
+        content: str = log.read()
+    # CBC prints the bound in its result summary when it stops before proving optimality
+    match: re.Match | None = re.search(r"^Lower bound:\s+(\S+)", content, re.MULTILINE)
+    return float(match.group(1)) if match else None
@@ -1,162 +1,685 @@
+import json
 import os
+import queue
 import sys
+import time
+from typing import Any, Callable
 
-from flask import Flask, render_template, request, send_from_directory
+# Start of the imports below, they make up most of the cost of starting a worker
+_imports_started: float = time.perf_counter()
+
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    abort,
+    jsonify,
+    render_template,
+    request,
+    send_from_directory,
+    stream_with_context,
+    url_for,
+)
+from werkzeug.exceptions import GatewayTimeout, ServiceUnavailable
 
 sys.path.append(".")  # Adjust path to import ResistanceOptimizer module
+from src.answer_table import AnswerTable
+from src.catalog import ItemCatalog, get_catalog
+from src.optimizer_config import (
+    DEFAULT_ARMOR_ABS_PERCENTAGE,
+    DEFAULT_CHARACTER_LEVEL,
+    DEFAULT_STANDING,
+    DEFAULT_TARGET_RESISTANCE,
+    RESISTANCE_KEYS,
+    ConfigError,
+    parse_optimizer_config,
+)
 from src.resistance_optimizer import ResistanceOptimizer
+from src.result_cache import ResultCache
+from web.assets import (
+    CATALOG_NAMES_ASSET,
+    DB_LOCALE_DIR,
+    DEFAULT_OUTPUT_DIR,
+    IMMUTABLE_CACHE_CONTROL,
+    WEB_LOCALE_DIR,
+    AssetBundle,
+    catalog_names,
+    choose_encoding,
+    variant_etag,
+)
+from web.metrics import OptimizerMetrics
+from web.single_flight import SingleFlight
+from web.solver_pool import SolverBusy, SolverPool, SolverTimeout, remaining_time
+
+# Seconds spent in each phase of starting the application, see record_startup
+startup_seconds: dict[str, float] = {}
+
+# Routes of the application, registered by create_app
+routes = Blueprint("web", __name__)
+
+# Results shared by all requests of this worker, and across workers when a SQLite path is configured
+result_cache = ResultCache(
+    maxsize=int(os.environ.get("GD_RESULT_CACHE_SIZE", 1024)),
+    ttl=float(os.environ.get("GD_RESULT_CACHE_TTL", 3600)),
+    sqlite_path=os.environ.get("GD_RESULT_CACHE_PATH") or None,
+)
+
+# Precomputed answers for common profiles, built with "python -m src.answer_table", opened on first use
+answer_table = AnswerTable(os.environ.get("GD_ANSWER_TABLE_PATH", "data/answer_table.sqlite"))
+
+# Phase timings, model sizes and solver outcomes of the optimizations run by this worker
+metrics = OptimizerMetrics()
+
+
+def record_startup(phase: str, seconds: float) -> None:
+    """Report the duration of a startup phase under /api/cache-stats and /metrics."""
+    startup_seconds[phase] = seconds
+    metrics.startup_seconds.set(seconds, phase=phase)
+
+
+record_startup("imports", time.perf_counter() - _imports_started)
+
+# Solver processes of this worker, request threads wait on them so that other routes stay responsive.
+# The defaults leave 2 of the 8 gunicorn threads of the Dockerfile free of solves.
+solver_pool = SolverPool(
+    processes=int(os.environ.get("GD_SOLVER_PROCESSES", 2)),
+    queue_size=int(os.environ.get("GD_SOLVER_QUEUE", 4)),
+)
+
+# Concurrent identical solves run once; across workers when the result cache is shared through SQLite
+single_flight = SingleFlight(
+    os.environ.get("GD_SINGLE_FLIGHT_PATH")
+    or (f"{result_cache.sqlite_path}.locks" if result_cache.sqlite_path else None)
+)
+
+# Seconds a request may wait for its solves, queueing included, and the Retry-After hint sent when busy
+SOLVE_TIMEOUT: float = float(os.environ.get("GD_SOLVE_TIMEOUT", 20))
+SOLVER_RETRY_AFTER: int = int(os.environ.get("GD_SOLVER_RETRY_AFTER", 2))
+
+# Content-hashed and precompressed assets, built with "python -m web.assets"
+assets = AssetBundle(os.environ.get("GD_ASSETS_PATH", DEFAULT_OUTPUT_DIR))
 
-app = Flask(__name__)
+# Names-only catalog served when the assets are not built, by catalog version
+_catalog_names_json: dict[str, bytes] = {}
+
+
+def catalog_names_json(catalog: ItemCatalog) -> bytes:
+    """Return the names-only catalog as JSON, encoded once per catalog version."""
+    if catalog.version not in _catalog_names_json:
+        _catalog_names_json[catalog.version] = json.dumps(
+            catalog_names(catalog), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+    return _catalog_names_json[catalog.version]
+
+
+def asset_url(name: str) -> str:
+    """Return the hashed URL of a built asset, or the URL of its unprocessed source."""
+    url: str | None = assets.url(name)
+    if url is not None:
+        return url
+    if name == CATALOG_NAMES_ASSET:
+        return url_for("web.api_catalog_names")
+    return url_for("static", filename=name)
+
+
+@routes.app_context_processor
+def asset_helpers() -> dict:
+    return {
+        "asset_url": asset_url,
+        "web_locale_urls": assets.locale_urls(WEB_LOCALE_DIR),
+        "db_locale_urls": assets.locale_urls(DB_LOCALE_DIR),
+    }
+
+
+@routes.route("/assets/<path:filename>")
+def hashed_asset(filename):
+    """Serve a built asset with its best accepted precompressed encoding, cached for good."""
+    asset = assets.load(filename)
+    if asset is None:
+        abort(404)
+
+    encoding: str = choose_encoding(asset, request.accept_encodings)
+    response = Response(asset.variants[encoding], mimetype=asset.mimetype)
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    response.set_etag(variant_etag(asset, encoding))
+    return response.make_conditional(request)
+
+
+@routes.route("/api/catalog-names")
+def api_catalog_names():
+    """Item names and localization tags of both catalogs, for the blacklist dropdowns."""
+    catalog: ItemCatalog = get_catalog(ResistanceOptimizer.component_csv_path, ResistanceOptimizer.augment_csv_path)
+    response = Response(catalog_names_json(catalog), mimetype="application/json")
+    response.headers["Cache-Control"] = "no-cache"
+    response.set_etag(catalog.version)
+    return response.make_conditional(request)
 
 # Serve CSV files from sibling 'data' folder
-@app.route('/data/<path:filename>')
+@routes.route('/data/<path:filename>')
 def custom_static(filename):
     # Adjust the path below to the absolute or relative path to your 'data' folder
-    data_folder = os.path.abspath(os.path.join(app.root_path, '..', 'data'))
+    data_folder = os.path.abspath(os.path.join(routes.root_path, '..', 'data'))
     return send_from_directory(data_folder, filename)
 
-@app.route("/", methods=["GET", "POST"])
-def index():
-    selected_items_with_urls_and_tags = None
-    final_resistances = None
-    target_resistances = None
-    gap_resistances = None
-    input_data = None
-    unavailable_component_slots = None
-    unavailable_augment_slots = None
-    final_armor_abs_percentage: int = 0
-    gap_armor_abs_percentage: int = 0
-    if request.method == "POST":
-        weapon_template = request.form.get("template")
-        char_level = int(request.form.get("char-level", 100))
-        current_armor_abs_percentage = int(request.form.get("armor-abs-value", 70))
-
-        input_resistances = {
-            "Fire Resistance": int(request.form.get("current-fire") or 0),
-            "Cold Resistance": int(request.form.get("current-cold") or 0),
-            "Lightning Resistance": int(request.form.get("current-lightning") or 0),
-            "Poison & Acid Resistance": int(request.form.get("current-poison") or 0),
-            "Pierce Resistance": int(request.form.get("current-pierce") or 0),
-            "Bleeding Resistance": int(request.form.get("current-bleeding") or 0),
-            "Vitality Resistance": int(request.form.get("current-vitality") or 0),
-            "Aether Resistance": int(request.form.get("current-aether") or 0),
-            "Chaos Resistance": int(request.form.get("current-chaos") or 0),
+@routes.route("/api/cache-stats")
+def cache_stats():
+    return jsonify(
+        result_cache.stats()
+        | {
+            "answer_table": answer_table.stats(),
+            "solver_pool": solver_pool.stats(),
+            "single_flight": single_flight.stats(),
+            "startup": startup_seconds,
         }
+    )
 
-        target_resistances = {
-            "Fire Resistance": int(request.form.get("target-fire", 80)),
-            "Cold Resistance": int(request.form.get("target-cold", 80)),
-            "Lightning Resistance": int(request.form.get("target-lightning", 80)),
-            "Poison & Acid Resistance": int(request.form.get("target-poison", 80)),
-            "Pierce Resistance": int(request.form.get("target-pierce", 80)),
-            "Bleeding Resistance": int(request.form.get("target-bleeding", 80)),
-            "Vitality Resistance": int(request.form.get("target-vitality", 80)),
-            "Aether Resistance": int(request.form.get("target-aether", 80)),
-            "Chaos Resistance": int(request.form.get("target-chaos", 80)),
-        }
+@routes.app_errorhandler(SolverBusy)
+def solver_busy(error):
+    metrics.solver_rejections.inc(reason="busy")
+    if request.path.startswith("/api/"):
+        response = jsonify(error=str(error))
+        response.status_code = 503
+    else:
+        response = ServiceUnavailable(description="The optimizer is busy, please try again shortly.").get_response()
+    response.headers["Retry-After"] = str(SOLVER_RETRY_AFTER)
+    return response
 
-        # Create a dictionary for unavailable component slots
-        unavailable_component_slots = {
-            "Helm": request.form.get("component-head", "off"),
-            "Chest": request.form.get("component-chest", "off"),
-            "Shoulders": request.form.get("component-shoulder", "off"),
-            "Gloves": request.form.get("component-hand", "off"),
-            "Pants": request.form.get("component-legs", "off"),
-            "Boots": request.form.get("component-foot", "off"),
-            "Belt": request.form.get("component-belt", "off"),
-            "Amulet": request.form.get("component-amulet", "off"),
-            "Ring 1": request.form.get("component-ring1", "off"),
-            "Ring 2": request.form.get("component-ring2", "off"),
-            "Medal": request.form.get("component-medal", "off"),
-            "Weapon": request.form.get("component-weapon", "off"),
-            "Off-Hand/Shield": request.form.get("component-offhand-shield", "off"),
-        }
-        for slot, status in unavailable_component_slots.items():
-            if status == "on":
-                unavailable_component_slots[slot] = True
-            elif status == "off":
-                unavailable_component_slots[slot] = False
-
-        # Create a dictionary for unavailable augment slots
-        unavailable_augment_slots = {
-            "Helm": request.form.get("augment-head", "off"),
-            "Chest": request.form.get("augment-chest", "off"),
-            "Shoulders": request.form.get("augment-shoulder", "off"),
-            "Gloves": request.form.get("augment-hand", "off"),
-            "Pants": request.form.get("augment-legs", "off"),
-            "Boots": request.form.get("augment-foot", "off"),
-            "Belt": request.form.get("augment-belt", "off"),
-            "Amulet": request.form.get("augment-amulet", "off"),
-            "Ring 1": request.form.get("augment-ring1", "off"),
-            "Ring 2": request.form.get("augment-ring2", "off"),
-            "Medal": request.form.get("augment-medal", "off"),
-            "Weapon": request.form.get("augment-weapon", "off"),
-            "Off-Hand/Shield": request.form.get("augment-offhand-shield", "off"),
-        }
-        for slot, status in unavailable_augment_slots.items():
-            if status == "on":
-                unavailable_augment_slots[slot] = True
-            elif status == "off":
-                unavailable_augment_slots[slot] = False
-
-        player_faction_standings = {
-            "Devil's Crossing": request.form.get("standing-crossing", "Revered"),
-            "Rovers": request.form.get("standing-rovers", "Revered"),
-            "Homestead": request.form.get("standing-homestead", "Revered"),
-            "Kymon's Chosen": request.form.get("standing-kymon", "Revered"),
-            "Order of Death's Vigil": request.form.get("standing-order", "Revered"),
-            "The Black Legion": request.form.get("standing-black-legion", "Revered"),
-            "The Outcast": request.form.get("standing-outcast", "Revered"),
-            "Coven of Ugdenbog": request.form.get("standing-coven", "Revered"),
-            "Barrowholm": request.form.get("standing-barrowholm", "Revered"),
-            "Malmouth Resistance": request.form.get("standing-malmouth", "Revered"),
-            "Cult of Bysmiel": request.form.get("standing-bysmiel", "Revered"),
-            "Cult of Dreeg": request.form.get("standing-dreeg", "Revered"),
-            "Cult of Solael": request.form.get("standing-solael", "Revered"),
-            "Kurn": request.form.get("standing-kurn", "Revered"),
+@routes.app_errorhandler(SolverTimeout)
+def solver_timeout(error):
+    metrics.solver_rejections.inc(reason="timeout")
+    if request.path.startswith("/api/"):
+        return jsonify(error=str(error)), 504
+    return GatewayTimeout(description="The optimization took too long, please try again.").get_response()
+
+@routes.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+# Form field suffixes of the blockable slots and the faction standing dropdowns
+SLOT_FORM_FIELDS: dict[str, str] = {
+    "Helm": "head",
+    "Chest": "chest",
+    "Shoulders": "shoulder",
+    "Gloves": "hand",
+    "Pants": "legs",
+    "Boots": "foot",
+    "Belt": "belt",
+    "Amulet": "amulet",
+    "Ring 1": "ring1",
+    "Ring 2": "ring2",
+    "Medal": "medal",
+    "Weapon": "weapon",
+    "Off-Hand/Shield": "offhand-shield",
+}
+
+FACTION_FORM_FIELDS: dict[str, str] = {
+    "Devil's Crossing": "standing-crossing",
+    "Rovers": "standing-rovers",
+    "Homestead": "standing-homestead",
+    "Kymon's Chosen": "standing-kymon",
+    "Order of Death's Vigil": "standing-order",
+    "The Black Legion": "standing-black-legion",
+    "The Outcast": "standing-outcast",
+    "Coven of Ugdenbog": "standing-coven",
+    "Barrowholm": "standing-barrowholm",
+    "Malmouth Resistance": "standing-malmouth",
+    "Cult of Bysmiel": "standing-bysmiel",
+    "Cult of Dreeg": "standing-dreeg",
+    "Cult of Solael": "standing-solael",
+    "Kurn": "standing-kurn",
+}
+
+# Maximum number of character configurations accepted in one API request
+API_MAX_BATCH: int = int(os.environ.get("GD_API_MAX_BATCH", 32))
+
+# Maximum number of alternative loadouts per configuration, and the time limit in seconds of each of their solves
+API_MAX_ALTERNATIVES: int = int(os.environ.get("GD_API_MAX_ALTERNATIVES", 10))
+API_ALTERNATIVES_TIME_LIMIT: float = float(os.environ.get("GD_API_ALTERNATIVES_TIME_LIMIT", 2))
+
+# Processes each slot sensitivity report is spread over, on top of the solver process running it
+API_SENSITIVITY_WORKERS: int = int(os.environ.get("GD_API_SENSITIVITY_WORKERS", 1))
+
+# Largest time budget in seconds of an anytime solve, and the budget of the solves streamed to the page.
+# Solvers may overrun their budget by the time they take to stop, keep it well below GD_SOLVE_TIMEOUT.
+API_MAX_TIME_BUDGET: float = float(os.environ.get("GD_API_MAX_TIME_BUDGET", 10))
+PAGE_TIME_BUDGET: float = float(os.environ.get("GD_PAGE_TIME_BUDGET", 5))
+
+# Seconds after which an event stream without a new loadout sends a comment, so that proxies keep it open
+STREAM_KEEPALIVE: float = 5
+
+
+def config_from_form(form) -> dict:
+    """Translate the submitted HTML form into an optimizer configuration.
+
+    Args:
+        form (ImmutableMultiDict): Submitted form fields.
+
+    Returns:
+        dict: Configuration in the schema accepted by parse_optimizer_config.
+
+    Raises:
+        ConfigError: If a numeric field is not a number.
+    """
+    try:
+        config = {
+            "character_level": int(form.get("char-level") or DEFAULT_CHARACTER_LEVEL),
+            "armor_absorption": int(form.get("armor-abs-value") or DEFAULT_ARMOR_ABS_PERCENTAGE),
+            "current_resistances": {
+                key: int(form.get(f"current-{key}") or 0) for key in RESISTANCE_KEYS
+            },
+            "target_resistances": {
+                key: int(form.get(f"target-{key}") or DEFAULT_TARGET_RESISTANCE) for key in RESISTANCE_KEYS
+            },
         }
+    except ValueError as error:
+        raise ConfigError(f"invalid number in form: {error}") from error
+
+    if form.get("template"):
+        config["weapon_template"] = form.get("template")
+
+    # Checked slot checkboxes are submitted as "on"
+    config["unavailable_component_slots"] = [
+        slot for slot, field in SLOT_FORM_FIELDS.items() if form.get(f"component-{field}") == "on"
+    ]
+    config["unavailable_augment_slots"] = [
+        slot for slot, field in SLOT_FORM_FIELDS.items() if form.get(f"augment-{field}") == "on"
+    ]
+
+    config["faction_standings"] = {
+        faction: form.get(field, DEFAULT_STANDING) for faction, field in FACTION_FORM_FIELDS.items()
+    }
+    config["component_blacklist"] = form.getlist('component_blacklist[]')
+    config["augment_blacklist"] = form.getlist('augment_blacklist[]')
+    return config
+
 
-        component_blacklist = request.form.getlist('component_blacklist[]')
-        augment_blacklist = request.form.getlist('augment_blacklist[]')
-
-        # Consolidate input data for enabling persistance on the frontend
-        input_data = {}
-        input_data["Character Level"] = char_level
-        input_data["weapon_template"] = weapon_template
-        input_data.update(input_resistances)
-        input_data.update(player_faction_standings)
-
-        optimizer = ResistanceOptimizer(
-            character_level=char_level,
-            current_armor_abs_percentage=current_armor_abs_percentage,
-            current_resistances=input_resistances,
-            target_resistances=target_resistances,
-            weapon_template=weapon_template,
-            unavailable_component_slots=unavailable_component_slots,
-            unavailable_augment_slots=unavailable_augment_slots,
-            component_blacklist=component_blacklist,
-            augment_blacklist=augment_blacklist,
-            player_faction_standings=player_faction_standings,
+def run_optimizer(
+    optimizer_kwargs: dict,
+    alternatives: int = 0,
+    deadline: float | None = None,
+    frontier: bool = False,
+    sensitivity: bool = False,
+    time_budget: float | None = None,
+) -> dict:
+    """Run one optimization on the solver pool and summarize its outcome.
+
+    Args:
+        optimizer_kwargs (dict): Keyword arguments for ResistanceOptimizer.
+        alternatives (int): Number of distinct loadouts to return under "alternatives", 0 for none.
+        deadline (float | None): time.monotonic() by which the solve must finish, no limit if None.
+        frontier (bool): Whether to return the best loadout of every item budget under "frontier".
+        sensitivity (bool): Whether to return the shortfall change of toggling each slot under "sensitivity".
+        time_budget (float | None): Seconds to search for, returning the best loadout found with its
+                                    proven "gap", None to solve to optimality.
+
+    Returns:
+        dict: Selected items, final resistances and armor absorption along with the remaining gaps.
+
+    Raises:
+        SolverBusy: If the solver pool is full.
+        SolverTimeout: If the solve does not finish before the deadline.
+    """
+    if frontier:
+        optimizer = ResistanceOptimizer(**optimizer_kwargs)
+        points, optimizer.timings, optimizer.model_stats, optimizer.solver_status = solver_pool.solve(
+            optimizer_kwargs, "optimize_frontier", time_limit=SOLVE_TIMEOUT, timeout=remaining_time(deadline)
         )
-        selected_items_with_urls_and_tags, final_resistances, final_armor_abs_percentage = optimizer.optimize_resistances()
+        metrics.observe_optimizer(optimizer, solved=bool(points))
+        # The point with the most items is the regular result
+        summary = dict(points[-1]) if points else {"status": "infeasible"}
+        summary["frontier"] = points
+        return summary
 
-        # Calculate the resistance gaps if any after optimization
-        gap_resistances = {
-            res: max(0, target_resistances[res] - final_resistances[res])
-            for res in optimizer.resistance_types
-        }
-        gap_armor_abs_percentage=int(max(100 - final_armor_abs_percentage, 0))
-
-    return render_template(
-        "index.html",
-        target_resistances=target_resistances,
-        results=selected_items_with_urls_and_tags,
-        final_resistances=final_resistances,
-        gap_resistances=gap_resistances,
-        final_armor_abs_percentage=int(final_armor_abs_percentage),
-        gap_armor_abs_percentage=gap_armor_abs_percentage,
+    if sensitivity:
+        optimizer = ResistanceOptimizer(**optimizer_kwargs)
+        report, optimizer.timings, optimizer.model_stats, optimizer.solver_status = solver_pool.solve(
+            optimizer_kwargs,
+            "slot_sensitivity",
+            (API_SENSITIVITY_WORKERS,),
+            time_limit=SOLVE_TIMEOUT,
+            timeout=remaining_time(deadline),
+        )
+        metrics.observe_optimizer(optimizer, solved=report["base"] is not None)
+        summary = dict(report["base"]) if report["base"] is not None else {"status": "infeasible"}
+        summary["sensitivity"] = report["slots"]
+        return summary
+
+    if time_budget is not None:
+        optimizer = ResistanceOptimizer(**optimizer_kwargs, result_cache=result_cache, answer_table=answer_table)
+        # Stored results are optimal, they need no budget
+        stored = optimizer.lookup_result()
+        if stored is not None:
+            summary = optimizer.summarize(*stored) | {"gap": 0.0}
+        else:
+            summary, optimizer.timings, optimizer.model_stats, optimizer.solver_status = solver_pool.solve(
+                optimizer_kwargs,
+                "optimize_anytime",
+                (time_budget,),
+                time_limit=time_budget,
+                timeout=remaining_time(deadline),
+            )
+        metrics.observe_optimizer(optimizer, solved=summary["status"] != "infeasible")
+        return summary
+
+    if not alternatives:
+        optimizer = ResistanceOptimizer(**optimizer_kwargs, result_cache=result_cache, answer_table=answer_table)
+        # Stored results are answered in the request thread without touching the pool
+        result = optimizer.lookup_result()
+        if result is None:
+
+            def solve():
+                # Only optimal results are cached, a solve stopped by the time limit may do better on a retry
+                solved, optimizer.timings, optimizer.model_stats, optimizer.solver_status = solver_pool.solve(
+                    optimizer_kwargs, time_limit=SOLVE_TIMEOUT, timeout=remaining_time(deadline)
+                )
+                optimizer.store_result(solved)
+                return solved
+
+            # Identical requests in flight share one solve
+            result, shared = single_flight.run(optimizer.cache_key(), solve, optimizer.lookup_result, deadline)
+            if shared is not None:
+                optimizer.solver_status = "coalesced"
+                metrics.coalesced_requests.inc(scope=shared)
+        summary: dict = optimizer.summarize(*result)
+        metrics.observe_optimizer(optimizer, solved=summary["status"] != "infeasible")
+        return summary
+
+    optimizer = ResistanceOptimizer(**optimizer_kwargs, solver_time_limit=API_ALTERNATIVES_TIME_LIMIT)
+    loadouts, optimizer.timings, optimizer.model_stats, optimizer.solver_status = solver_pool.solve(
+        optimizer_kwargs,
+        "optimize_alternatives",
+        (alternatives,),
+        time_limit=API_ALTERNATIVES_TIME_LIMIT,
+        timeout=remaining_time(deadline),
     )
+    metrics.observe_optimizer(optimizer, solved=bool(loadouts))
+    # The best loadout doubles as the regular result
+    summary = dict(loadouts[0]) if loadouts else {"status": "infeasible"}
+    summary["alternatives"] = loadouts
+    return summary
+
+
+def parse_time_budget(value: str | None) -> float | None:
+    """Read the time_budget query argument.
+
+    Args:
+        value (str | None): Argument value, None if it was not given.
+
+    Returns:
+        float | None: Seconds to search for, None if not given.
+
+    Raises:
+        ValueError: If it is not a number of seconds between 0 and API_MAX_TIME_BUDGET.
+    """
+    if value is None:
+        return None
+    try:
+        time_budget: float = float(value)
+    except ValueError:
+        time_budget = float("nan")
+    if not 0 < time_budget <= API_MAX_TIME_BUDGET:
+        raise ValueError(f"time_budget must be a number of seconds between 0 and {API_MAX_TIME_BUDGET:g}")
+    return time_budget
+
+
+def server_sent_event(event: str, data: Any) -> str:
+    """Format one server-sent event carrying JSON data."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def stream_optimizer(optimizer_kwargs: dict, time_budget: float, render: Callable[[dict], Any],
+                     endpoint: str) -> Response:
+    """Run an anytime solve on the solver pool and stream its loadouts as server-sent events.
+
+    Every loadout that improves on the previous ones is sent as an "incumbent" event as soon as the
+    solver process finds it, and the outcome of optimize_anytime as a "result" event. Stored
+    results are sent as the result straight away. A solve that exceeds GD_SOLVE_TIMEOUT ends the
+    stream with an "error" event.
+
+    Args:
+        optimizer_kwargs (dict): Keyword arguments for ResistanceOptimizer.
+        time_budget (float): Seconds to search for.
+        render (Callable[[dict], Any]): Turns a summary as returned by optimize_anytime into the
+                                        JSON data of its event.
+        endpoint (str): Name of the endpoint in the request metrics.
+
+    Returns:
+        Response: The event stream.
+
+    Raises:
+        SolverBusy: If the solver pool is full, before anything is streamed.
+    """
+    started: float = time.perf_counter()
+    deadline: float = time.monotonic() + SOLVE_TIMEOUT
+    optimizer = ResistanceOptimizer(**optimizer_kwargs, result_cache=result_cache, answer_table=answer_table)
+    stored = optimizer.lookup_result()
+    # Improving loadouts as the solver process reports them, then None once the solve is over
+    incumbents: queue.SimpleQueue = queue.SimpleQueue()
+    future = None
+    if stored is None:
+        future = solver_pool.submit(
+            optimizer_kwargs, "optimize_anytime", (time_budget,), time_limit=time_budget, on_progress=incumbents.put
+        )
+        future.add_done_callback(lambda _: incumbents.put(None))
+
+    def events():
+        if stored is not None:
+            summary: dict = optimizer.summarize(*stored) | {"gap": 0.0}
+        else:
+            while True:
+                try:
+                    incumbent: dict | None = incumbents.get(timeout=min(STREAM_KEEPALIVE, remaining_time(deadline)))
+                except queue.Empty:
+                    if remaining_time(deadline) == 0.0:
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if incumbent is None:
+                    break
+                yield server_sent_event("incumbent", render(incumbent))
+            try:
+                summary, optimizer.timings, optimizer.model_stats, optimizer.solver_status = solver_pool.wait(
+                    future, remaining_time(deadline)
+                )
+            except SolverTimeout as error:
+                metrics.solver_rejections.inc(reason="timeout")
+                yield server_sent_event("error", {"error": str(error)})
+                return
+        metrics.observe_optimizer(optimizer, solved=summary["status"] != "infeasible")
+        metrics.request_seconds.observe(time.perf_counter() - started, endpoint=endpoint, stage="optimize")
+        yield server_sent_event("result", render(summary))
+
+    response = Response(stream_with_context(events()), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    # Keep reverse proxies such as nginx from buffering the events
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+@routes.route("/api/optimize", methods=["POST"])
+def api_optimize():
+    """Optimize one configuration, or a batch of them given as {"configs": [...]}, from a JSON body.
+
+    With ``?alternatives=K``, every result also lists up to K loadouts that differ in the items
+    they use, best first, each with its objective value and gaps. With ``?frontier=1``, every
+    result lists under "frontier" the loadouts with the least shortfall for each number of items,
+    fewest items first, each with its "item_count", "resistance_shortfall" and "armor_shortfall".
+    With ``?sensitivity=1``, every result lists under "sensitivity" one row per component and
+    augment slot, giving the shortfall after blocking the slot, or freeing it if it is blocked, and
+    the change from the result itself. With ``?time_budget=S``, every configuration is searched
+    for at most S seconds: a "feasible" result is the best loadout found by then, with the lower
+    "bound" on its "objective" proven by the solver and their relative "gap".
+    Answers 503 with Retry-After when the solver pool is full and 504 when the solves exceed
+    GD_SOLVE_TIMEOUT.
+    """
+    alternatives: str = request.args.get("alternatives", "0")
+    if not alternatives.isdecimal() or int(alternatives) > API_MAX_ALTERNATIVES:
+        return jsonify(error=f"alternatives must be an integer between 0 and {API_MAX_ALTERNATIVES}"), 400
+    frontier: str = request.args.get("frontier", "0")
+    if frontier not in ("0", "1"):
+        return jsonify(error="frontier must be 0 or 1"), 400
+    sensitivity: str = request.args.get("sensitivity", "0")
+    if sensitivity not in ("0", "1"):
+        return jsonify(error="sensitivity must be 0 or 1"), 400
+    try:
+        time_budget: float | None = parse_time_budget(request.args.get("time_budget"))
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    if (frontier == "1") + (sensitivity == "1") + (int(alternatives) > 0) + (time_budget is not None) > 1:
+        return jsonify(error="alternatives, frontier, sensitivity and time_budget cannot be combined"), 400
+
+    payload = request.get_json(silent=True)
+    batch: bool = isinstance(payload, dict) and "configs" in payload and len(payload) == 1
+    configs = payload["configs"] if batch else [payload]
+
+    if not isinstance(configs, list) or not configs:
+        return jsonify(error="configs must be a non-empty list"), 400
+    if len(configs) > API_MAX_BATCH:
+        return jsonify(error=f"at most {API_MAX_BATCH} configs per request"), 400
+
+    # Validate the whole batch before spending time on any solve
+    optimizer_kwargs: list[dict] = []
+    for index, config in enumerate(configs):
+        try:
+            optimizer_kwargs.append(parse_optimizer_config(config))
+        except ConfigError as error:
+            return jsonify(error=str(error), index=index), 400
+
+    # The whole batch shares one deadline
+    deadline: float = time.monotonic() + SOLVE_TIMEOUT
+    start: float = time.perf_counter()
+    results: list[dict] = [
+        run_optimizer(kwargs, int(alternatives), deadline, frontier == "1", sensitivity == "1", time_budget)
+        for kwargs in optimizer_kwargs
+    ]
+    metrics.request_seconds.observe(time.perf_counter() - start, endpoint="api_optimize", stage="optimize")
+    return jsonify(results=results) if batch else jsonify(results[0])
+
+
+@routes.route("/api/optimize/stream", methods=["POST"])
+def api_optimize_stream():
+    """Stream the loadouts found for one configuration from a JSON body as server-sent events.
+
+    Searches for ``?time_budget=S`` seconds, GD_API_MAX_TIME_BUDGET by default. Every improving
+    loadout is sent as an "incumbent" event, a summary as returned by /api/optimize with its
+    "objective", and the outcome as a "result" event, as returned by /api/optimize with
+    ``?time_budget``. Answers 503 with Retry-After when the solver pool is full.
+    """
+    try:
+        time_budget: float = parse_time_budget(request.args.get("time_budget", str(API_MAX_TIME_BUDGET)))
+        optimizer_kwargs: dict = parse_optimizer_config(request.get_json(silent=True))
+    except ValueError as error:
+        return jsonify(error=str(error)), 400
+    return stream_optimizer(optimizer_kwargs, time_budget, lambda summary: summary, "api_optimize_stream")
+
+
+def results_context(result: dict) -> dict:
+    """Return the variables of the results.html template for a summary of run_optimizer."""
+    return {
+        "status": result.get("status"),
+        "gap": result.get("gap"),
+        "results": result.get("items"),
+        "final_resistances": result.get("final_resistances"),
+        "gap_resistances": result.get("gap_resistances"),
+        "final_armor_abs_percentage": int(result.get("final_armor_absorption", 0)),
+        "gap_armor_abs_percentage": result.get("gap_armor_absorption", 0),
+    }
+
+
+@routes.route("/", methods=["GET", "POST"])
+def index():
+    target_resistances = None
+    result: dict = {}
+    if request.method == "POST":
+        try:
+            optimizer_kwargs = parse_optimizer_config(config_from_form(request.form))
+        except ConfigError as error:
+            abort(400, description=str(error))
+
+        target_resistances = optimizer_kwargs["target_resistances"]
+        start: float = time.perf_counter()
+        result = run_optimizer(optimizer_kwargs, deadline=time.monotonic() + SOLVE_TIMEOUT)
+        metrics.request_seconds.observe(time.perf_counter() - start, endpoint="index", stage="optimize")
+
+    start = time.perf_counter()
+    page: str = render_template("index.html", target_resistances=target_resistances, **results_context(result))
+    metrics.request_seconds.observe(time.perf_counter() - start, endpoint="index", stage="render")
+    return page
+
+
+@routes.route("/stream", methods=["POST"])
+def stream_index():
+    """Stream the results section of the page for the submitted form as server-sent events.
+
+    The page script replaces its results with the "html" of every event, so the best loadout found
+    so far shows up while the solver keeps searching for up to GD_PAGE_TIME_BUDGET seconds.
+    """
+    try:
+        optimizer_kwargs = parse_optimizer_config(config_from_form(request.form))
+    except ConfigError as error:
+        abort(400, description=str(error))
+
+    def render(summary: dict) -> dict:
+        # Incumbents are sent while the search goes on, only the result carries its proven gap
+        html: str = render_template(
+            "results.html",
+            target_resistances=optimizer_kwargs["target_resistances"],
+            searching="gap" not in summary,
+            **results_context(summary),
+        )
+        return {"status": summary["status"], "html": html}
+
+    return stream_optimizer(optimizer_kwargs, PAGE_TIME_BUDGET, render, "stream_index")
+
+
+def preload(app: Flask) -> None:
+    """Load what the first requests would otherwise load, recording the time of each phase.
+
+    Args:
+        app (Flask): Application whose templates to compile.
+    """
+    start: float = time.perf_counter()
+    catalog: ItemCatalog = get_catalog(ResistanceOptimizer.component_csv_path, ResistanceOptimizer.augment_csv_path)
+    record_startup("catalog", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for entry in assets.manifest.values():
+        assets.load(entry["file"])
+    if assets.url(CATALOG_NAMES_ASSET) is None:
+        catalog_names_json(catalog)
+    record_startup("assets", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for template in ("index.html", "results.html", "button_language.html"):
+        app.jinja_env.get_template(template)
+    record_startup("templates", time.perf_counter() - start)
+
+
+def create_app(preload_data: bool = True) -> Flask:
+    """Create the web application.
+
+    Run by gunicorn with preload_app (see gunicorn.conf.py), the application is created once in
+    the master process, before the workers are forked: the workers start ready to serve and share
+    the memory-mapped catalog and the imported modules copy-on-write.
+
+    Args:
+        preload_data (bool): Whether to load the catalog, the asset manifest and the templates now
+                             rather than on first use.
+
+    Returns:
+        Flask: The application.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(routes)
+    if preload_data:
+        preload(app)
+    return app
+
 
+app = create_app()
 
 if __name__ == "__main__":
     app.run(debug=True)
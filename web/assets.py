@@ -0,0 +1,268 @@
+"""Build and serve the static assets of the web interface.
+
+Usage:
+    python -m web.assets [-o web/static/dist]
+
+The build writes every asset under a content-hashed file name, along with gzip and, when the
+brotli package is installed, brotli encoded copies, and a manifest mapping asset names onto those
+files. Besides the stylesheets and scripts it generates:
+
+- ``catalog-names.json``, the names and localization tags of all items for the blacklist dropdowns;
+- ``js/db/<lang>.js``, the item localization dictionaries reduced to the tags of the catalog.
+
+Hashed files never change, so they are served with an immutable cache lifetime and strong ETags.
+Without a build, asset_url falls back to the unprocessed files under /static.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from src.catalog import ItemCatalog, ItemTable, get_catalog
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are optional, gzip ones are always built
+    brotli = None
+
+STATIC_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DEFAULT_OUTPUT_DIR: str = os.path.join(STATIC_DIR, "dist")
+MANIFEST_NAME: str = "manifest.json"
+
+# Assets copied from the static folder as they are
+STATIC_ASSETS: tuple[str, ...] = ("styles.css", "button_language.css", "index.js")
+# Localization folders, the db dictionaries are keyed on item tags and filtered to the catalog
+WEB_LOCALE_DIR: str = "js/web"
+DB_LOCALE_DIR: str = "js/db"
+# Translation template in the web locale folder, not a language
+LOCALE_TEMPLATE: str = "example.js"
+
+CATALOG_NAMES_ASSET: str = "catalog-names.json"
+
+# Content-Encoding of every precompressed variant and the suffix of its file, preferred first
+ENCODING_SUFFIXES: dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+IMMUTABLE_CACHE_CONTROL: str = "public, max-age=31536000, immutable"
+
+
+def catalog_names(catalog: ItemCatalog) -> dict[str, list[dict[str, str]]]:
+    """Return the item names and localization tags of both tables, in catalog order."""
+
+    def names(table: ItemTable) -> list[dict[str, str]]:
+        return [
+            {"item": str(name), "tag": tag if isinstance(tag, str) else ""}
+            for name, tag in zip(table.names, table.tags)
+        ]
+
+    return {"components": names(catalog.components), "augments": names(catalog.augments)}
+
+
+def catalog_tags(catalog: ItemCatalog) -> set[str]:
+    """Return every localization tag referenced by the catalog."""
+    return {tag for table in (catalog.components, catalog.augments) for tag in table.tags if isinstance(tag, str)}
+
+
+def filter_locale_script(source: str, tags: set[str]) -> str:
+    """Reduce a ``db_l10n_texts['<lang>'] = {...};`` dictionary script to the given tags.
+
+    Args:
+        source (str): Script assigning a JSON object literal.
+        tags (set[str]): Tags to keep.
+
+    Returns:
+        str: Equivalent script holding only the kept tags.
+    """
+    start: int = source.index("{")
+    end: int = source.rindex("}") + 1
+    texts: dict[str, str] = json.loads(source[start:end])
+    kept: dict[str, str] = {tag: text for tag, text in texts.items() if tag in tags}
+    return source[:start] + json.dumps(kept, ensure_ascii=False, separators=(",", ":")) + source[end:]
+
+
+def _hashed_name(name: str, digest: str) -> str:
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{digest}{extension}"
+
+
+def _write_asset(output_dir: str, name: str, content: bytes) -> dict[str, Any]:
+    digest: str = hashlib.sha256(content).hexdigest()[:16]
+    file_name: str = _hashed_name(name, digest)
+    path: str = os.path.join(output_dir, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    variants: dict[str, bytes] = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+
+    with open(path, "wb") as asset:
+        asset.write(content)
+    encodings: list[str] = []
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+        # Variants that do not save anything are left out, the identity file is served instead
+        if encoding in variants and len(variants[encoding]) < len(content):
+            with open(path + suffix, "wb") as asset:
+                asset.write(variants[encoding])
+            encodings.append(encoding)
+    return {"file": file_name, "etag": digest, "size": len(content), "encodings": encodings}
+
+
+def build_assets(catalog: ItemCatalog, output_dir: str = DEFAULT_OUTPUT_DIR) -> dict[str, dict[str, Any]]:
+    """Write the hashed and precompressed assets and their manifest.
+
+    The output directory is replaced, so that files of earlier builds do not accumulate.
+
+    Args:
+        catalog (ItemCatalog): Catalog whose names and tags the generated assets hold.
+        output_dir (str): Directory to write.
+
+    Returns:
+        dict[str, dict[str, Any]]: The manifest entries, by asset name.
+    """
+    sources: dict[str, bytes] = {}
+    for name in STATIC_ASSETS:
+        with open(os.path.join(STATIC_DIR, name), "rb") as source:
+            sources[name] = source.read()
+    for file_name in sorted(os.listdir(os.path.join(STATIC_DIR, WEB_LOCALE_DIR))):
+        if file_name.endswith(".js") and file_name != LOCALE_TEMPLATE:
+            with open(os.path.join(STATIC_DIR, WEB_LOCALE_DIR, file_name), "rb") as source:
+                sources[f"{WEB_LOCALE_DIR}/{file_name}"] = source.read()
+
+    tags: set[str] = catalog_tags(catalog)
+    for file_name in sorted(os.listdir(os.path.join(STATIC_DIR, DB_LOCALE_DIR))):
+        if file_name.endswith(".js"):
+            with open(os.path.join(STATIC_DIR, DB_LOCALE_DIR, file_name), encoding="utf-8") as source:
+                sources[f"{DB_LOCALE_DIR}/{file_name}"] = filter_locale_script(source.read(), tags).encode("utf-8")
+
+    sources[CATALOG_NAMES_ASSET] = json.dumps(
+        catalog_names(catalog), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.makedirs(output_dir)
+    manifest: dict[str, dict[str, Any]] = {
+        name: _write_asset(output_dir, name, content) for name, content in sources.items()
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+    return manifest
+
+
+@dataclass
+class _LoadedAsset:
+    """Bytes of one built asset, by Content-Encoding ("identity" for the raw file)."""
+
+    etag: str
+    mimetype: str
+    variants: dict[str, bytes]
+
+
+class AssetBundle:
+    """Built assets of a dist directory, read once and kept in memory.
+
+    The manifest is read on first use; a missing manifest means assets are not built and every
+    URL falls back to the unprocessed static files.
+    """
+
+    def __init__(self, directory: str = DEFAULT_OUTPUT_DIR, url_prefix: str = "/assets"):
+        """Create the bundle.
+
+        Args:
+            directory (str): Build output directory holding the manifest.
+            url_prefix (str): URL path the hashed files are served under.
+        """
+        self.directory: str = directory
+        self.url_prefix: str = url_prefix
+        self._manifest: dict[str, dict[str, Any]] | None = None
+        self._files: dict[str, str] = {}
+        self._loaded: dict[str, _LoadedAsset] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def manifest(self) -> dict[str, dict[str, Any]]:
+        if self._manifest is None:
+            try:
+                with open(os.path.join(self.directory, MANIFEST_NAME), encoding="utf-8") as manifest_file:
+                    manifest: dict[str, dict[str, Any]] = json.load(manifest_file)
+            except (OSError, ValueError):
+                manifest = {}
+            self._files = {entry["file"]: name for name, entry in manifest.items()}
+            self._manifest = manifest
+        return self._manifest
+
+    def url(self, name: str) -> str | None:
+        """Return the content-hashed URL of an asset, None if it is not built."""
+        entry: dict[str, Any] | None = self.manifest.get(name)
+        return None if entry is None else f"{self.url_prefix}/{entry['file']}"
+
+    def locale_urls(self, folder: str) -> dict[str, str]:
+        """Return the hashed URLs of the localization scripts of a folder, by language."""
+        prefix: str = folder + "/"
+        return {
+            name[len(prefix) : -len(".js")]: self.url(name)
+            for name in self.manifest
+            if name.startswith(prefix) and name.endswith(".js")
+        }
+
+    def load(self, file_name: str) -> _LoadedAsset | None:
+        """Return the bytes of a hashed file and its encoded variants, None if it is unknown."""
+        if file_name not in self._loaded:
+            name: str | None = self._files.get(file_name) if self.manifest else None
+            if name is None:
+                return None
+            entry: dict[str, Any] = self.manifest[name]
+            path: str = os.path.join(self.directory, file_name)
+            variants: dict[str, bytes] = {}
+            for encoding in ["identity", *entry["encodings"]]:
+                with open(path + ENCODING_SUFFIXES.get(encoding, ""), "rb") as asset:
+                    variants[encoding] = asset.read()
+            mimetype: str = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            with self._lock:
+                self._loaded[file_name] = _LoadedAsset(entry["etag"], mimetype, variants)
+        return self._loaded[file_name]
+
+
+def choose_encoding(asset: _LoadedAsset, accept_encodings) -> str:
+    """Pick the preferred precompressed variant the client accepts, "identity" if there is none.
+
+    Args:
+        asset (_LoadedAsset): Asset to serve.
+        accept_encodings (werkzeug.datastructures.Accept): Parsed Accept-Encoding header.
+
+    Returns:
+        str: Key into ``asset.variants``.
+    """
+    for encoding in ENCODING_SUFFIXES:
+        if encoding in asset.variants and accept_encodings[encoding] > 0:
+            return encoding
+    return "identity"
+
+
+def variant_etag(asset: _LoadedAsset, encoding: str) -> str:
+    """Return the strong ETag of one encoding of an asset, distinct per encoding."""
+    return asset.etag if encoding == "identity" else f"{asset.etag}-{encoding}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the hashed and precompressed web assets.")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_DIR, help="Directory to write")
+    parser.add_argument("--component-csv", default="data/component_data.csv")
+    parser.add_argument("--augment-csv", default="data/augment_data.csv")
+    args = parser.parse_args()
+
+    manifest: dict[str, dict[str, Any]] = build_assets(get_catalog(args.component_csv, args.augment_csv), args.output)
+    for name, entry in sorted(manifest.items()):
+        print(f"{name}: {entry['file']} ({entry['size']} bytes, {', '.join(entry['encodings']) or 'uncompressed'})",
+              file=sys.stderr)
+    if brotli is None:
+        print("brotli is not installed, only gzip variants were written", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# Upper bounds in seconds of the latency histogram buckets, from sub-millisecond cache hits to slow solves
+DEFAULT_TIME_BUCKETS: tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Upper bounds of the model size histogram buckets
+DEFAULT_SIZE_BUCKETS: tuple[float, ...] = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    escaped: list[str] = []
+    for name, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{name}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name: str = name
+        self.documentation: str = documentation
+        self._values: defaultdict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key: tuple = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] += amount
+
+    def render(self) -> list[str]:
+        lines: list[str] = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+
+class Gauge:
+    """Value that is set rather than accumulated, optionally split by labels."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name: str = name
+        self.documentation: str = documentation
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels: str) -> None:
+        key: tuple = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> list[str]:
+        lines: list[str] = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, optionally split by labels."""
+
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...] = DEFAULT_TIME_BUCKETS):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # Per label set: observation count per bucket (the last one being +Inf), and the sum
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: defaultdict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key: tuple = tuple(sorted(labels.items()))
+        index: int = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts: list[int] = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] += value
+
+    def render(self) -> list[str]:
+        lines: list[str] = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, counts in sorted(self._counts.items()):
+                cumulative: int = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    le: str = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {self._sums[labels]:g}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class OptimizerMetrics:
+    """Aggregates the phase timings, model sizes and outcomes of optimizer runs of this process.
+
+    Every gunicorn worker keeps its own metrics, scrape each worker or sum them downstream.
+    """
+
+    def __init__(self):
+        self.phase_seconds = Histogram(
+            "gdro_optimizer_phase_seconds", "Time spent in each optimizer phase (load, filter, build, solve, decode)."
+        )
+        self.model_size = Histogram(
+            "gdro_optimizer_model_size", "Number of variables and constraints of built models.", DEFAULT_SIZE_BUCKETS
+        )
+        self.solver_status = Counter(
+            "gdro_optimizer_status_total", 'Optimizations by outcome, "cached" for result cache hits, "coalesced" for shared in-flight solves.'
+        )
+        self.none_results = Counter(
+            "gdro_optimizer_none_results_total", "Optimizations for which optimize_resistances returned no solution."
+        )
+        self.none_results.inc(0)
+        self.request_seconds = Histogram(
+            "gdro_request_seconds", "Time spent handling requests, by endpoint and stage."
+        )
+        self.solver_rejections = Counter(
+            "gdro_solver_rejections_total", 'Solves refused by the solver pool, "busy" or "timeout".'
+        )
+        self.coalesced_requests = Counter(
+            "gdro_coalesced_requests_total",
+            'Requests answered by an identical solve already in flight, in this "worker" or another of the "host".',
+        )
+        self.startup_seconds = Gauge(
+            "gdro_startup_seconds", "Time spent starting the application, by phase (imports, catalog, worker...)."
+        )
+
+    def observe_optimizer(self, optimizer, solved: bool) -> None:
+        """Record the instrumentation of a finished ResistanceOptimizer run.
+
+        Args:
+            optimizer (ResistanceOptimizer): Optimizer after optimize_resistances returned.
+            solved (bool): False if optimize_resistances returned (None, None, None).
+        """
+        for phase, seconds in optimizer.timings.items():
+            self.phase_seconds.observe(seconds, phase=phase)
+        for kind in ("variables", "constraints"):
+            if kind in optimizer.model_stats:
+                self.model_size.observe(optimizer.model_stats[kind], kind=kind)
+        self.solver_status.inc(status=optimizer.solver_status or "unknown")
+        if not solved:
+            self.none_results.inc()
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in (
+            self.phase_seconds,
+            self.model_size,
+            self.solver_status,
+            self.none_results,
+            self.request_seconds,
+            self.solver_rejections,
+            self.coalesced_requests,
+            self.startup_seconds,
+        ):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
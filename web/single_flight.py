@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable
+
+from web.solver_pool import SolverTimeout, remaining_time
+
+try:
+    import fcntl
+except ImportError:  # No file locks on Windows, identical solves are then only coalesced within a worker
+    fcntl = None
+
+# Number of lock files keys are spread over, unrelated keys sharing a file wait on each other
+LOCK_STRIPES: int = 256
+# Seconds between two attempts to take a lock file held by another worker
+LOCK_POLL_INTERVAL: float = 0.01
+
+
+class SingleFlight:
+    """Coalesce identical solves that run at the same time into one.
+
+    Within a worker, the threads asking for a key that is already being solved wait for that solve
+    and get its result. Across the workers of a host, the worker solving a key holds a lock file;
+    the other workers wait for the lock and then read the result from the shared result cache, so
+    this needs a ResultCache with a SQLite path. Lock files are released by the operating system
+    when a worker dies, a waiting worker then solves the key itself.
+    """
+
+    def __init__(self, lock_dir: str | None = None, stripes: int = LOCK_STRIPES):
+        """Create the coalescer.
+
+        Args:
+            lock_dir (str | None): Directory of the lock files shared by the workers, None to only
+                                   coalesce solves within this worker.
+            stripes (int): Number of lock files.
+        """
+        self.lock_dir: str | None = lock_dir if fcntl is not None else None
+        self.stripes: int = stripes
+        self.solves: int = 0
+        self.worker_shares: int = 0
+        self.host_shares: int = 0
+
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        if self.lock_dir is not None:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def run(self, key: str, solve: Callable[[], Any], lookup: Callable[[], Any | None],
+            deadline: float | None = None) -> tuple[Any, str | None]:
+        """Return the result of a solve, sharing it with the identical solves in flight.
+
+        Args:
+            key (str): Cache key of the optimizer inputs.
+            solve (Callable[[], Any]): Runs the solve and stores its result in the shared result cache.
+            lookup (Callable[[], Any | None]): Reads the result of the key from the shared result cache.
+            deadline (float | None): time.monotonic() by which the result is needed, no limit if None.
+
+        Returns:
+            tuple[Any, str | None]: The result, and None if this call solved it, "worker" if it was
+                                    shared by another thread of this worker or "host" if it was
+                                    shared by another worker.
+
+        Raises:
+            SolverTimeout: If the result is not available before the deadline.
+        """
+        with self._lock:
+            future: Future | None = self._calls.get(key)
+            leader: bool = future is None
+            if leader:
+                future = self._calls[key] = Future()
+
+        if not leader:
+            try:
+                result = future.result(timeout=remaining_time(deadline))
+            except FutureTimeoutError:
+                raise SolverTimeout("the solve did not finish in time") from None
+            with self._lock:
+                self.worker_shares += 1
+            return result, "worker"
+
+        try:
+            outcome: tuple[Any, str | None] = self._run_locked(key, solve, lookup, deadline)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+        future.set_result(outcome[0])
+        return outcome
+
+    def _run_locked(self, key: str, solve: Callable[[], Any], lookup: Callable[[], Any | None],
+                    deadline: float | None) -> tuple[Any, str | None]:
+        if self.lock_dir is None:
+            return self._solve(solve), None
+
+        path: str = os.path.join(self.lock_dir, f"{int(key[:8], 16) % self.stripes}.lock")
+        with open(path, "ab") as lock_file:
+            waited: bool = False
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    waited = True
+                    if remaining_time(deadline) == 0.0:
+                        raise SolverTimeout("the solve did not finish in time") from None
+                    time.sleep(LOCK_POLL_INTERVAL)
+
+            try:
+                if waited:
+                    # Another worker solved this key, or an unrelated one sharing the lock file
+                    result = lookup()
+                    if result is not None:
+                        with self._lock:
+                            self.host_shares += 1
+                        return result, "host"
+                return self._solve(solve), None
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _solve(self, solve: Callable[[], Any]) -> Any:
+        with self._lock:
+            self.solves += 1
+        return solve()
+
+    def stats(self) -> dict[str, Any]:
+        """Return the number of solves run and of requests that shared a solve, by where it ran."""
+        with self._lock:
+            return {
+                "cross_worker": self.lock_dir is not None,
+                "solves": self.solves,
+                "worker_shares": self.worker_shares,
+                "host_shares": self.host_shares,
+            }
@@ -0,0 +1,245 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable
+
+from src.resistance_optimizer import ResistanceOptimizer
+
+
+# Niceness added to solver processes
+SOLVER_NICENESS: int = 10
+
+# Queue the solves of a solver process report their progress on, set when the process starts
+_progress_queue = None
+
+
+class SolverBusy(RuntimeError):
+    """Raised when every solver process is busy and the queue is full."""
+
+
+class SolverTimeout(RuntimeError):
+    """Raised when a solve does not finish within the request timeout."""
+
+
+def solve(optimizer_kwargs: dict, method: str, arguments: tuple, time_limit: float | None,
+          progress_key: int | None = None) -> tuple:
+    """Run one optimization inside a solver process.
+
+    Args:
+        optimizer_kwargs (dict): Keyword arguments for ResistanceOptimizer.
+        method (str): ResistanceOptimizer method to call, such as "solve_resistances".
+        arguments (tuple): Positional arguments of the method.
+        time_limit (float | None): Time limit in seconds of each solve.
+        progress_key (int | None): Key to report progress under, passing an ``on_incumbent``
+                                   callback to the method, None to report none.
+
+    Returns:
+        tuple: The return value of the method, followed by the timings, model statistics and
+               solver status of the optimizer.
+    """
+    optimizer = ResistanceOptimizer(**optimizer_kwargs, solver_time_limit=time_limit)
+    if progress_key is None:
+        output = getattr(optimizer, method)(*arguments)
+    else:
+        output = getattr(optimizer, method)(
+            *arguments, on_incumbent=lambda incumbent: _progress_queue.put((progress_key, incumbent))
+        )
+    return output, optimizer.timings, optimizer.model_stats, optimizer.solver_status
+
+
+def _ready() -> None:
+    """Do nothing, submitted to start the solver processes ahead of the first solve."""
+
+
+def _start_process(progress_queue) -> None:
+    """Run solver processes below the web workers, so that serving requests wins the CPU, and keep
+    the queue their solves report progress on."""
+    global _progress_queue
+    _progress_queue = progress_queue
+    os.nice(SOLVER_NICENESS)
+
+
+class SolverPool:
+    """Bounded pool of solver processes shared by the request threads of one web worker.
+
+    Solves run in separate processes, so request threads only wait on a future and the web
+    worker keeps serving other routes. At most ``processes + queue_size`` solves are accepted at
+    a time; beyond that, submissions fail immediately with SolverBusy instead of queuing up.
+    Keep this capacity below the number of request threads of the worker, so that threads are
+    left for the routes that do not solve.
+    """
+
+    def __init__(self, processes: int, queue_size: int):
+        """Create the pool, the processes are started on the first solve.
+
+        Args:
+            processes (int): Number of solver processes.
+            queue_size (int): Number of solves that may wait for a free process.
+        """
+        self.processes: int = processes
+        self.queue_size: int = queue_size
+        self.busy_rejections: int = 0
+        self.timeouts: int = 0
+
+        self._slots = threading.BoundedSemaphore(processes + queue_size)
+        self._pending: int = 0
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        # Callbacks of the running solves that report progress, by progress key
+        self._listeners: dict[int, Callable[[Any], None]] = {}
+        self._progress_keys = itertools.count()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Forking a multi-threaded web worker can deadlock the child, start processes from a clean server
+                if "forkserver" in multiprocessing.get_all_start_methods():
+                    context = multiprocessing.get_context("forkserver")
+                    # Import the optimizer once in the server instead of in every solver process
+                    context.set_forkserver_preload([__name__])
+                else:
+                    context = multiprocessing.get_context("spawn")
+                progress_queue = context.SimpleQueue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=context,
+                    initializer=_start_process,
+                    initargs=(progress_queue,),
+                )
+                threading.Thread(
+                    target=self._forward_progress, args=(progress_queue,), name="solver-progress", daemon=True
+                ).start()
+            return self._executor
+
+    def _forward_progress(self, progress_queue) -> None:
+        while True:
+            key, progress = progress_queue.get()
+            with self._lock:
+                listener: Callable[[Any], None] | None = self._listeners.get(key)
+            # Progress that arrives after its solve finished is superseded by the outcome
+            if listener is not None:
+                listener(progress)
+
+    def start(self) -> None:
+        """Start the solver processes now rather than on the first solve.
+
+        Blocks until the processes are started, which takes as long as importing the optimizer;
+        run it in a background thread of a freshly started web worker. Must not be called before
+        forking the worker, the processes would belong to the parent.
+        """
+        executor: ProcessPoolExecutor = self._get_executor()
+        for future in [executor.submit(_ready) for _ in range(self.processes)]:
+            future.result()
+
+    def _release(self, executor: ProcessPoolExecutor, progress_key: int | None, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._listeners.pop(progress_key, None)
+            # A solver process died, start a fresh pool for the next requests
+            broken: bool = not future.cancelled() and isinstance(future.exception(), BrokenProcessPool)
+            if broken and self._executor is executor:
+                self._executor = None
+        self._slots.release()
+
+    def submit(self, optimizer_kwargs: dict, method: str = "solve_resistances", arguments: tuple = (),
+               time_limit: float | None = None, on_progress: Callable[[Any], None] | None = None) -> Future:
+        """Start solve in a solver process.
+
+        Args:
+            optimizer_kwargs (dict): Keyword arguments for ResistanceOptimizer.
+            method (str): ResistanceOptimizer method to call.
+            arguments (tuple): Positional arguments of the method.
+            time_limit (float | None): Time limit in seconds passed to the solver.
+            on_progress (Callable[[Any], None] | None): Called, from a thread of the pool, with
+                everything the method passes to its ``on_incumbent`` callback while it runs.
+
+        Returns:
+            Future: The outcome returned by solve.
+
+        Raises:
+            SolverBusy: If the pool and its queue are full.
+        """
+        if not self._slots.acquire(blocking=False):
+            self.busy_rejections += 1
+            raise SolverBusy("all solver processes are busy")
+        progress_key: int | None = None
+        try:
+            executor: ProcessPoolExecutor = self._get_executor()
+            with self._lock:
+                if on_progress is not None:
+                    progress_key = next(self._progress_keys)
+                    self._listeners[progress_key] = on_progress
+                future: Future = executor.submit(solve, optimizer_kwargs, method, arguments, time_limit, progress_key)
+                self._pending += 1
+        except BaseException:
+            with self._lock:
+                self._listeners.pop(progress_key, None)
+            self._slots.release()
+            raise
+        # The slot is held until the solve ends, even if the request gave up on it
+        future.add_done_callback(partial(self._release, executor, progress_key))
+        return future
+
+    def wait(self, future: Future, timeout: float | None = None) -> tuple:
+        """Wait for the outcome of a submitted solve.
+
+        Args:
+            future (Future): Future returned by submit.
+            timeout (float | None): Seconds to wait for the outcome.
+
+        Returns:
+            tuple: The outcome returned by solve.
+
+        Raises:
+            SolverTimeout: If the outcome is not available within ``timeout``.
+        """
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # Queued solves are dropped, running ones finish in the background
+            future.cancel()
+            self.timeouts += 1
+            raise SolverTimeout("the solve did not finish in time") from None
+
+    def solve(self, optimizer_kwargs: dict, method: str = "solve_resistances", arguments: tuple = (),
+              time_limit: float | None = None, timeout: float | None = None) -> tuple:
+        """Run solve in a solver process and wait for its outcome.
+
+        Args:
+            optimizer_kwargs (dict): Keyword arguments for ResistanceOptimizer.
+            method (str): ResistanceOptimizer method to call.
+            arguments (tuple): Positional arguments of the method.
+            time_limit (float | None): Time limit in seconds passed to the solver.
+            timeout (float | None): Seconds to wait for the outcome, including the time spent queued.
+
+        Returns:
+            tuple: The outcome returned by solve.
+
+        Raises:
+            SolverBusy: If the pool and its queue are full.
+            SolverTimeout: If the outcome is not available within ``timeout``.
+        """
+        return self.wait(self.submit(optimizer_kwargs, method, arguments, time_limit), timeout)
+
+    def stats(self) -> dict[str, Any]:
+        """Return the pool size, the number of accepted unfinished solves and the rejection counters."""
+        with self._lock:
+            pending: int = self._pending
+        return {
+            "processes": self.processes,
+            "queue_size": self.queue_size,
+            "pending": pending,
+            "busy_rejections": self.busy_rejections,
+            "timeouts": self.timeouts,
+        }
+
+
+def remaining_time(deadline: float | None) -> float | None:
+    """Seconds left until a time.monotonic deadline, None if there is no deadline."""
+    return None if deadline is None else max(0.0, deadline - time.monotonic())
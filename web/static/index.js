@@ -236,25 +236,22 @@ function initItemChoices(list, selectId) {
     }
 }
 
-// Fetch and parse CSV to extract 'Item' column and populate the dropdown
-function loadNamesFromCSV(url, selectId) {
+// Fetch the item names and tags of both catalogs and populate the dropdowns
+function loadCatalogNames(url) {
     return fetch(url)
         .then(response => {
             if (!response.ok) {
                 throw new Error('Network response was not ok');
             }
-            return response.text();
+            return response.json();
         })
-        .then(csvText => {
-            const results = Papa.parse(csvText, { header: true, skipEmptyLines: true });
-            const items = results.data
-                .map(row => ({ item: row.Item, tag: row['Item Tag'] }))
-                .filter(obj => !!obj.item);
-            initItemChoices(items, selectId);
+        .then(catalog => {
+            initItemChoices(catalog.components.filter(obj => !!obj.item), 'component-blacklist');
+            initItemChoices(catalog.augments.filter(obj => !!obj.item), 'augment-blacklist');
         })
         .catch(error => {
-            console.error('Failed to load or parse CSV:', error);
-            // Still resolve so Promise.all won't block
+            console.error('Failed to load the item catalog:', error);
+            // Still resolve so the saved state is loaded
             return Promise.resolve();
         });
 }
@@ -382,6 +379,52 @@ const savePageState = () => {
 
 document.querySelector('form').addEventListener('submit', savePageState);
 
+// STREAMED RESULTS SCRIPT
+// Show the best loadout found so far while the solver keeps searching. Returns whether any
+// results were shown, so that the caller can fall back to a regular form post otherwise
+async function streamResults(form) {
+    const response = await fetch(form.dataset.streamUrl, { method: 'POST', body: new FormData(form) });
+    if (!response.ok || !response.body) return false;
+
+    const container = document.getElementById('optimizer-results');
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let shown = false;
+    let buffer = '';
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) return shown;
+        buffer += value;
+        let end;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            const event = /^event: (.*)$/m.exec(block);
+            const data = /^data: (.*)$/m.exec(block);
+            // Keep-alive comments carry no event
+            if (!event || !data) continue;
+            if (event[1] === 'error') {
+                // The search timed out, whatever it showed is no longer being improved
+                container.querySelector('#search-status-section')?.remove();
+                return shown;
+            }
+            container.innerHTML = JSON.parse(data[1]).html;
+            firstUpdateLanguage(localStorage.getItem('language') || 'en');
+            shown = true;
+        }
+    }
+}
+
+document.querySelector('form').addEventListener('submit', (event) => {
+    const form = event.target;
+    if (!form.dataset.streamUrl || !window.TextDecoderStream) return;
+    event.preventDefault();
+    streamResults(form)
+        .catch(() => false)
+        .then(shown => {
+            if (!shown) form.submit();
+        });
+});
+
 window.addEventListener('load', () => {
     const savedScrollPositions = JSON.parse(localStorage.getItem('scrollPositions') || '{}');
     const activeTab = localStorage.getItem('activeTab');
@@ -430,11 +473,8 @@ document.addEventListener('DOMContentLoaded', function () {
     renderCheckboxGroup(augmentSlots, 'augment-slots-section');
     renderFactionDropdowns(factions, factionOptions, 'faction-dropdowns-section');
 
-    // Load CSVs and initialize both multi-selects before loading the saved state
-    Promise.all([
-        loadNamesFromCSV('/data/component_data.csv', 'component-blacklist'),
-        loadNamesFromCSV('/data/augment_data.csv', 'augment-blacklist')
-    ]).then(() => {
+    // Load the item names and initialize both multi-selects before loading the saved state
+    loadCatalogNames(CATALOG_NAMES_URL).then(() => {
         loadState();
 
         //After executing the loading state, set the language